@@ -0,0 +1,341 @@
+"""
+FlexiFiles - měření výkonu hlavních cest bez zobrazení okna
+============================================================
+
+Vygeneruje syntetické stromy v dočasné složce (10k souborů v jedné složce,
+1M souborů v jedné složce, hluboké zanoření, mnoho malých obrázků) a změří
+vytvoření záložky, přechod do složky, přepnutí režimu zobrazení, výpočet
+statistik složky a náhledu v informačním panelu a obnovení stavového řádku.
+
+Výsledkem je JSON s mediánem a percentily každého měření a špičkovou
+spotřebou paměti (RSS), který lze porovnat s předchozím během:
+
+python benchmark.py --output vysledky.json
+python benchmark.py --quick --compare vysledky.json
+
+Asynchronní operace (načtení složky, sken, náhled) se měří až do dokončení.
+Mezipaměti aplikace se ukládají do testovacího umístění Qt, ne k uživateli.
+"""
+
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+from datetime import datetime
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QStandardPaths, QT_VERSION_STR, PYQT_VERSION_STR
+from PyQt6.QtGui import QImage, QColor
+
+from file_browser import FileBrowserMainWindow, ViewMode
+
+
+def peak_rss_kb() -> Optional[int]:
+    """Špičková spotřeba paměti procesu v KiB (None, pokud ji nelze zjistit)"""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak  # macOS vrací bajty
+    try:
+        import psutil
+    except ImportError:
+        return None
+    memory = psutil.Process().memory_info()
+    return getattr(memory, "peak_wset", memory.rss) // 1024
+
+
+def summarize(samples: list) -> dict:
+    """Medián, percentily a extrémy vzorků v milisekundách"""
+    ordered = sorted(samples)
+
+    def percentile(fraction: float) -> float:
+        position = (len(ordered) - 1) * fraction
+        low = int(position)
+        high = min(low + 1, len(ordered) - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+    return {
+        "runs": len(samples),
+        "first_ms": round(samples[0] * 1000, 3),
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "p90_ms": round(percentile(0.90) * 1000, 3),
+        "p99_ms": round(percentile(0.99) * 1000, 3),
+        "min_ms": round(ordered[0] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+# Syntetické stromy
+
+def make_flat(path: str, count: int) -> str:
+    """Složka s count malými soubory (většina prázdných)"""
+    os.makedirs(path, exist_ok=True)
+    for i in range(count):
+        with open(os.path.join(path, f"file_{i:07d}.txt"), "wb") as f:
+            if i % 16 == 0:
+                f.write(b"x" * (i % 4096))
+    return path
+
+
+def make_deep(path: str, depth: int, breadth: int, files: int) -> str:
+    """Zanořený strom; vrací nejhlubší složku"""
+    current = path
+    for level in range(depth):
+        for sibling in range(breadth):
+            sibling_path = os.path.join(current, f"branch_{sibling}")
+            os.makedirs(sibling_path, exist_ok=True)
+            for i in range(files):
+                with open(os.path.join(sibling_path, f"f{i}.dat"), "wb") as f:
+                    f.write(b"x" * 512)
+        current = os.path.join(current, "branch_0")
+    return current
+
+
+def make_images(path: str, count: int, size: int = 256) -> list:
+    """Malé obrázky PNG a JPEG"""
+    os.makedirs(path, exist_ok=True)
+    paths = []
+    for i in range(count):
+        image = QImage(size, size, QImage.Format.Format_RGB32)
+        image.fill(QColor.fromHsv(i * 37 % 360, 200, 220))
+        image_path = os.path.join(path, f"image_{i:05d}.{'png' if i % 2 else 'jpg'}")
+        image.save(image_path)
+        paths.append(image_path)
+    return paths
+
+
+class Bench:
+    """Hlavní okno aplikace a pomocné čekání na asynchronní dokončení"""
+
+    TIMEOUT = 120.0
+
+    def __init__(self, app: QApplication, repeat: int):
+        self.app = app
+        self.repeat = repeat
+        self.results = {}
+        self.window = FileBrowserMainWindow()
+        self.window.show()
+        self.wait_until(lambda: bool(self.window.tab_data))
+        # Indexování a uspávání záložek by měření rušilo
+        if self.window.file_indexer:
+            self.window.file_indexer.set_roots([])
+        self.window.hibernate_timer.stop()
+
+    def pump(self, seconds: float = 0.0):
+        end = time.perf_counter() + seconds
+        self.app.processEvents()
+        while time.perf_counter() < end:
+            self.app.processEvents()
+
+    def wait_until(self, condition) -> None:
+        deadline = time.perf_counter() + self.TIMEOUT
+        while not condition():
+            if time.perf_counter() > deadline:
+                raise TimeoutError("Operace nedoběhla včas")
+            self.app.processEvents()
+
+    def folder_loaded(self, tab_index: int, path: str, expected: int):
+        """Podmínka: záložka zobrazuje složku se všemi očekávanými položkami"""
+        tab_data = self.window.tab_data[tab_index]
+
+        def condition():
+            filter_model = tab_data['filter_model']
+            large_model = tab_data['large_model']
+            if large_model is not None and large_model.is_loading():
+                return False
+            return tab_data['path'] == path and filter_model.rowCount() >= expected
+
+        return condition
+
+    def record(self, name: str, samples: list, **extra):
+        result = summarize(samples)
+        result.update(extra)
+        result["peak_rss_kb"] = peak_rss_kb()
+        self.results[name] = result
+        print(f"{name:<42} medián {result['median_ms']:10.2f} ms   p90 {result['p90_ms']:10.2f} ms",
+              file=sys.stderr)
+
+    # Měření
+
+    def bench_create_tab(self, name: str, path: str, expected: int):
+        samples = []
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            tab_index = self.window.create_new_tab(path)
+            self.wait_until(self.folder_loaded(tab_index, path, expected))
+            samples.append(time.perf_counter() - started)
+            self.window.close_tab(tab_index)
+            self.pump(0.05)
+        self.record(name, samples, items=expected)
+
+    def bench_navigate(self, name: str, path: str, expected: int, away: str):
+        samples = []
+        tab_index = self.window.tab_widget.currentIndex()
+        for _ in range(self.repeat):
+            self.window.navigate_to_path_in_tab(away, tab_index)
+            self.pump(0.05)
+            started = time.perf_counter()
+            self.window.navigate_to_path_in_tab(path, tab_index)
+            self.wait_until(self.folder_loaded(tab_index, path, expected))
+            samples.append(time.perf_counter() - started)
+        self.record(name, samples, items=expected)
+
+    def bench_view_modes(self, name: str, path: str, expected: int):
+        """Přepnutí režimů; první vzorek každého režimu zahrnuje vytvoření zobrazení"""
+        tab_index = self.window.create_new_tab(path)
+        self.wait_until(self.folder_loaded(tab_index, path, expected))
+        samples = {mode: [] for mode in (ViewMode.LIST, ViewMode.LARGE_ICONS, ViewMode.DETAILS)}
+        for _ in range(self.repeat):
+            for mode in samples:
+                started = time.perf_counter()
+                self.window.set_view_mode_for_tab(mode, tab_index)
+                self.app.processEvents()
+                samples[mode].append(time.perf_counter() - started)
+        for mode, mode_samples in samples.items():
+            self.record(f"{name}.{mode.value}", mode_samples, items=expected)
+        self.window.close_tab(tab_index)
+
+    def bench_folder_stats(self, name: str, path: str, cached: bool):
+        """Rekurzivní statistiky složky v informačním panelu až do konečného výsledku"""
+        panel = self.window.get_current_tab_data()['info_panel']
+        scanner = self.window.folder_scanner
+        cache = scanner.cache
+        if not cached:
+            scanner.cache = None
+        samples = []
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            panel.update_folder_stats(path)
+            self.wait_until(lambda: panel._scan_job_id is None)
+            samples.append(time.perf_counter() - started)
+        scanner.cache = cache
+        self.record(name, samples)
+
+    def bench_preview(self, name: str, images: list):
+        """Náhled vždy jiného obrázku (nezahřátá mezipaměť v paměti)"""
+        panel = self.window.get_current_tab_data()['info_panel']
+        samples = []
+        for image_path in images[:self.repeat * 4]:
+            started = time.perf_counter()
+            panel.update_preview(image_path)
+            self.wait_until(lambda: not panel.preview_label.pixmap().isNull())
+            samples.append(time.perf_counter() - started)
+        self.record(name, samples)
+
+    def bench_status_bar(self, name: str, path: str, expected: int, calls: int = 1000):
+        tab_index = self.window.tab_widget.currentIndex()
+        self.window.navigate_to_path_in_tab(path, tab_index)
+        self.wait_until(self.folder_loaded(tab_index, path, expected))
+        samples = []
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            for _ in range(calls):
+                self.window.update_status_bar()
+            samples.append((time.perf_counter() - started) / calls)
+        self.record(name, samples, note=f"průměr na volání z {calls} volání")
+        view = self.window.get_current_view()
+        view.selectAll()
+        self.pump(0.05)
+        samples = []
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            for _ in range(calls):
+                self.window.update_status_bar()
+            samples.append((time.perf_counter() - started) / calls)
+        view.clearSelection()
+        self.record(f"{name}.selected_all", samples, note=f"průměr na volání z {calls} volání")
+
+
+def compare(results: dict, previous_path: str) -> None:
+    """Vypíše poměr mediánů proti předchozímu běhu"""
+    with open(previous_path, encoding="utf-8") as f:
+        previous = json.load(f)["results"]
+    print(f"\nPorovnání s {previous_path} (medián, nový / starý):", file=sys.stderr)
+    for name, result in results.items():
+        if name in previous and previous[name]["median_ms"]:
+            ratio = result["median_ms"] / previous[name]["median_ms"]
+            flag = "  ← pomalejší" if ratio > 1.1 else ""
+            print(f"  {name:<42} {ratio:6.2f}×{flag}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Měření výkonu FlexiFiles bez zobrazení okna")
+    parser.add_argument("--repeat", type=int, default=7, help="počet opakování každého měření")
+    parser.add_argument("--quick", action="store_true", help="bez složky s milionem souborů, 3 opakování")
+    parser.add_argument("--output", help="soubor pro výsledky JSON (jinak standardní výstup)")
+    parser.add_argument("--compare", help="JSON předchozího běhu pro porovnání")
+    parser.add_argument("--workdir", help="složka pro vygenerované stromy (jinak dočasná, po běhu se smaže)")
+    args = parser.parse_args()
+    repeat = 3 if args.quick else args.repeat
+
+    QStandardPaths.setTestModeEnabled(True)
+    app = QApplication(sys.argv[:1])
+    workdir = args.workdir or tempfile.mkdtemp(prefix="flexifiles-bench-")
+    started = time.perf_counter()
+    try:
+        print(f"Generuji stromy v {workdir}…", file=sys.stderr)
+        flat_10k = make_flat(os.path.join(workdir, "flat_10k"), 10_000)
+        flat_1m = None if args.quick else make_flat(os.path.join(workdir, "flat_1m"), 1_000_000)
+        deep_root = os.path.join(workdir, "deep")
+        deepest = make_deep(deep_root, depth=40, breadth=3, files=20)
+        images = make_images(os.path.join(workdir, "images"), max(repeat * 4, 50))
+        empty = os.path.join(workdir, "empty")
+        os.makedirs(empty, exist_ok=True)
+
+        bench = Bench(app, repeat)
+        bench.bench_create_tab("create_new_tab.flat_10k", flat_10k, 10_000)
+        bench.bench_navigate("navigate_to_path_in_tab.flat_10k", flat_10k, 10_000, empty)
+        if flat_1m:
+            bench.bench_navigate("navigate_to_path_in_tab.flat_1m", flat_1m, 1_000_000, empty)
+        # Nejhlubší složka obsahuje jen soubory posledního patra, počet se bere z vygenerovaného stromu
+        bench.bench_navigate("navigate_to_path_in_tab.deep", deepest, len(os.listdir(deepest)), empty)
+        bench.bench_view_modes("set_view_mode_for_tab.flat_10k", flat_10k, 10_000)
+        bench.bench_folder_stats("update_folder_stats.deep.uncached", deep_root, cached=False)
+        bench.bench_folder_stats("update_folder_stats.deep.cached", deep_root, cached=True)
+        bench.bench_preview("update_preview.images", images)
+        bench.bench_status_bar("update_status_bar.flat_10k", flat_10k, 10_000)
+        bench.window.close()
+
+        report = {
+            "meta": {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "qt": QT_VERSION_STR,
+                "pyqt": PYQT_VERSION_STR,
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "repeat": repeat,
+                "quick": args.quick,
+                "duration_s": round(time.perf_counter() - started, 1),
+            },
+            "results": bench.results,
+            "peak_rss_kb": peak_rss_kb(),
+        }
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    if args.compare:
+        compare(report["results"], args.compare)
+
+
+if __name__ == "__main__":
+    main()
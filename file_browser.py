@@ -10,8 +10,13 @@ pip install PyQt6
 
 Pro spuštění aplikace:
 python file_browser.py
+python file_browser.py --profile-startup   (vypíše časy jednotlivých fází startu)
+FLEXIFILES_TRACE=trasa.json python file_browser.py   (trasa výkonu pro chrome://tracing)
 """
 
+import time
+_MODULE_LOAD_STARTED = time.perf_counter()  # Začátek importů (pro --profile-startup)
+
 import sys
 import os
 import shutil
@@ -20,27 +25,74 @@ import os
 import sys
 import shutil
 import subprocess
+import threading
+import functools
+import traceback
+import json
+import tempfile
+import struct
+import errno
+import stat
+import re
+import queue
+import fnmatch
+import heapq
+import bisect
+from array import array
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, TYPE_CHECKING
 from enum import Enum
+from collections import OrderedDict, deque
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # Windows - reflink přes FICLONE není k dispozici
+    fcntl = None
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget,
     QTreeView, QTableView, QLineEdit, QPushButton, QSplitter,
     QStatusBar, QMenu, QMessageBox, QInputDialog, QHeaderView,
     QAbstractItemView, QToolBar, QFileDialog, QListView, QTabWidget, QStyleFactory,
-    QLabel, QScrollArea, QFrame, QGridLayout, QProgressBar, QStyle
+    QLabel, QScrollArea, QFrame, QGridLayout, QProgressBar, QStyle,
+    QStyledItemDelegate, QDialog, QDialogButtonBox, QFormLayout, QComboBox,
+    QSpinBox, QCheckBox, QTableWidget, QTableWidgetItem, QListWidget, QListWidgetItem, QDateEdit,
+    QToolTip
 )
 from PyQt6.QtCore import (
-    Qt, QDir, QModelIndex, QTimer,
-    pyqtSignal, QThread, QObject, QUrl, QSize
+    Qt, QDir, QModelIndex, QTimer, QAbstractTableModel, QAbstractProxyModel, QPersistentModelIndex,
+    pyqtSignal, QThread, QObject, QUrl, QSize, QStandardPaths, QMimeData,
+    QSettings, QFileSystemWatcher, QDate, QItemSelection, QItemSelectionModel, QRectF, QPointF
 )
 from PyQt6.QtGui import (
     QIcon, QDesktopServices, QClipboard, QAction,
-    QKeySequence, QPixmap, QStandardItemModel, QFileSystemModel
+    QKeySequence, QPixmap, QStandardItem, QStandardItemModel, QFileSystemModel,
+    QImage, QImageReader, QPainter, QColor, QPen
 )
 
+# Pillow je volitelný (bez něj dekóduje QImageReader) a načítá se až při prvním
+# dekódování náhledu, aby nezdržoval start aplikace
+Image = None
+ImageOps = None
+_pillow_checked = False
+
+
+def load_pillow() -> bool:
+    """Naimportuje Pillow při prvním použití, vrací jeho dostupnost"""
+    global Image, ImageOps, _pillow_checked
+    if not _pillow_checked:
+        try:
+            from PIL import Image as pil_image, ImageOps as pil_image_ops
+            Image, ImageOps = pil_image, pil_image_ops
+        except ImportError:
+            pass
+        _pillow_checked = True
+    return Image is not None
+
 
 class ViewMode(Enum):
     """Enum pro různé režimy zobrazení"""
@@ -49,429 +101,6377 @@ class ViewMode(Enum):
     LARGE_ICONS = "icons"   # Velké ikony
 
 
-class FileInfoPanel(QWidget):
-    """Informační panel pro zobrazení detailů o vybraných souborech"""
-    
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.file_model = None
-        self.setup_ui()
-    
-    def setup_ui(self):
-        """Vytvoří UI pro informační panel"""
-        self.setMaximumWidth(300)
-        self.setMinimumWidth(250)
-        
-        # Hlavní layout
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(10, 10, 10, 10)
-        layout.setSpacing(10)
-        
-        # Nadpis panelu
-        title = QLabel("Informace o souboru")
-        title.setStyleSheet("font-weight: bold; font-size: 14px; color: #2c3e50;")
-        layout.addWidget(title)
-        
-        # Scrollovací oblast pro obsah
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setFrameStyle(QFrame.Shape.NoFrame)
-        
-        # Widget pro obsah
-        self.content_widget = QWidget()
-        self.content_layout = QVBoxLayout(self.content_widget)
-        self.content_layout.setContentsMargins(0, 0, 0, 0)
-        self.content_layout.setSpacing(5)
-        
-        # Základní informace
-        self.info_frame = QFrame()
-        self.info_frame.setFrameStyle(QFrame.Shape.StyledPanel)
-        info_layout = QGridLayout(self.info_frame)
-        info_layout.setContentsMargins(10, 10, 10, 10)
-        info_layout.setSpacing(5)
-        
-        # Labels pro informace
-        self.name_label = QLabel("Žádný soubor nevybrán")
-        self.name_label.setWordWrap(True)
-        self.name_label.setStyleSheet("font-weight: bold;")
-        
-        self.type_label = QLabel("")
-        self.size_label = QLabel("")
-        self.modified_label = QLabel("")
-        self.created_label = QLabel("")
-        self.path_label = QLabel("")
-        self.path_label.setWordWrap(True)
-        self.path_label.setStyleSheet("font-size: 10px; color: #7f8c8d;")
-        
-        # Přidání do grid layoutu
-        info_layout.addWidget(QLabel("Název:"), 0, 0)
-        info_layout.addWidget(self.name_label, 0, 1)
-        info_layout.addWidget(QLabel("Typ:"), 1, 0)
-        info_layout.addWidget(self.type_label, 1, 1)
-        info_layout.addWidget(QLabel("Velikost:"), 2, 0)
-        info_layout.addWidget(self.size_label, 2, 1)
-        info_layout.addWidget(QLabel("Změněno:"), 3, 0)
-        info_layout.addWidget(self.modified_label, 3, 1)
-        info_layout.addWidget(QLabel("Vytvořeno:"), 4, 0)
-        info_layout.addWidget(self.created_label, 4, 1)
-        info_layout.addWidget(QLabel("Cesta:"), 5, 0, 1, 2)
-        info_layout.addWidget(self.path_label, 6, 0, 1, 2)
-        
-        self.content_layout.addWidget(self.info_frame)
-        
-        # Statistiky složky (pouze pro složky)
-        self.folder_stats_frame = QFrame()
-        self.folder_stats_frame.setFrameStyle(QFrame.Shape.StyledPanel)
-        self.folder_stats_frame.hide()
-        
-        stats_layout = QVBoxLayout(self.folder_stats_frame)
-        stats_layout.setContentsMargins(10, 10, 10, 10)
-        
-        stats_title = QLabel("Statistiky složky")
-        stats_title.setStyleSheet("font-weight: bold; color: #2c3e50;")
-        stats_layout.addWidget(stats_title)
-        
-        self.folder_items_label = QLabel("")
-        self.folder_files_label = QLabel("")
-        self.folder_folders_label = QLabel("")
-        self.folder_size_label = QLabel("")
-        
-        stats_layout.addWidget(self.folder_items_label)
-        stats_layout.addWidget(self.folder_files_label)
-        stats_layout.addWidget(self.folder_folders_label)
-        stats_layout.addWidget(self.folder_size_label)
-        
-        # Progress bar pro výpočet velikosti složky
-        self.size_progress = QProgressBar()
-        self.size_progress.setVisible(False)
-        self.size_progress.setMaximum(0)  # Neurčitý progress
-        stats_layout.addWidget(self.size_progress)
-        
-        self.content_layout.addWidget(self.folder_stats_frame)
-        
-        # Náhled (pro budoucí implementaci)
-        self.preview_frame = QFrame()
-        self.preview_frame.setFrameStyle(QFrame.Shape.StyledPanel)
-        self.preview_frame.hide()
-        
-        preview_layout = QVBoxLayout(self.preview_frame)
-        preview_layout.setContentsMargins(10, 10, 10, 10)
-        
-        preview_title = QLabel("Náhled")
-        preview_title.setStyleSheet("font-weight: bold; color: #2c3e50;")
-        preview_layout.addWidget(preview_title)
-        
-        self.preview_label = QLabel("Náhled není k dispozici")
-        self.preview_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.preview_label.setMinimumHeight(100)
-        self.preview_label.setStyleSheet("border: 1px dashed #bdc3c7; color: #7f8c8d;")
-        preview_layout.addWidget(self.preview_label)
-        
-        self.content_layout.addWidget(self.preview_frame)
-        
-        # Elastic space
-        self.content_layout.addStretch()
-        
-        scroll_area.setWidget(self.content_widget)
-        layout.addWidget(scroll_area)
-    
-    def set_file_model(self, model):
-        """Nastaví file model pro získávání informací"""
-        self.file_model = model
-    
-    def update_info(self, file_path: str):
-        """Aktualizuje informace o souboru/složce"""
-        if not file_path or not os.path.exists(file_path):
-            self.clear_info()
+# Obrazové formáty, pro které se zobrazuje náhled
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.tif', '.ico', '.webp'}
+
+
+def format_size(size: int) -> str:
+    """Formátuje velikost souboru do čitelné podoby"""
+    if size < 1024:
+        return f"{size} B"
+    elif size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB"
+    elif size < 1024 * 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    elif size < 1024 * 1024 * 1024 * 1024:
+        return f"{size / (1024 * 1024 * 1024):.1f} GB"
+    else:
+        return f"{size / (1024 * 1024 * 1024 * 1024):.1f} TB"
+
+
+def format_duration(seconds: float) -> str:
+    """Formátuje dobu v sekundách jako m:ss nebo h:mm:ss"""
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+class FolderStats:
+    """Souhrnné statistiky rekurzivního průchodu složkou"""
+
+    __slots__ = ('files', 'folders', 'size', 'errors', 'complete')
+
+    def __init__(self, files: int = 0, folders: int = 0, size: int = 0,
+                 errors: int = 0, complete: bool = False):
+        self.files = files          # Počet souborů (včetně symlinků)
+        self.folders = folders      # Počet podsložek
+        self.size = size            # Celková velikost v bajtech
+        self.errors = errors        # Počet nepřístupných položek
+        self.complete = complete    # True po dokončení celého průchodu
+
+    @property
+    def items(self) -> int:
+        """Celkový počet položek"""
+        return self.files + self.folders
+
+    def copy(self) -> 'FolderStats':
+        """Vrací nezávislou kopii statistik"""
+        return FolderStats(self.files, self.folders, self.size, self.errors, self.complete)
+
+
+class StartupProfile:
+    """Časy fází startu aplikace pro --profile-startup
+
+    Každá značka uloží dobu od předchozí značky; první fáze se měří
+    od začátku importů modulu.
+    """
+
+    def __init__(self, started: float = _MODULE_LOAD_STARTED):
+        self.started = started
+        self.phases = []  # (fáze, trvání, čas od začátku) v sekundách
+        self.reported = False
+        self._last = started
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last, now - self.started))
+        self._last = now
+
+    def report(self) -> str:
+        lines = ["Profil startu:"]
+        for phase, duration, elapsed in self.phases:
+            lines.append(f"  {phase:<28} {duration * 1000:8.1f} ms   (celkem {elapsed * 1000:8.1f} ms)")
+        return "\n".join(lines)
+
+
+class _TraceSpan:
+    """Úsek trasy pro with-blok (viz PerformanceTracer.span)"""
+
+    __slots__ = ('tracer', 'name', 'category', 'args', 'started')
+
+    def __init__(self, tracer, name: str, category: str, args: Optional[dict]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer.complete(self.name, self.category, self.started, self.args)
+        return False
+
+
+class _NullSpan:
+    """Prázdný úsek, když trasování neběží"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class PerformanceTracer:
+    """Trasování horkých cest GUI s exportem pro Chrome/Perfetto
+
+    Sledované metody jsou označené dekorátorem @traced, delší úseky
+    with-blokem span(). Dokud trasování neběží, obojí jen předá volání
+    dál. Zapíná se proměnnou prostředí FLEXIFILES_TRACE (1 nebo cesta
+    k souboru, kam se trasa uloží při ukončení) nebo z menu Nástroje.
+
+    Hlídací vlákno sleduje tep časovače v hlavním vlákně; když smyčka
+    událostí nereaguje déle než práh (FLEXIFILES_TRACE_STALL_MS), uloží
+    zásobník hlavního vlákna a po obnovení tepu zapíše událost zaseknutí.
+    Export je JSON ve formátu Trace Event (chrome://tracing, ui.perfetto.dev).
+    """
+
+    MAX_EVENTS = 200000      # Starší události se zahazují
+    DEFAULT_STALL_MS = 100   # Výchozí práh zaseknutí smyčky událostí
+    HEARTBEAT_MS = 20        # Interval tepu v hlavním vlákně
+    STACK_DEPTH = 16         # Počet rámců zásobníku ukládaných k zaseknutí
+
+    def __init__(self):
+        self.enabled = False
+        self.stall_threshold = self.DEFAULT_STALL_MS / 1000
+        self.export_path = None          # Soubor pro uložení při ukončení (z FLEXIFILES_TRACE)
+        self._events = deque(maxlen=self.MAX_EVENTS)
+        self._threads = {}               # tid -> název vlákna
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._heartbeat = None
+        self._last_beat = 0.0
+        self._stall_stack = None         # (čas tepu, zásobník) z hlídacího vlákna
+        self._watchdog_stop = None
+
+    def configure_from_environment(self) -> None:
+        """Zapne trasování podle proměnných prostředí"""
+        value = os.environ.get("FLEXIFILES_TRACE", "").strip()
+        if not value or value == "0":
             return
-        
-        try:
-            # Základní informace
-            file_name = os.path.basename(file_path)
-            self.name_label.setText(file_name)
-            self.path_label.setText(file_path)
-            
-            # Získání statistik souboru
-            stat_info = os.stat(file_path)
-            
-            # Datum změny a vytvoření
-            modified_time = datetime.fromtimestamp(stat_info.st_mtime)
-            self.modified_label.setText(modified_time.strftime("%d.%m.%Y %H:%M:%S"))
-            
-            created_time = datetime.fromtimestamp(stat_info.st_ctime)
-            self.created_label.setText(created_time.strftime("%d.%m.%Y %H:%M:%S"))
-            
-            if os.path.isfile(file_path):
-                # Soubor
-                self.type_label.setText("Soubor")
-                size = stat_info.st_size
-                self.size_label.setText(self.format_size(size))
-                
-                # Skryj statistiky složky
-                self.folder_stats_frame.hide()
-                
-                # Zkus zobrazit náhled pro obrázky
-                self.update_preview(file_path)
-                
-            elif os.path.isdir(file_path):
-                # Složka
-                self.type_label.setText("Složka")
-                self.size_label.setText("Počítám...")
-                
-                # Zobraz statistiky složky
-                self.update_folder_stats(file_path)
-                self.folder_stats_frame.show()
-                
-                # Skryj náhled
-                self.preview_frame.hide()
-                
-        except Exception as e:
-            self.clear_info()
-            self.name_label.setText(f"Chyba: {str(e)}")
-    
-    def update_folder_stats(self, folder_path: str):
-        """Aktualizuje statistiky složky"""
         try:
-            items = os.listdir(folder_path)
-            total_items = len(items)
-            
-            files_count = 0
-            folders_count = 0
-            total_size = 0
-            
-            for item in items:
-                item_path = os.path.join(folder_path, item)
-                if os.path.isfile(item_path):
-                    files_count += 1
-                    try:
-                        total_size += os.path.getsize(item_path)
-                    except (OSError, PermissionError):
-                        pass
-                elif os.path.isdir(item_path):
-                    folders_count += 1
-            
-            self.folder_items_label.setText(f"Celkem položek: {total_items}")
-            self.folder_files_label.setText(f"Soubory: {files_count}")
-            self.folder_folders_label.setText(f"Složky: {folders_count}")
-            self.folder_size_label.setText(f"Velikost: {self.format_size(total_size)}")
-            
-        except PermissionError:
-            self.folder_items_label.setText("Nedostatečná oprávnění")
-            self.folder_files_label.setText("")
-            self.folder_folders_label.setText("")
-            self.folder_size_label.setText("")
-        except Exception as e:
-            self.folder_items_label.setText(f"Chyba: {str(e)}")
-            self.folder_files_label.setText("")
-            self.folder_folders_label.setText("")
-            self.folder_size_label.setText("")
-    
-    def update_preview(self, file_path: str):
-        """Aktualizuje náhled souboru"""
-        # Získej příponu souboru
-        _, ext = os.path.splitext(file_path.lower())
+            self.stall_threshold = int(os.environ.get("FLEXIFILES_TRACE_STALL_MS",
+                                                      self.DEFAULT_STALL_MS)) / 1000
+        except ValueError:
+            pass
+        if value.lower() not in ("1", "true", "yes"):
+            self.export_path = value
+        self.start()
+
+    def start(self) -> None:
+        """Zapne záznam (volat z hlavního vlákna po vytvoření QApplication)"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self._last_beat = time.perf_counter()
+        self._stall_stack = None
+        self._heartbeat = QTimer()
+        self._heartbeat.setInterval(self.HEARTBEAT_MS)
+        self._heartbeat.timeout.connect(self._beat)
+        self._heartbeat.start()
+        self._watchdog_stop = threading.Event()
+        threading.Thread(target=self._watch, args=(self._watchdog_stop, threading.main_thread().ident),
+                         name="trace-watchdog", daemon=True).start()
+
+    def stop(self) -> None:
+        """Vypne záznam, zaznamenané události zůstanou pro export"""
+        if not self.enabled:
+            return
+        self.enabled = False
+        self._heartbeat.stop()
+        self._heartbeat = None
+        self._watchdog_stop.set()
+
+    def clear(self) -> None:
+        """Zahodí zaznamenané události"""
+        self._events.clear()
+
+    def event_count(self) -> int:
+        return len(self._events)
+
+    def span(self, name: str, category: str, args: Optional[dict] = None):
+        """Vrací kontextový manažer měřící with-blok"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _TraceSpan(self, name, category, args)
+
+    def complete(self, name: str, category: str, started: float, args: Optional[dict] = None,
+                 ended: Optional[float] = None) -> None:
+        """Zapíše dokončený úsek (časy z time.perf_counter)"""
+        if ended is None:
+            ended = time.perf_counter()
+        tid = threading.get_native_id()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        event = {
+            "name": name, "cat": category, "ph": "X", "pid": self._pid, "tid": tid,
+            "ts": round((started - self._origin) * 1e6, 1),
+            "dur": round((ended - started) * 1e6, 1),
+        }
+        if args:
+            event["args"] = args
+        self._events.append(event)
+
+    def _beat(self) -> None:
+        """Tep hlavního vlákna; mezera delší než práh je zaseknutí smyčky událostí"""
+        now = time.perf_counter()
+        last = self._last_beat
+        self._last_beat = now
+        gap = now - last - self.HEARTBEAT_MS / 1000
+        if gap < self.stall_threshold:
+            return
+        args = {"ms": round(gap * 1000, 1)}
+        sample = self._stall_stack
+        if sample and sample[0] == last:
+            args["stack"] = sample[1]
+        self.complete("Zaseknutí smyčky událostí", "stall", last, args, now)
+
+    def _watch(self, stop: threading.Event, main_thread: int) -> None:
+        """Hlídací vlákno: při zaseknutí uloží zásobník hlavního vlákna"""
+        while not stop.wait(self.stall_threshold / 2):
+            last = self._last_beat
+            if time.perf_counter() - last < self.stall_threshold:
+                continue
+            sample = self._stall_stack
+            if sample and sample[0] == last:
+                continue  # Toto zaseknutí už má zásobník
+            frame = sys._current_frames().get(main_thread)
+            if frame is not None:
+                stack = traceback.extract_stack(frame)[-self.STACK_DEPTH:]
+                self._stall_stack = (last, [f"{os.path.basename(f.filename)}:{f.lineno} {f.name}"
+                                            for f in reversed(stack)])
+
+    def export(self, path: str) -> int:
+        """Uloží trasu jako JSON ve formátu Trace Event, vrací počet událostí"""
+        events = list(self._events)
+        metadata = [{"name": "process_name", "ph": "M", "pid": self._pid, "tid": 0,
+                     "args": {"name": "FlexiFiles"}}]
+        for tid, name in list(self._threads.items()):
+            metadata.append({"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid,
+                             "args": {"name": name}})
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+
+TRACER = PerformanceTracer()
+
+
+_CO_VARARGS = 0x04  # inspect.CO_VARARGS - inspect se kvůli rychlosti startu nenačítá
+
+
+def _positional_limit(func) -> Optional[int]:
+    """Počet pozičních parametrů funkce (None, pokud přijímá *args)"""
+    code = getattr(func, '__func__', func).__code__
+    if code.co_flags & _CO_VARARGS:
+        return None
+    return code.co_argcount - (1 if hasattr(func, '__func__') else 0)
+
+
+def traced(category: str):
+    """Dekorátor zapisující dobu volání do TRACER
+
+    Sloty připojené přímo na signál dostávají i argumenty, které nepřijímají
+    (např. checked z QAction.triggered). PyQt je jinak ořezává podle signatury,
+    kterou obal skrývá, proto je ořízne obal sám.
+    """
+    def decorate(func):
+        name = func.__qualname__
+        limit = _positional_limit(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if limit is not None and len(args) > limit:
+                args = args[:limit]
+            if not TRACER.enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                TRACER.complete(name, category, started)
+        return wrapper
+    return decorate
+
+
+def get_cache_dir() -> str:
+    """Vrací (a případně vytvoří) složku pro mezipaměti aplikace"""
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericCacheLocation)
+    cache_dir = os.path.join(base or tempfile.gettempdir(), "FlexiFiles")
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+class FolderSizeCache:
+    """Perzistentní mezipaměť výsledků skenu složek (SQLite)
+
+    Pro každou složku se ukládá její přímý obsah (soubory, velikost,
+    podsložky) s klíčem cesta + st_dev + st_ino + st_mtime_ns. Změna
+    mtime znamená změnu přímého obsahu, takže opakovaný sken čte znovu
+    jen změněné složky a ostatní pouze ověří jedním stat(). Pro kořeny
+    dokončených skenů se navíc ukládají celkové součty, které lze zobrazit
+    okamžitě. Počet záznamů je omezen, nejdéle nepoužité se mažou (LRU).
+    """
+
+    DEFAULT_MAX_ENTRIES = 500_000
+
+    def __init__(self, db_path: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        import sqlite3
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS dirs (
+                path TEXT PRIMARY KEY,
+                dev INTEGER NOT NULL,
+                ino INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                files INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                errors INTEGER NOT NULL,
+                subdirs TEXT NOT NULL,
+                linked TEXT NOT NULL,
+                total_files INTEGER,
+                total_folders INTEGER,
+                total_size INTEGER,
+                total_errors INTEGER,
+                last_used INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS dirs_last_used ON dirs(last_used)")
+        self._conn.commit()
+
+    @staticmethod
+    def _stat_key(stat_info) -> tuple:
+        """Klíč platnosti záznamu ze stat() složky"""
+        return (stat_info.st_dev, stat_info.st_ino, stat_info.st_mtime_ns)
+
+    def _fetch_row(self, query: str, path: str) -> Optional[tuple]:
+        """Načte jeden řádek pro cestu (None i po zavření databáze)"""
+        import sqlite3
+        with self._lock:
+            if self._conn is None:
+                return None
+            try:
+                return self._conn.execute(query, (path,)).fetchone()
+            except sqlite3.Error:
+                return None
+
+    def lookup_directory(self, path: str, stat_info) -> Optional[tuple]:
+        """Vrací přímý obsah složky (files, size, errors, subdirs, linked), pokud je platný"""
+        row = self._fetch_row(
+            "SELECT dev, ino, mtime_ns, files, size, errors, subdirs, linked FROM dirs WHERE path = ?", path
+        )
+        if row is None or tuple(row[:3]) != self._stat_key(stat_info):
+            return None
+        subdirs = [(os.path.join(path, name), (dev, ino)) for name, dev, ino in json.loads(row[6])]
+        linked = [((dev, ino), size) for dev, ino, size in json.loads(row[7])]
+        return row[3], row[4], row[5], subdirs, linked
+
+    def lookup_totals(self, path: str, stat_info=None) -> Optional[FolderStats]:
+        """Vrací uložené celkové součty složky, pokud se složka od skenu nezměnila"""
+        try:
+            if stat_info is None:
+                stat_info = os.stat(path)
+        except OSError:
+            return None
+        row = self._fetch_row(
+            "SELECT dev, ino, mtime_ns, total_files, total_folders, total_size, total_errors "
+            "FROM dirs WHERE path = ?", path
+        )
+        if row is None or row[3] is None or tuple(row[:3]) != self._stat_key(stat_info):
+            return None
+        return FolderStats(row[3], row[4], row[5], row[6], complete=True)
+
+    def store(self, records: list, touched: list, root: Optional[str] = None,
+              totals: Optional[FolderStats] = None) -> None:
+        """Uloží výsledky skenu, obnoví čas použití a udrží velikost v limitu
+
+        records: (path, stat_info, files, size, errors, subdirs, linked) nově přečtených složek
+        touched: cesty složek použitých z mezipaměti
+        """
+        import sqlite3
+        now = time.time_ns()
+        rows = []
+        for path, stat_info, files, size, errors, subdirs, linked in records:
+            subdirs_json = json.dumps([[os.path.basename(p), key[0], key[1]] for p, key in subdirs])
+            linked_json = json.dumps([[key[0], key[1], link_size] for key, link_size in linked])
+            rows.append((path, stat_info.st_dev, stat_info.st_ino, stat_info.st_mtime_ns,
+                         files, size, errors, subdirs_json, linked_json, now))
+
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO dirs (path, dev, ino, mtime_ns, files, size, errors, "
+                    "subdirs, linked, last_used) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+                self._conn.executemany(
+                    "UPDATE dirs SET last_used = ? WHERE path = ?", ((now, path) for path in touched)
+                )
+                if root is not None and totals is not None:
+                    self._conn.execute(
+                        "UPDATE dirs SET total_files = ?, total_folders = ?, total_size = ?, "
+                        "total_errors = ?, last_used = ? WHERE path = ?",
+                        (totals.files, totals.folders, totals.size, totals.errors, now + 1, root)
+                    )
+                self._evict()
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+
+    def _evict(self) -> None:
+        """Smaže nejdéle nepoužité záznamy nad limit (volá se pod zámkem)"""
+        count = self._conn.execute("SELECT COUNT(*) FROM dirs").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        # Maže se s rezervou 10 %, aby se eviction nespouštěla při každém skenu
+        excess = count - int(self.max_entries * 0.9)
+        self._conn.execute(
+            "DELETE FROM dirs WHERE path IN (SELECT path FROM dirs ORDER BY last_used LIMIT ?)",
+            (excess,)
+        )
+
+    def close(self) -> None:
+        """Zavře databázi"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class _FolderScanJob:
+    """Stav jednoho běžícího skenu sdílený mezi pracovními vlákny"""
+
+    def __init__(self, job_id: int, root: str):
+        self.job_id = job_id
+        self.root = root
+        self.cancelled = threading.Event()
+        self.lock = threading.Lock()
+        self.stats = FolderStats()
+        self.pending = 0            # Počet složek čekajících na zpracování
+        self.seen_files = set()     # (st_dev, st_ino) souborů s více hardlinky
+        self.seen_dirs = set()      # (st_dev, st_ino) navštívených složek - ochrana proti smyčkám
+        self.last_emit = 0.0
+        self.root_stat = None
+        self.records = []           # Nově přečtené složky pro uložení do mezipaměti
+        self.touched = []           # Složky použité z mezipaměti
+
+
+class FolderSizeScanner(QObject):
+    """Paralelní rekurzivní výpočet velikosti složek na pozadí
+
+    Každá složka je samostatná úloha v poolu vláken, takže široké stromy
+    se procházejí souběžně. Průběžné součty se posílají signálem
+    scan_progress, konečný výsledek signálem scan_finished. S nastavenou
+    FolderSizeCache se nezměněné složky nečtou znovu.
+    """
+
+    scan_progress = pyqtSignal(int, object)  # job_id, FolderStats (průběžné)
+    scan_finished = pyqtSignal(int, object)  # job_id, FolderStats (konečné)
+
+    PROGRESS_INTERVAL = 0.1  # Minimální odstup průběžných signálů v sekundách
+
+    def __init__(self, parent=None, max_workers: Optional[int] = None,
+                 cache: Optional[FolderSizeCache] = None):
+        from concurrent.futures import ThreadPoolExecutor
+        super().__init__(parent)
+        if max_workers is None:
+            # Sken je vázaný na I/O (hlavně síťové disky), více vláken než jader dává smysl
+            max_workers = min(16, (os.cpu_count() or 2) * 2)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="folder-scan")
+        self.cache = cache
+        self._jobs = {}
+        self._jobs_lock = threading.Lock()
+        self._next_job_id = 1
+
+    def scan(self, path: str) -> int:
+        """Spustí rekurzivní sken složky a vrátí identifikátor úlohy"""
+        with self._jobs_lock:
+            job_id = self._next_job_id
+            self._next_job_id += 1
+            job = _FolderScanJob(job_id, path)
+            self._jobs[job_id] = job
+
+        try:
+            job.root_stat = os.stat(path)
+            job.seen_dirs.add((job.root_stat.st_dev, job.root_stat.st_ino))
+        except OSError:
+            pass
+
+        job.pending = 1
+        self._submit(job, path, job.root_stat)
+        return job_id
+
+    def cancel(self, job_id: int) -> None:
+        """Zruší běžící sken (rozpracované složky se dokončí naprázdno)"""
+        with self._jobs_lock:
+            job = self._jobs.pop(job_id, None)
+        if job:
+            job.cancelled.set()
+
+    def shutdown(self) -> None:
+        """Zruší všechny skeny a ukončí pool vláken"""
+        with self._jobs_lock:
+            jobs = list(self._jobs.values())
+            self._jobs.clear()
+        for job in jobs:
+            job.cancelled.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self.cache:
+            self.cache.close()
+            self.cache = None
+
+    def _submit(self, job: _FolderScanJob, path: str, stat_info=None) -> None:
+        """Zařadí složku ke zpracování"""
+        try:
+            self._executor.submit(self._scan_directory, job, path, stat_info)
+        except RuntimeError:
+            # Pool už je ukončený (zavírání aplikace)
+            job.cancelled.set()
+
+    def _scan_directory(self, job: _FolderScanJob, path: str, stat_info=None) -> None:
+        """Zpracuje přímý obsah jedné složky (běží v pracovním vlákně)"""
+        files = 0
+        size = 0
+        errors = 0
+        subdirs = []
+        linked = []
+
+        if job.cancelled.is_set():
+            self._finish_directory(job, files, size, errors, subdirs, linked)
+            return
+
+        cache = self.cache
+        if cache is not None:
+            try:
+                if stat_info is None:
+                    stat_info = os.stat(path)
+            except OSError:
+                stat_info = None
+
+            if stat_info is not None:
+                if path == job.root:
+                    # Celkové součty z minula zobraz hned, sken je jen ověří
+                    totals = cache.lookup_totals(path, stat_info)
+                    if totals is not None:
+                        self.scan_progress.emit(job.job_id, totals)
+
+                cached = cache.lookup_directory(path, stat_info)
+                if cached is not None:
+                    with job.lock:
+                        job.touched.append(path)
+                    self._finish_directory(job, *cached)
+                    return
+
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if job.cancelled.is_set():
+                        break
+                    try:
+                        entry_stat = entry.stat(follow_symlinks=False)
+                        if entry.is_dir(follow_symlinks=False):
+                            # Symlinky se nesledují, junctions (Windows) také ne
+                            is_junction = getattr(entry, 'is_junction', None)
+                            if is_junction and is_junction():
+                                continue
+                            subdirs.append((entry.path, (entry_stat.st_dev, entry.inode()), entry_stat))
+                        else:
+                            files += 1
+                            if entry_stat.st_nlink > 1:
+                                linked.append(((entry_stat.st_dev, entry_stat.st_ino), entry_stat.st_size))
+                            else:
+                                size += entry_stat.st_size
+                    except OSError:
+                        errors += 1
+        except OSError:
+            errors += 1
+
+        if cache is not None and stat_info is not None and not job.cancelled.is_set():
+            with job.lock:
+                job.records.append((path, stat_info, files, size, errors,
+                                    [(p, key) for p, key, _ in subdirs], linked))
+
+        self._finish_directory(job, files, size, errors, subdirs, linked)
+
+    def _finish_directory(self, job: _FolderScanJob, files: int, size: int, errors: int,
+                          subdirs: list, linked: list) -> None:
+        """Přičte výsledek složky k úloze, naplánuje podsložky a pošle průběh
+
+        subdirs obsahuje dvojice (cesta, klíč) nebo trojice (cesta, klíč, stat).
+        """
+        new_dirs = []
+        snapshot = None
+        done = False
+
+        with job.lock:
+            stats = job.stats
+            stats.files += files
+            stats.size += size
+            stats.errors += errors
+
+            # Hardlinky se do velikosti počítají jen jednou
+            for key, link_size in linked:
+                if key not in job.seen_files:
+                    job.seen_files.add(key)
+                    stats.size += link_size
+
+            for subdir in subdirs:
+                key = subdir[1]
+                if key in job.seen_dirs:
+                    continue
+                job.seen_dirs.add(key)
+                stats.folders += 1
+                new_dirs.append((subdir[0], subdir[2] if len(subdir) > 2 else None))
+
+            job.pending += len(new_dirs) - 1
+            done = job.pending == 0
+
+            now = time.monotonic()
+            if done:
+                stats.complete = True
+                snapshot = stats.copy()
+            elif now - job.last_emit >= self.PROGRESS_INTERVAL:
+                job.last_emit = now
+                snapshot = stats.copy()
+
+        if job.cancelled.is_set():
+            return
+
+        for subdir_path, subdir_stat in new_dirs:
+            self._submit(job, subdir_path, subdir_stat)
+
+        if done:
+            with self._jobs_lock:
+                self._jobs.pop(job.job_id, None)
+            cache = self.cache
+            if cache is not None:
+                cache.store(job.records, job.touched, job.root, snapshot)
+            self.scan_finished.emit(job.job_id, snapshot)
+        elif snapshot is not None:
+            self.scan_progress.emit(job.job_id, snapshot)
+
+
+def allocated_size(stat_info) -> int:
+    """Místo, které soubor skutečně zabírá na disku (st_blocks)
+
+    Řídké a komprimované soubory zabírají méně než jejich velikost, malé
+    soubory naopak celý blok. Windows st_blocks nemá, použije se velikost.
+    """
+    blocks = getattr(stat_info, 'st_blocks', None)
+    if blocks is None:
+        return stat_info.st_size
+    return blocks * 512
+
+
+class DiskUsageNode:
+    """Složka ve stromu využití disku
+
+    Přímý obsah (own_*, files, linked) se po přečtení složky už nemění,
+    součty podstromu (size, allocated, total_*) pracovní vlákna průběžně
+    zvyšují. Podsložky se zveřejní najednou přiřazením celého slovníku
+    children, takže strom lze v GUI procházet bez zámku.
+    """
+
+    TOP_FILES = 24  # Počet největších souborů složky uchovávaných jednotlivě
+
+    __slots__ = ('name', 'path', 'parent', 'key', 'children', 'files', 'linked', 'file_count',
+                 'own_size', 'own_allocated', 'direct_size', 'direct_allocated', 'errors',
+                 'size', 'allocated', 'total_files', 'total_folders', 'scanned')
+
+    def __init__(self, name: str, path: str, parent: Optional['DiskUsageNode'] = None):
+        self.name = name
+        self.path = path
+        self.parent = parent
+        self.key = None             # (st_dev, st_ino, st_mtime_ns) složky při čtení
+        self.children = {}          # Název -> DiskUsageNode
+        self.files = ()             # (obsazeno, název, velikost) největších souborů sestupně
+        self.linked = ()            # ((st_dev, st_ino), velikost, obsazeno) souborů s více hardlinky
+        self.file_count = 0
+        self.own_size = 0           # Přímé soubory bez hardlinků
+        self.own_allocated = 0
+        self.direct_size = 0        # Přímé soubory včetně hardlinků započtených v této složce
+        self.direct_allocated = 0
+        self.errors = 0
+        self.size = 0               # Celý podstrom
+        self.allocated = 0
+        self.total_files = 0
+        self.total_folders = 0
+        self.scanned = False        # Přímý obsah je přečtený a započtený
+
+    def find(self, path: str) -> Optional['DiskUsageNode']:
+        """Najde uzel cesty v podstromu tohoto uzlu"""
+        if path == self.path:
+            return self
+        prefix = self.path.rstrip(os.sep) + os.sep
+        if not path.startswith(prefix):
+            return None
+        node = self
+        for name in path[len(prefix):].split(os.sep):
+            if not name:
+                continue
+            node = node.children.get(name)
+            if node is None:
+                return None
+        return node
+
+
+class _DiskUsageJob:
+    """Stav jednoho skenu využití disku sdílený mezi pracovními vlákny"""
+
+    def __init__(self, job_id: int, root: DiskUsageNode):
+        self.job_id = job_id
+        self.root = root
+        self.cancelled = threading.Event()
+        self.lock = threading.Lock()
+        self.pending = 0            # Počet složek čekajících na zpracování
+        self.seen_files = set()     # (st_dev, st_ino) souborů s více hardlinky
+        self.seen_dirs = set()      # (st_dev, st_ino) navštívených složek - ochrana proti smyčkám
+        self.last_emit = 0.0
+        self.reused = 0             # Složky převzaté z předchozího skenu bez čtení
+
+
+class DiskUsageScanner(QObject):
+    """Paralelní sken stromu složek pro zobrazení využití disku
+
+    Na rozdíl od FolderSizeScanner si pamatuje celý strom složek se
+    zdánlivou i obsazenou velikostí a největšími soubory každé složky.
+    Každá složka je samostatná úloha v poolu vláken, strom se plní
+    průběžně a signál scan_progress posílá stále tentýž kořen s
+    upřesněnými součty. Dokončené stromy se uchovávají v paměti; při
+    dalším skenu se složka se stejným st_mtime_ns nečte znovu, jen se
+    převezme její přímý obsah z minula (podsložky se ověří samostatně).
+    Zvětšení souboru mtime složky nezmění, proto výslovný nový sken
+    (reuse=False) čte všechny složky.
+    """
+
+    scan_progress = pyqtSignal(int, object)  # job_id, DiskUsageNode kořene (průběžně)
+    scan_finished = pyqtSignal(int, object)  # job_id, DiskUsageNode kořene (konečně)
+
+    PROGRESS_INTERVAL = 0.25  # Minimální odstup průběžných signálů v sekundách
+    MAX_RESULTS = 4           # Počet uchovaných dokončených stromů
+
+    def __init__(self, parent=None, max_workers: Optional[int] = None):
+        from concurrent.futures import ThreadPoolExecutor
+        super().__init__(parent)
+        if max_workers is None:
+            max_workers = min(16, (os.cpu_count() or 2) * 2)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="disk-usage")
+        self._jobs = {}
+        self._jobs_lock = threading.Lock()
+        self._next_job_id = 1
+        self._results = OrderedDict()  # Kořenová cesta -> dokončený DiskUsageNode
+        self._results_lock = threading.Lock()
+
+    def result(self, path: str) -> Optional[DiskUsageNode]:
+        """Vrací uzel cesty z posledního dokončeného skenu (může být zastaralý)"""
+        with self._results_lock:
+            for root_path in reversed(self._results):
+                node = self._results[root_path].find(path)
+                if node is not None:
+                    self._results.move_to_end(root_path)
+                    return node
+        return None
+
+    def scan(self, path: str, reuse: bool = True) -> int:
+        """Spustí sken složky a vrátí identifikátor úlohy
+
+        S reuse se převezme přímý obsah nezměněných složek z minulého skenu.
+        """
+        with self._jobs_lock:
+            job_id = self._next_job_id
+            self._next_job_id += 1
+            job = _DiskUsageJob(job_id, DiskUsageNode(os.path.basename(path.rstrip(os.sep)) or path, path))
+            self._jobs[job_id] = job
+
+        job.pending = 1
+        self._submit(job, job.root, self.result(path) if reuse else None, None)
+        return job_id
+
+    def cancel(self, job_id: int) -> None:
+        """Zruší běžící sken"""
+        with self._jobs_lock:
+            job = self._jobs.pop(job_id, None)
+        if job:
+            job.cancelled.set()
+
+    def shutdown(self) -> None:
+        """Zruší všechny skeny a ukončí pool vláken"""
+        with self._jobs_lock:
+            jobs = list(self._jobs.values())
+            self._jobs.clear()
+        for job in jobs:
+            job.cancelled.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, job: _DiskUsageJob, node: DiskUsageNode,
+                previous: Optional[DiskUsageNode], stat_info) -> None:
+        """Zařadí složku ke zpracování"""
+        try:
+            self._executor.submit(self._scan_directory, job, node, previous, stat_info)
+        except RuntimeError:
+            # Pool už je ukončený (zavírání aplikace)
+            job.cancelled.set()
+
+    def _scan_directory(self, job: _DiskUsageJob, node: DiskUsageNode,
+                        previous: Optional[DiskUsageNode], stat_info) -> None:
+        """Přečte přímý obsah jedné složky (běží v pracovním vlákně)"""
+        subdirs = []  # (název, (st_dev, st_ino) nebo None, stat nebo None, předchozí uzel)
+        if job.cancelled.is_set():
+            self._finish_directory(job, node, subdirs)
+            return
+
+        try:
+            if stat_info is None:
+                stat_info = os.stat(node.path)
+            node.key = (stat_info.st_dev, stat_info.st_ino, stat_info.st_mtime_ns)
+        except OSError:
+            node.errors += 1
+            self._finish_directory(job, node, subdirs)
+            return
+
+        # Nezměněná složka - přímý obsah z minula, podsložky se ověří každá zvlášť
+        if previous is not None and previous.scanned and previous.key == node.key:
+            node.files = previous.files
+            node.linked = previous.linked
+            node.file_count = previous.file_count
+            node.own_size = previous.own_size
+            node.own_allocated = previous.own_allocated
+            node.errors = previous.errors
+            for name, child in previous.children.items():
+                subdirs.append((name, child.key[:2] if child.key else None, None, child))
+            with job.lock:
+                job.reused += 1
+            self._finish_directory(job, node, subdirs)
+            return
+
+        largest = []  # Min-halda největších souborů
+        linked = []
+        try:
+            with os.scandir(node.path) as entries:
+                for entry in entries:
+                    if job.cancelled.is_set():
+                        break
+                    try:
+                        entry_stat = entry.stat(follow_symlinks=False)
+                        if entry.is_dir(follow_symlinks=False):
+                            # Symlinky se nesledují, junctions (Windows) také ne
+                            is_junction = getattr(entry, 'is_junction', None)
+                            if is_junction and is_junction():
+                                continue
+                            child = previous.children.get(entry.name) if previous is not None else None
+                            subdirs.append((entry.name, (entry_stat.st_dev, entry.inode()), entry_stat, child))
+                            continue
+                        allocated = allocated_size(entry_stat)
+                        node.file_count += 1
+                        if entry_stat.st_nlink > 1:
+                            linked.append(((entry_stat.st_dev, entry_stat.st_ino), entry_stat.st_size, allocated))
+                        else:
+                            node.own_size += entry_stat.st_size
+                            node.own_allocated += allocated
+                        item = (allocated, entry.name, entry_stat.st_size)
+                        if len(largest) < DiskUsageNode.TOP_FILES:
+                            heapq.heappush(largest, item)
+                        elif item > largest[0]:
+                            heapq.heapreplace(largest, item)
+                    except OSError:
+                        node.errors += 1
+        except OSError:
+            node.errors += 1
+
+        node.files = tuple(sorted(largest, reverse=True))
+        node.linked = tuple(linked)
+        self._finish_directory(job, node, subdirs)
+
+    def _finish_directory(self, job: _DiskUsageJob, node: DiskUsageNode, subdirs: list) -> None:
+        """Zveřejní podsložky uzlu, přičte jeho obsah předkům a naplánuje podsložky"""
+        new_dirs = []
+        emit = False
+        done = False
+
+        with job.lock:
+            direct_size = node.own_size
+            direct_allocated = node.own_allocated
+            # Hardlinky se do velikosti počítají jen jednou
+            for key, link_size, link_allocated in node.linked:
+                if key not in job.seen_files:
+                    job.seen_files.add(key)
+                    direct_size += link_size
+                    direct_allocated += link_allocated
+            node.direct_size = direct_size
+            node.direct_allocated = direct_allocated
+
+            children = {}
+            if not job.cancelled.is_set():
+                for name, key, child_stat, previous_child in subdirs:
+                    if key is not None:
+                        if key in job.seen_dirs:
+                            continue
+                        job.seen_dirs.add(key)
+                    child = DiskUsageNode(name, os.path.join(node.path, name), node)
+                    children[name] = child
+                    new_dirs.append((child, previous_child, child_stat))
+            node.children = children
+            node.scanned = True
+
+            ancestor = node
+            while ancestor is not None:
+                ancestor.size += direct_size
+                ancestor.allocated += direct_allocated
+                ancestor.total_files += node.file_count
+                ancestor.total_folders += len(children)
+                ancestor = ancestor.parent
+
+            job.pending += len(new_dirs) - 1
+            done = job.pending == 0
+            now = time.monotonic()
+            if not done and now - job.last_emit >= self.PROGRESS_INTERVAL:
+                job.last_emit = now
+                emit = True
+
+        if job.cancelled.is_set():
+            return
+
+        for child, previous_child, child_stat in new_dirs:
+            self._submit(job, child, previous_child, child_stat)
+
+        if done:
+            with self._jobs_lock:
+                self._jobs.pop(job.job_id, None)
+            with self._results_lock:
+                # Nový strom nahradí uložené stromy svých podsložek
+                for root_path in [p for p in self._results if job.root.find(p) is not None]:
+                    del self._results[root_path]
+                self._results[job.root.path] = job.root
+                while len(self._results) > self.MAX_RESULTS:
+                    self._results.popitem(last=False)
+            self.scan_finished.emit(job.job_id, job.root)
+        elif emit:
+            self.scan_progress.emit(job.job_id, job.root)
+
+
+@traced("náhled")
+def decode_preview_image(file_path: str, width: int, height: int) -> QImage:
+    """Dekóduje zmenšený obrázek, který se vejde do width x height
+
+    Pillow u JPEG pomocí draft() dekóduje rovnou ve zmenšeném měřítku
+    a thumbnail() zmenšuje přes reduce(), takže se obrázek nikdy
+    nerozbaluje v plném rozlišení, pokud to formát umožňuje. Bez Pillow
+    (nebo pro formát, který nezná) se použije QImageReader se scaledSize.
+    Vrací nulový QImage, pokud se obrázek nepodařilo načíst.
+    """
+    if load_pillow():
+        try:
+            with Image.open(file_path) as img:
+                img.draft('RGB', (width, height))
+                img = ImageOps.exif_transpose(img)
+                img.thumbnail((width, height), Image.Resampling.LANCZOS, reducing_gap=2.0)
+                img = img.convert('RGBA')
+                data = img.tobytes('raw', 'RGBA')
+                image = QImage(data, img.width, img.height, img.width * 4, QImage.Format.Format_RGBA8888)
+                # copy() převezme data, buffer z Pillow po návratu zanikne
+                return image.copy()
+        except Exception:
+            pass
+
+    reader = QImageReader(file_path)
+    reader.setAutoTransform(True)
+    source_size = reader.size()
+    if source_size.isValid():
+        target_size = source_size.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio)
+        if target_size.width() < source_size.width():
+            reader.setScaledSize(target_size)
+    image = reader.read()
+    if image.isNull():
+        return QImage()
+    if image.width() > width or image.height() > height:
+        image = image.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio,
+                             Qt.TransformationMode.SmoothTransformation)
+    return image
+
+
+def read_png_text(file_path: str) -> dict:
+    """Přečte textová pole (tEXt/iTXt) z hlavičky PNG bez dekódování obrazu
+
+    QImageReader.text() klíče s dvojtečkou (Thumb::URI) nerozliší, proto
+    se bloky čtou přímo až po první obrazová data.
+    """
+    text = {}
+    try:
+        with open(file_path, 'rb') as f:
+            if f.read(8) != b'\x89PNG\r\n\x1a\n':
+                return text
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    break
+                length, chunk_type = struct.unpack('>I4s', header)
+                if chunk_type in (b'IDAT', b'IEND'):
+                    break
+                if chunk_type not in (b'tEXt', b'iTXt'):
+                    f.seek(length + 4, os.SEEK_CUR)
+                    continue
+                data = f.read(length)
+                f.seek(4, os.SEEK_CUR)  # CRC
+                key, _, value = data.partition(b'\0')
+                if chunk_type == b'tEXt':
+                    text[key.decode('latin-1')] = value.decode('latin-1')
+                elif value[:1] == b'\0':
+                    # iTXt: příznak komprese, metoda, jazyk, přeložený klíč, text
+                    _, _, rest = value[2:].partition(b'\0')
+                    _, _, value = rest.partition(b'\0')
+                    text[key.decode('latin-1')] = value.decode('utf-8', 'replace')
+    except (OSError, struct.error):
+        pass
+    return text
+
+
+class ThumbnailStore:
+    """Perzistentní úložiště náhledů podle specifikace freedesktop.org
+
+    Náhled je PNG soubor <kořen>/<velikost>/<md5(URI)>.png s textovými
+    poli Thumb::URI a Thumb::MTime, podle kterých se při čtení ověřuje,
+    že odpovídá aktuální verzi souboru. Na Linuxu se sdílí s ostatními
+    aplikacemi (~/.cache/thumbnails), jinde leží v mezipaměti aplikace.
+    """
+
+    # Názvy podsložek a maximální rozměr náhledu v pixelech
+    SIZES = (('normal', 128), ('large', 256), ('x-large', 512), ('xx-large', 1024))
+
+    def __init__(self, root: Optional[str] = None):
+        if root is None:
+            if sys.platform.startswith('linux'):
+                xdg_cache = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+                root = os.path.join(xdg_cache, 'thumbnails')
+            else:
+                root = os.path.join(get_cache_dir(), 'thumbnails')
+        self.root = root
+
+    @classmethod
+    def bucket_for(cls, width: int, height: int) -> tuple:
+        """Vrací nejmenší velikost náhledu (název, pixely), do které se vejde požadovaný rozměr"""
+        needed = max(width, height)
+        for name, pixels in cls.SIZES:
+            if pixels >= needed:
+                return name, pixels
+        return cls.SIZES[-1]
+
+    @staticmethod
+    def file_uri(file_path: str) -> str:
+        """URI souboru ve tvaru, ze kterého se počítá název náhledu"""
+        return QUrl.fromLocalFile(os.path.abspath(file_path)).toString(QUrl.ComponentFormattingOption.FullyEncoded)
+
+    def thumbnail_path(self, file_path: str, bucket: str) -> str:
+        """Cesta k souboru náhledu pro danou velikost"""
+        import hashlib
+        digest = hashlib.md5(self.file_uri(file_path).encode('utf-8')).hexdigest()
+        return os.path.join(self.root, bucket, digest + '.png')
+
+    def is_thumbnail(self, file_path: str) -> bool:
+        """Kontroluje, zda soubor sám leží v úložišti náhledů"""
+        return os.path.abspath(file_path).startswith(os.path.abspath(self.root) + os.sep)
+
+    def load(self, file_path: str, mtime: int, bucket: str) -> Optional[QImage]:
+        """Načte platný náhled, nebo vrátí None (chybí, je zastaralý nebo poškozený)"""
+        thumb_path = self.thumbnail_path(file_path, bucket)
+        text = read_png_text(thumb_path)
+        if text.get('Thumb::URI') != self.file_uri(file_path) or text.get('Thumb::MTime') != str(mtime):
+            return None
+        image = QImage(thumb_path, 'PNG')
+        return None if image.isNull() else image
+
+    def save(self, file_path: str, mtime: int, size: int, bucket: str, image: QImage) -> bool:
+        """Uloží náhled atomicky (zápis do dočasného souboru a přejmenování)"""
+        if image.isNull() or self.is_thumbnail(file_path):
+            return False
+
+        thumb_path = self.thumbnail_path(file_path, bucket)
+        image = QImage(image)
+        image.setText('Thumb::URI', self.file_uri(file_path))
+        image.setText('Thumb::MTime', str(mtime))
+        image.setText('Thumb::Size', str(size))
+        image.setText('Software', 'FlexiFiles')
+
+        try:
+            os.makedirs(os.path.dirname(thumb_path), mode=0o700, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(suffix='.png', dir=os.path.dirname(thumb_path))
+            os.close(fd)
+        except OSError:
+            return False
+
+        if image.save(temp_path, 'PNG'):
+            try:
+                os.replace(temp_path, thumb_path)
+                return True
+            except OSError:
+                pass
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return False
+
+    def prune(self) -> int:
+        """Smaže náhledy souborů, které už neexistují, a vrátí jejich počet"""
+        removed = 0
+        for bucket, _ in self.SIZES:
+            bucket_dir = os.path.join(self.root, bucket)
+            try:
+                entries = list(os.scandir(bucket_dir))
+            except OSError:
+                continue
+            for entry in entries:
+                if not entry.name.endswith('.png') or not entry.is_file(follow_symlinks=False):
+                    continue
+                url = QUrl(read_png_text(entry.path).get('Thumb::URI', ''))
+                if not url.isLocalFile():
+                    # Náhledy vzdálených URI (jiných aplikací) nelze ověřit, nechávají se být
+                    continue
+                if not os.path.exists(url.toLocalFile()):
+                    try:
+                        os.remove(entry.path)
+                        removed += 1
+                    except OSError:
+                        pass
+        return removed
+
+
+class PreviewService(QObject):
+    """Dekódování náhledů obrázků v poolu vláken s LRU mezipamětí v paměti
+
+    Žadatelé (informační panely, ikonová zobrazení) se rozlišují kanálem.
+    Výsledek se posílá signálem preview_ready jen tehdy, pokud o něj kanál
+    stále stojí - požadavky na položky, od kterých uživatel už odešel,
+    se zahodí dřív, než se začnou dekódovat.
+    """
+
+    preview_ready = pyqtSignal(str, str, QImage)  # kanál, cesta, obrázek (nulový = bez náhledu)
+    thumbnails_pruned = pyqtSignal(int)           # počet smazaných náhledů
+
+    DEFAULT_BUDGET = 64 * 1024 * 1024  # Limit paměti pro dekódované náhledy v bajtech
+
+    def __init__(self, parent=None, max_workers: Optional[int] = None,
+                 budget_bytes: int = DEFAULT_BUDGET, thumbnail_store: Optional[ThumbnailStore] = None):
+        from concurrent.futures import ThreadPoolExecutor
+        super().__init__(parent)
+        self.thumbnail_store = thumbnail_store
+        if max_workers is None:
+            max_workers = max(2, min(4, os.cpu_count() or 2))
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="preview")
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()  # klíč -> QImage, od nejdéle nepoužitého
+        self._cache_bytes = 0
+        self.budget_bytes = budget_bytes
+        self._wanted = {}            # kanál -> {klíč: future}
+
+    @staticmethod
+    def make_key(file_path: str, width: int, height: int, stat_info=None) -> Optional[tuple]:
+        """Klíč mezipaměti (cesta, mtime, velikost, rozměr náhledu)"""
+        try:
+            if stat_info is None:
+                stat_info = os.stat(file_path)
+        except OSError:
+            return None
+        return (file_path, stat_info.st_mtime_ns, stat_info.st_size, width, height)
+
+    def request(self, channel: str, file_path: str, width: int, height: int,
+                exclusive: bool = True) -> Optional[QImage]:
+        """Požádá o náhled; z mezipaměti vrací obrázek hned, jinak None a dekóduje na pozadí
+
+        exclusive=True zruší ostatní nevyřízené požadavky kanálu
+        (např. informační panel zajímá jen poslední vybraný soubor).
+        """
+        key = self.make_key(file_path, width, height)
+        if key is None:
+            if exclusive:
+                self.cancel(channel)
+            return QImage()
+
+        with self._lock:
+            image = self._cache.get(key)
+            if image is not None:
+                self._cache.move_to_end(key)
+
+            wanted = self._wanted.setdefault(channel, {})
+            if exclusive:
+                for other_key, future in list(wanted.items()):
+                    if other_key != key:
+                        future.cancel()
+                        del wanted[other_key]
+
+            if image is not None or key in wanted:
+                return image
+
+            try:
+                wanted[key] = self._executor.submit(self._decode, channel, key)
+            except RuntimeError:
+                # Pool už je ukončený (zavírání aplikace)
+                pass
+        return None
+
+    def cancel(self, channel: str, keep_paths: Optional[set] = None) -> None:
+        """Zahodí nevyřízené požadavky kanálu (kromě cest v keep_paths)"""
+        with self._lock:
+            wanted = self._wanted.get(channel)
+            if not wanted:
+                return
+            for key, future in list(wanted.items()):
+                if keep_paths is None or key[0] not in keep_paths:
+                    future.cancel()
+                    del wanted[key]
+
+    def shutdown(self) -> None:
+        """Zruší nevyřízené požadavky a ukončí pool vláken"""
+        with self._lock:
+            self._wanted.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _is_wanted(self, channel: str, key: tuple) -> bool:
+        """Kontroluje, zda o výsledek ještě někdo stojí"""
+        with self._lock:
+            return key in self._wanted.get(channel, ())
+
+    def _decode(self, channel: str, key: tuple) -> None:
+        """Dekóduje náhled (běží v pracovním vlákně)"""
+        if not self._is_wanted(channel, key):
+            return
+
+        image = self._load_or_decode(*key)
+
+        with self._lock:
+            if not image.isNull():
+                self._store(key, image)
+            wanted = self._wanted.get(channel)
+            if not wanted or wanted.pop(key, None) is None:
+                return
+        self.preview_ready.emit(channel, key[0], image)
+
+    def _load_or_decode(self, file_path: str, mtime_ns: int, size: int, width: int, height: int) -> QImage:
+        """Vezme náhled z diskového úložiště, případně ho dekóduje a uloží"""
+        store = self.thumbnail_store
+        if store is None:
+            return decode_preview_image(file_path, width, height)
+
+        bucket, pixels = store.bucket_for(width, height)
+        mtime = mtime_ns // 1_000_000_000
+        image = store.load(file_path, mtime, bucket)
+        if image is None:
+            image = decode_preview_image(file_path, pixels, pixels)
+            store.save(file_path, mtime, size, bucket, image)
+
+        if not image.isNull() and (image.width() > width or image.height() > height):
+            image = image.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio,
+                                 Qt.TransformationMode.SmoothTransformation)
+        return image
+
+    def prune_thumbnails(self) -> None:
+        """Na pozadí smaže náhledy neexistujících souborů (výsledek přijde v thumbnails_pruned)"""
+        if self.thumbnail_store is None:
+            self.thumbnails_pruned.emit(0)
+            return
+        store = self.thumbnail_store
+        self._executor.submit(lambda: self.thumbnails_pruned.emit(store.prune()))
+
+    def _store(self, key: tuple, image: QImage) -> None:
+        """Vloží obrázek do LRU a dodrží rozpočet paměti (volá se pod zámkem)"""
+        if key in self._cache:
+            return
+        self._cache[key] = image
+        self._cache_bytes += image.sizeInBytes()
+        while self._cache_bytes > self.budget_bytes and len(self._cache) > 1:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= evicted.sizeInBytes()
+
+
+class ThumbnailDelegate(QStyledItemDelegate):
+    """Delegát ikonového zobrazení, který místo obecných ikon kreslí náhledy obrázků
+
+    Náhledy se vyžadují jen pro řádky, které view skutečně vykreslilo,
+    a pro malý okraj kolem nich. Po posunu se nevyřízené požadavky
+    na řádky mimo tento rozsah zahodí, takže se nedekódují obrázky,
+    které uživatel nikdy neuvidí.
+    """
+
+    PREFETCH_ITEMS = 24        # Počet položek předem načítaných před a za viditelnou oblastí
+    MAX_PIXMAPS = 2000         # Limit náhledů držených delegátem
+
+    def __init__(self, view: QListView, preview_service: PreviewService):
+        super().__init__(view)
+        self.view = view
+        self.preview_service = preview_service
+        self._channel = f"icons-{id(self)}"
+        self._pixmaps = OrderedDict()  # cesta -> QPixmap (None = náhled nelze vytvořit)
+        self._painted_rows = set()
+
+        # Požadavky se posílají dávkově po vykreslení snímku
+        self._request_timer = QTimer(self)
+        self._request_timer.setSingleShot(True)
+        self._request_timer.setInterval(30)
+        self._request_timer.timeout.connect(self._request_visible)
+
+        # Hotové náhledy se překreslují hromadně
+        self._repaint_timer = QTimer(self)
+        self._repaint_timer.setSingleShot(True)
+        self._repaint_timer.setInterval(30)
+        self._repaint_timer.timeout.connect(lambda: self.view.viewport().update())
+
+        preview_service.preview_ready.connect(self._on_preview_ready)
+
+    def thumbnail_size(self) -> int:
+        """Rozměr náhledu podle velikosti ikon ve view"""
+        icon_size = self.view.iconSize()
+        return max(icon_size.width(), icon_size.height())
+
+    def paint(self, painter, option, index):
+        """Zaznamená vykreslený řádek a vykreslí položku"""
+        self._painted_rows.add(index.row())
+        if not self._request_timer.isActive():
+            self._request_timer.start()
+        super().paint(painter, option, index)
+
+    def initStyleOption(self, option, index):
+        """Nahradí ikonu náhledem, pokud už je k dispozici"""
+        super().initStyleOption(option, index)
+        path = index.data(QFileSystemModel.Roles.FilePathRole)
+        pixmap = self._pixmaps.get(path) if path else None
+        if pixmap is not None:
+            self._pixmaps.move_to_end(path)
+            option.icon = QIcon(pixmap)
+
+    def clear(self):
+        """Zahodí náhledy (např. po obnovení zobrazení)"""
+        self._pixmaps.clear()
+        self.preview_service.cancel(self._channel)
+
+    def _request_visible(self):
+        """Vyžádá náhledy pro vykreslené řádky a okraj kolem nich"""
+        rows = self._painted_rows
+        self._painted_rows = set()
+        model = self.view.model()
+        if not rows or model is None:
+            return
+
+        root = self.view.rootIndex()
+        first = max(0, min(rows) - self.PREFETCH_ITEMS)
+        last = min(model.rowCount(root) - 1, max(rows) + self.PREFETCH_ITEMS)
+
+        wanted = []
+        for row in range(first, last + 1):
+            path = model.index(row, 0, root).data(QFileSystemModel.Roles.FilePathRole)
+            if not path or path in self._pixmaps:
+                continue
+            if os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS:
+                wanted.append(path)
+
+        # Položky, od kterých uživatel odscrolloval, se nedekódují
+        self.preview_service.cancel(self._channel, keep_paths=set(wanted))
+
+        size = self.thumbnail_size()
+        for path in wanted:
+            image = self.preview_service.request(self._channel, path, size, size, exclusive=False)
+            if image is not None:
+                self._store_pixmap(path, image)
+
+    def _on_preview_ready(self, channel: str, file_path: str, image: QImage):
+        """Uloží hotový náhled a naplánuje překreslení"""
+        if channel != self._channel:
+            return
+        self._store_pixmap(file_path, image)
+
+    def _store_pixmap(self, file_path: str, image: QImage):
+        """Převede náhled na QPixmap a udrží limit počtu"""
+        self._pixmaps[file_path] = None if image.isNull() else QPixmap.fromImage(image)
+        self._pixmaps.move_to_end(file_path)
+        while len(self._pixmaps) > self.MAX_PIXMAPS:
+            self._pixmaps.popitem(last=False)
+        if not self._repaint_timer.isActive():
+            self._repaint_timer.start()
+
+
+class FileSystemModelManager(QObject):
+    """Spravuje sdílený QFileSystemModel záložek a omezuje jeho mezipaměť
+
+    QFileSystemModel si drží uzly a sledování každé složky, kterou kdy načetl,
+    a jednotlivě je zahodit neumí. Správce proto počítá načtené složky a jejich
+    položky; když složky, které si žádná záložka neprohlíží, překročí limit,
+    nahradí model čerstvým (signál model_replaced) a záložky se na něj přepojí.
+    Znovu se pak načtou jen právě zobrazené složky.
+    """
+
+    model_replaced = pyqtSignal(object)  # nový QFileSystemModel
+    directory_loaded = pyqtSignal(str)   # directoryLoaded aktuálního modelu
+
+    DEFAULT_MAX_DIRECTORIES = 500
+    DEFAULT_MAX_NODES = 250000
+
+    def __init__(self, max_directories: int = DEFAULT_MAX_DIRECTORIES,
+                 max_nodes: int = DEFAULT_MAX_NODES, parent=None):
+        super().__init__(parent)
+        self.max_directories = max_directories
+        self.max_nodes = max_nodes
+        self._loaded = {}  # normovaná cesta načtené složky -> počet položek
+        self._node_count = 0
+        self.root_path = ""  # Sledovaný kořen se nastaví až po startu (set_root_path)
+        self.model = self._create_model()
+
+    def _create_model(self) -> QFileSystemModel:
+        model = QFileSystemModel(self)
+        if self.root_path:
+            model.setRootPath(self.root_path)
+        model.directoryLoaded.connect(self._on_directory_loaded)
+        return model
+
+    def set_root_path(self, path: str) -> None:
+        """Nastaví kořen sledovaný modelem (i modely vytvořenými později)"""
+        self.root_path = path
+        self.model.setRootPath(path)
+
+    def _on_directory_loaded(self, path: str):
+        if self.sender() is not self.model:
+            return
+        key = os.path.normpath(path)
+        count = self.model.rowCount(self.model.index(path))
+        self._node_count += count - self._loaded.get(key, 0)
+        self._loaded[key] = count
+        self.directory_loaded.emit(path)
+
+    def cached_directories(self) -> int:
+        return len(self._loaded)
+
+    def cached_nodes(self) -> int:
+        return self._node_count
+
+    def trim(self, active_paths) -> bool:
+        """Nahradí model čerstvým, pokud neprohlížené složky překročily limit"""
+        active = {os.path.normpath(path) for path in active_paths}
+        active_nodes = sum(self._loaded.get(path, 0) for path in active)
+        stale_directories = len(self._loaded.keys() - active)
+        if stale_directories <= self.max_directories and self._node_count - active_nodes <= self.max_nodes:
+            return False
+        old = self.model
+        old.directoryLoaded.disconnect(self._on_directory_loaded)
+        self._loaded.clear()
+        self._node_count = 0
+        self.model = self._create_model()
+        self.model_replaced.emit(self.model)
+        old.deleteLater()
+        return True
+
+
+class LargeDirectoryModel(QAbstractTableModel):
+    """Plochý model obsahu jedné obří složky načítaný přes os.scandir
+
+    QFileSystemModel drží pro každou položku uzel s QFileInfo a řadí celý
+    strom, což se u složek se statisíci položek projeví při načtení i řazení.
+    Tento model čte složku ve vlákně po blocích a ukládá ji po sloupcích:
+    názvy bloku v jednom řetězci oddělené znakem NUL (s polem počátků),
+    velikosti a časy změny v polích array, příznaky po bajtech. Texty
+    buněk vznikají až při dotazu zobrazení, řadí se jen permutace řádků.
+    Sloupce odpovídají QFileSystemModel a FilePathRole vrací cestu, takže
+    ho DirectoryFilterModel přijme jako zdroj s neplatným kořenem.
+    """
+
+    chunk_loaded = pyqtSignal(int, object)  # generace, blok (názvy, počátky, velikosti, časy, příznaky)
+    loading_finished = pyqtSignal(str)      # cesta načtené složky
+
+    SWITCH_THRESHOLD = 50000  # Od kolika položek složku nezobrazuje QFileSystemModel
+    CHUNK_BITS = 13
+    CHUNK_SIZE = 1 << CHUNK_BITS
+    HEADERS = ("Název", "Velikost", "Typ", "Datum změny")
+
+    FLAG_DIR = 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.path = ""
+        self._generation = 0
+        self._loading = False
+        self._clear_columns()
+        self._sort = (0, Qt.SortOrder.AscendingOrder)
+        style = QApplication.style()
+        self._folder_icon = style.standardIcon(QStyle.StandardPixmap.SP_DirIcon)
+        self._file_icon = style.standardIcon(QStyle.StandardPixmap.SP_FileIcon)
+        self.chunk_loaded.connect(self._on_chunk_loaded)
+
+    def _clear_columns(self):
+        self._chunks = []           # (názvy oddělené NUL, počátky názvů v řetězci)
+        self._sizes = array('q')
+        self._mtimes = array('d')
+        self._flags = bytearray()
+        self._count = 0
+        self._order = None          # permutace zobrazených řádků (None = pořadí načtení)
+
+    # Načítání
+
+    def load(self, path: str):
+        """Začne číst složku znovu od začátku"""
+        self.cancel()
+        self.beginResetModel()
+        self.path = path
+        self._clear_columns()
+        self._loading = True
+        self.endResetModel()
+        threading.Thread(target=self._load, args=(self._generation, path), daemon=True).start()
+
+    def show_pending(self, path: str):
+        """Zobrazí složku prázdnou ve stavu načítání, dokud není jasné, který model ji bude číst"""
+        self.cancel()
+        self.beginResetModel()
+        self.path = path
+        self._clear_columns()
+        self._loading = True
+        self.endResetModel()
+
+    def cancel(self):
+        """Zastaví čtení - rozpracované bloky se zahodí"""
+        self._generation += 1
+        self._loading = False
+
+    def is_loading(self) -> bool:
+        return self._loading
+
+    def snapshot(self) -> Optional[tuple]:
+        """Načtený obsah pro restore() - sloupce se nekopírují, load() založí nové"""
+        if self._loading or not self.path:
+            return None
+        return (self.path, self._chunks, self._sizes, self._mtimes, self._flags, self._count)
+
+    def restore(self, snapshot: tuple):
+        """Zobrazí obsah ze snapshot() bez nového čtení složky"""
+        self.cancel()
+        self.beginResetModel()
+        self.path, self._chunks, self._sizes, self._mtimes, self._flags, self._count = snapshot
+        self._order = None
+        self.endResetModel()
+        self._apply_sort()
+        self.loading_finished.emit(self.path)
+
+    def _load(self, generation: int, path: str):
+        """Čte složku ve vlákně a posílá bloky po CHUNK_SIZE položkách"""
+        hidden_attribute = getattr(stat, 'FILE_ATTRIBUTE_HIDDEN', 0)
+        names, sizes, mtimes, flags = [], array('q'), array('d'), bytearray()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if generation != self._generation:
+                        return
+                    name = entry.name
+                    if name.startswith('.'):
+                        continue
+                    try:
+                        info = entry.stat()
+                    except OSError:
+                        try:
+                            info = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                    if getattr(info, 'st_file_attributes', 0) & hidden_attribute:
+                        continue
+                    is_dir = stat.S_ISDIR(info.st_mode)
+                    names.append(name)
+                    sizes.append(0 if is_dir else info.st_size)
+                    mtimes.append(info.st_mtime)
+                    flags.append(self.FLAG_DIR if is_dir else 0)
+                    if len(names) == self.CHUNK_SIZE:
+                        self._emit_chunk(generation, names, sizes, mtimes, flags)
+                        names, sizes, mtimes, flags = [], array('q'), array('d'), bytearray()
+        except OSError:
+            pass
+        if names:
+            self._emit_chunk(generation, names, sizes, mtimes, flags)
+        self._emit_chunk(generation, None, None, None, None)
+
+    def _emit_chunk(self, generation: int, names, sizes, mtimes, flags):
+        if names is not None:
+            buffer = "\0" + "\0".join(names) + "\0"
+            offsets = array('I', [1])
+            position = 1
+            for name in names:
+                position += len(name) + 1
+                offsets.append(position)
+            chunk = (buffer, offsets, sizes, mtimes, flags)
+        else:
+            chunk = None  # Konec složky
+        try:
+            self.chunk_loaded.emit(generation, chunk)
+        except RuntimeError:
+            pass  # Model už byl uvolněn
+
+    def _on_chunk_loaded(self, generation: int, chunk):
+        if generation != self._generation:
+            return
+        if chunk is None:
+            self._loading = False
+            self._apply_sort()
+            self.loading_finished.emit(self.path)
+            return
+        buffer, offsets, sizes, mtimes, flags = chunk
+        first, last = self._count, self._count + len(sizes) - 1
+        self.beginInsertRows(QModelIndex(), first, last)
+        self._chunks.append((buffer, offsets))
+        self._sizes.extend(sizes)
+        self._mtimes.extend(mtimes)
+        self._flags.extend(flags)
+        self._count = last + 1
+        if self._order is not None:
+            self._order.extend(range(first, last + 1))
+        self.endInsertRows()
+
+    # Sloupce
+
+    def _name(self, storage_row: int) -> str:
+        buffer, offsets = self._chunks[storage_row >> self.CHUNK_BITS]
+        row = storage_row & (self.CHUNK_SIZE - 1)
+        return buffer[offsets[row]:offsets[row + 1] - 1]
+
+    def _names(self) -> list:
+        """Názvy v pořadí načtení"""
+        names = []
+        for buffer, _ in self._chunks:
+            names.extend(buffer[1:-1].split("\0"))
+        return names
+
+    def _storage_row(self, row: int) -> int:
+        return row if self._order is None else self._order[row]
+
+    def _type_name(self, storage_row: int) -> str:
+        if self._flags[storage_row] & self.FLAG_DIR:
+            return "Složka"
+        extension = os.path.splitext(self._name(storage_row))[1]
+        return f"Soubor {extension[1:].upper()}" if extension else "Soubor"
+
+    def row_names(self) -> list:
+        """Názvy v pořadí zobrazených řádků (pro filtr bez čtení přes data())"""
+        names = self._names()
+        if self._order is None:
+            return names
+        return [names[row] for row in self._order]
+
+    def row_for_name(self, name: str) -> int:
+        """Zobrazený řádek položky podle názvu, -1 pokud ve složce není"""
+        needle = "\0" + name + "\0"
+        for chunk_number, (buffer, offsets) in enumerate(self._chunks):
+            position = buffer.find(needle)
+            if position >= 0:
+                storage_row = (chunk_number << self.CHUNK_BITS) + bisect.bisect_left(offsets, position + 1)
+                return storage_row if self._order is None else self._order.index(storage_row)
+        return -1
+
+    def isDir(self, index: QModelIndex) -> bool:
+        return bool(self._flags[self._storage_row(index.row())] & self.FLAG_DIR)
+
+    def size(self, index: QModelIndex) -> int:
+        return self._sizes[self._storage_row(index.row())]
+
+    def totals(self) -> tuple:
+        """(složky, soubory, celková velikost souborů) načtené části složky"""
+        folders = self._count - self._flags.count(0)
+        return folders, self._count - folders, sum(self._sizes)
+
+    def paths(self, rows) -> List[str]:
+        """Cesty zobrazených řádků bez tvorby indexů"""
+        prefix = os.path.join(self.path, "")
+        return [prefix + self._name(self._storage_row(row)) for row in rows]
+
+    def index_for_path(self, path: str) -> QModelIndex:
+        if os.path.normpath(os.path.dirname(path)) != os.path.normpath(self.path):
+            return QModelIndex()
+        row = self.row_for_name(os.path.basename(path))
+        return self.index(row, 0) if row >= 0 else QModelIndex()
+
+    # QAbstractTableModel
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def canFetchMore(self, parent):
+        # Dokud se složka čte, mají zobrazení počítat s dalšími řádky
+        return not parent.isValid() and self._loading
+
+    def fetchMore(self, parent):
+        pass  # Řádky přicházejí z vlákna samy
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._storage_row(index.row())
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole or role == Qt.ItemDataRole.EditRole:
+            if column == 0:
+                return self._name(row)
+            if column == 1:
+                return "" if self._flags[row] & self.FLAG_DIR else format_size(self._sizes[row])
+            if column == 2:
+                return self._type_name(row)
+            return datetime.fromtimestamp(self._mtimes[row]).strftime("%d.%m.%Y %H:%M")
+        if role == Qt.ItemDataRole.DecorationRole and column == 0:
+            return self._folder_icon if self._flags[row] & self.FLAG_DIR else self._file_icon
+        if role == QFileSystemModel.Roles.FilePathRole:
+            return os.path.join(self.path, self._name(row))
+        if role == QFileSystemModel.Roles.FileNameRole:
+            return self._name(row)
+        if role == Qt.ItemDataRole.TextAlignmentRole and column == 1:
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """Zapamatuje si řazení; během načítání se použije až na celou složku"""
+        self._sort = (column, order)
+        if not self._loading:
+            self._apply_sort()
+
+    def sort_order(self) -> tuple:
+        return self._sort
+
+    def _apply_sort(self):
+        """Seřadí permutaci řádků (složky vždy první), persistentní indexy jdou s položkami"""
+        if not self._count:
+            return
+        column, order = self._sort
+        if column == 0:
+            keys = [name.casefold() for name in self._names()]
+        elif column == 1:
+            keys = self._sizes
+        elif column == 2:
+            keys = [self._type_name(row).casefold() for row in range(self._count)]
+        else:
+            keys = self._mtimes
+        descending = order == Qt.SortOrder.DescendingOrder
+        rows = sorted(range(self._count), key=keys.__getitem__, reverse=descending)
+        flags = self._flags
+        directories = [row for row in rows if flags[row] & self.FLAG_DIR]
+        files = [row for row in rows if not flags[row] & self.FLAG_DIR]
+
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        storage_rows = [self._storage_row(index.row()) for index in old_indexes]
+        self._order = array('I', directories)
+        self._order.extend(files)
+        if storage_rows:
+            if len(set(storage_rows)) > 32:
+                positions = array('I', bytes(4 * self._count))
+                for position, storage_row in enumerate(self._order):
+                    positions[storage_row] = position
+                new_rows = [positions[row] for row in storage_rows]
+            else:
+                new_rows = [self._order.index(row) for row in storage_rows]
+            self.changePersistentIndexList(
+                old_indexes, [self.index(row, index.column()) for row, index in zip(new_rows, old_indexes)]
+            )
+        self.layoutChanged.emit()
+
+
+class DirectoryFilterModel(QAbstractProxyModel):
+    """Plochý proxy model jedné složky s filtrováním podle názvu
+
+    Zobrazuje jen přímé položky kořenové složky zdrojového modelu
+    (v pohledu je kořenem neplatný index). Pro filtrování si model drží
+    seznam názvů převedených casefold() ve stejném pořadí jako řádky
+    zdroje a seznam vyhovujících zdrojových řádků. Prodloužení textu
+    filtru zužuje předchozí výsledek, jinak se prochází všechny klíče.
+    Řazení se předává zdrojovému modelu, pořadí řádků se přebírá z něj.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._root = QPersistentModelIndex()
+        self._text = ""
+        self._keys = None    # casefold názvy řádků kořene (None = zatím nespočítané)
+        self._rows = None    # vyhovující zdrojové řádky vzestupně (None = bez filtru)
+        self._saved = None   # persistentní indexy během změny rozložení zdroje
+        self._removed_range = None
+        self._resetting = False
+        self._sort = (0, Qt.SortOrder.AscendingOrder)
+
+    def setSourceModel(self, model):
+        """Napojí zdrojový model (předchozí se odpojí)"""
+        old = self.sourceModel()
+        self.beginResetModel()
+        if old is not None:
+            for signal, slot in self._source_connections(old):
+                signal.disconnect(slot)
+        super().setSourceModel(model)
+        if model is not None:
+            for signal, slot in self._source_connections(model):
+                signal.connect(slot)
+        self._root = QPersistentModelIndex()
+        self._clear_filter_state()
+        self.endResetModel()
+
+    def _source_connections(self, model) -> list:
+        return [
+            (model.rowsAboutToBeInserted, self._on_rows_about_to_be_inserted),
+            (model.rowsInserted, self._on_rows_inserted),
+            (model.rowsAboutToBeRemoved, self._on_rows_about_to_be_removed),
+            (model.rowsRemoved, self._on_rows_removed),
+            (model.dataChanged, self._on_data_changed),
+            (model.layoutAboutToBeChanged, self._on_layout_about_to_be_changed),
+            (model.layoutChanged, self._on_layout_changed),
+            (model.modelAboutToBeReset, self._on_model_about_to_be_reset),
+            (model.modelReset, self._on_model_reset),
+        ]
+
+    def _clear_filter_state(self) -> None:
+        self._text = ""
+        self._keys = None
+        self._rows = None
+
+    def set_root_index(self, source_index: QModelIndex) -> None:
+        """Zobrazí obsah jiné složky zdroje (filtr se zruší)"""
+        self.beginResetModel()
+        self._root = QPersistentModelIndex(source_index)
+        self._clear_filter_state()
+        self.endResetModel()
+        source = self.sourceModel()
+        if source is not None and source.canFetchMore(source_index):
+            source.fetchMore(source_index)
+
+    def root_index(self) -> QModelIndex:
+        """Index zobrazené složky ve zdrojovém modelu"""
+        return QModelIndex(self._root)
+
+    def filter_text(self) -> str:
+        return self._text
+
+    def source_row_count(self) -> int:
+        """Počet položek složky bez ohledu na filtr"""
+        source = self.sourceModel()
+        return source.rowCount(self.root_index()) if source is not None else 0
+
+    def row_paths(self, first: int, last: int) -> List[str]:
+        """Cesty položek řádků first..last (pro hromadné výběry)"""
+        source = self.sourceModel()
+        if source is None:
+            return []
+        rows = range(first, last + 1) if self._rows is None else self._rows[first:last + 1]
+        if isinstance(source, LargeDirectoryModel):
+            return source.paths(rows)
+        root = self.root_index()
+        index = source.index
+        role = QFileSystemModel.Roles.FilePathRole
+        return [index(row, 0, root).data(role) for row in rows]
+
+    def set_filter_text(self, text: str) -> None:
+        """Zobrazí jen položky, jejichž název obsahuje text (bez ohledu na velikost písmen)"""
+        folded = text.casefold()
+        if folded == self._text:
+            return
+        previous_text, previous_rows = self._text, self._rows
+        self._text = folded
+        if not folded:
+            rows = None
+        else:
+            keys = self._ensure_keys()
+            if previous_rows is not None and previous_text and folded.startswith(previous_text):
+                candidates = previous_rows  # Delší text může jen zúžit předchozí výsledek
+            else:
+                candidates = range(len(keys))
+            rows = [row for row in candidates if folded in keys[row]]
+        self._relayout(rows)
+
+    def _key(self, source_index: QModelIndex) -> str:
+        return str(source_index.data() or "").casefold()
+
+    def _ensure_keys(self) -> list:
+        """Spočítá klíče všech řádků kořene (jednou za načtení složky)"""
+        if self._keys is None:
+            source = self.sourceModel()
+            root = self.root_index()
+            if isinstance(source, LargeDirectoryModel):
+                # Obří složka vydá názvy naráz bez tvorby indexů
+                self._keys = [name.casefold() for name in source.row_names()]
+                return self._keys
+            index = source.index
+            self._keys = [str(index(row, 0, root).data() or "").casefold() for row in range(source.rowCount(root))]
+        return self._keys
+
+    def _matching_rows(self) -> list:
+        keys = self._ensure_keys()
+        return [row for row, key in enumerate(keys) if self._text in key]
+
+    def _relayout(self, rows: Optional[list]) -> None:
+        """Vymění seznam zobrazených řádků, výběr zůstane na položkách, které zůstaly"""
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        sources = [QPersistentModelIndex(self.mapToSource(index)) for index in old_indexes]
+        self._rows = rows
+        self.changePersistentIndexList(old_indexes, [self.mapFromSource(QModelIndex(source)) for source in sources])
+        self.layoutChanged.emit()
+
+    # Mapování indexů
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or column < 0 or row >= self.rowCount() or column >= self.columnCount():
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        if index is None:  # QObject.parent()
+            return super().parent()
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.sourceModel() is None:
+            return 0
+        return self.source_row_count() if self._rows is None else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.sourceModel() is None:
+            return 0
+        return self.sourceModel().columnCount(self.root_index())
+
+    def hasChildren(self, parent=QModelIndex()):
+        return not parent.isValid() and self.rowCount() > 0
+
+    def canFetchMore(self, parent):
+        source = self.sourceModel()
+        return not parent.isValid() and source is not None and source.canFetchMore(self.root_index())
+
+    def fetchMore(self, parent):
+        if not parent.isValid() and self.sourceModel() is not None:
+            self.sourceModel().fetchMore(self.root_index())
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and self.sourceModel() is not None:
+            return self.sourceModel().headerData(section, orientation, role)
+        return super().headerData(section, orientation, role)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """Řadí zdrojový model, proxy jeho pořadí jen převezme"""
+        self._sort = (column, order)
+        if self.sourceModel() is not None:
+            self.sourceModel().sort(column, order)
+
+    def sort_order(self) -> tuple:
+        """Poslední řazení požadované zobrazením (sloupec, pořadí)"""
+        return self._sort
+
+    def mapToSource(self, proxy_index):
+        source = self.sourceModel()
+        if source is None or not proxy_index.isValid() or proxy_index.row() >= self.rowCount():
+            return QModelIndex()
+        row = proxy_index.row() if self._rows is None else self._rows[proxy_index.row()]
+        return source.index(row, proxy_index.column(), self.root_index())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid() or source_index.parent() != self.root_index():
+            return QModelIndex()
+        row = source_index.row()
+        if self._rows is not None:
+            position = bisect.bisect_left(self._rows, row)
+            if position >= len(self._rows) or self._rows[position] != row:
+                return QModelIndex()
+            row = position
+        return self.createIndex(row, source_index.column())
+
+    # Změny zdrojového modelu (zajímají jen přímé položky kořene)
+
+    def _is_root(self, parent: QModelIndex) -> bool:
+        return parent == self.root_index()
+
+    def _on_rows_about_to_be_inserted(self, parent, first, last):
+        if self._is_root(parent) and self._rows is None:
+            self.beginInsertRows(QModelIndex(), first, last)
+
+    def _on_rows_inserted(self, parent, first, last):
+        if not self._is_root(parent):
+            return
+        count = last - first + 1
+        if self._keys is not None:
+            source = self.sourceModel()
+            self._keys[first:first] = [self._key(source.index(row, 0, parent)) for row in range(first, last + 1)]
+        if self._rows is None:
+            self.endInsertRows()
+            return
+        position = bisect.bisect_left(self._rows, first)
+        for i in range(position, len(self._rows)):
+            self._rows[i] += count
+        added = [row for row in range(first, last + 1) if self._text in self._keys[row]]
+        if added:
+            self.beginInsertRows(QModelIndex(), position, position + len(added) - 1)
+            self._rows[position:position] = added
+            self.endInsertRows()
+
+    def _on_rows_about_to_be_removed(self, parent, first, last):
+        root = self.root_index()
+        if root.isValid() and parent == root.parent() and first <= root.row() <= last:
+            # Mizí sama zobrazená složka
+            self.beginResetModel()
+            self._resetting = True
+            return
+        if not self._is_root(parent):
+            return
+        if self._rows is None:
+            self.beginRemoveRows(QModelIndex(), first, last)
+            return
+        low = bisect.bisect_left(self._rows, first)
+        high = bisect.bisect_right(self._rows, last)
+        self._removed_range = (low, high)
+        if high > low:
+            self.beginRemoveRows(QModelIndex(), low, high - 1)
+
+    def _on_rows_removed(self, parent, first, last):
+        if self._resetting:
+            self._resetting = False
+            self._clear_filter_state()
+            self.endResetModel()
+            return
+        if not self._is_root(parent):
+            return
+        if self._keys is not None:
+            del self._keys[first:last + 1]
+        if self._rows is None:
+            self.endRemoveRows()
+            return
+        low, high = self._removed_range
+        self._removed_range = None
+        del self._rows[low:high]
+        count = last - first + 1
+        for i in range(low, len(self._rows)):
+            self._rows[i] -= count
+        if high > low:
+            self.endRemoveRows()
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        if not self._is_root(top_left.parent()):
+            return
+        first, last = top_left.row(), bottom_right.row()
+        if self._keys is not None and (not roles or Qt.ItemDataRole.DisplayRole in roles):
+            source = self.sourceModel()
+            renamed = False
+            for row in range(first, last + 1):
+                key = self._key(source.index(row, 0, top_left.parent()))
+                if key != self._keys[row]:
+                    self._keys[row] = key
+                    renamed = True
+            if renamed and self._rows is not None:
+                self._relayout(self._matching_rows())
+                return
+        if self._rows is not None:
+            first = bisect.bisect_left(self._rows, first)
+            last = bisect.bisect_right(self._rows, last) - 1
+        if last >= first:
+            self.dataChanged.emit(self.index(first, top_left.column()), self.index(last, bottom_right.column()), roles)
+
+    def _on_layout_about_to_be_changed(self, parents=(), hint=None):
+        if parents and not any(QModelIndex(parent) == self.root_index() for parent in parents):
+            return
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        self._saved = (old_indexes, [QPersistentModelIndex(self.mapToSource(index)) for index in old_indexes])
+
+    def _on_layout_changed(self, parents=(), hint=None):
+        if self._saved is None:
+            return
+        old_indexes, sources = self._saved
+        self._saved = None
+        # Řádky se přeskupily - klíče se spočítají znovu jen při aktivním filtru
+        self._keys = None
+        if self._rows is not None:
+            self._rows = self._matching_rows()
+        self.changePersistentIndexList(old_indexes, [self.mapFromSource(QModelIndex(source)) for source in sources])
+        self.layoutChanged.emit()
+
+    def _on_model_about_to_be_reset(self):
+        self.beginResetModel()
+
+    def _on_model_reset(self):
+        self._clear_filter_state()
+        self.endResetModel()
+
+
+class DirectorySnapshot(QObject):
+    """Souhrn obsahu zobrazené složky záložky pro stavový řádek
+
+    Spočítá se jednou z modelu (bez přístupu na disk) při přechodu do složky
+    a dál se udržuje ze signálů vložení a odebrání řádků kořene. Změna dat
+    řádků (jiná velikost souboru) ho jen označí k přepočtu při dalším dotazu.
+    Model musí umět isDir(index) a size(index) jako QFileSystemModel.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._model = None
+        self._root = QPersistentModelIndex()
+        self._stale = False
+        self.folders = 0
+        self.files = 0
+        self.total_size = 0
+
+    def summary(self) -> tuple:
+        """(složky, soubory, celková velikost souborů)"""
+        self._refresh()
+        return self.folders, self.files, self.total_size
+
+    def attach(self, model, root_index: QModelIndex) -> None:
+        """Začne sledovat přímý obsah kořene v modelu"""
+        if model is not self._model:
+            if self._model is not None:
+                try:
+                    for signal, slot in self._connections(self._model):
+                        signal.disconnect(slot)
+                except (RuntimeError, TypeError):
+                    pass  # Předchozí model už byl uvolněn
+            for signal, slot in self._connections(model):
+                signal.connect(slot)
+            self._model = model
+        self._root = QPersistentModelIndex(root_index)
+        self._stale = True
+        self._refresh()
+
+    def _connections(self, model) -> list:
+        return [
+            (model.rowsInserted, self._on_rows_inserted),
+            (model.rowsAboutToBeRemoved, self._on_rows_about_to_be_removed),
+            (model.dataChanged, self._on_data_changed),
+            (model.modelReset, self._mark_stale),
+        ]
+
+    def _refresh(self) -> None:
+        if not self._stale or self._model is None:
+            return
+        self._stale = False
+        if isinstance(self._model, LargeDirectoryModel):
+            self.folders, self.files, self.total_size = self._model.totals()
+            return
+        self.folders = self.files = self.total_size = 0
+        root = QModelIndex(self._root)
+        self._count_rows(root, 0, self._model.rowCount(root) - 1, 1)
+
+    def _count_rows(self, parent: QModelIndex, first: int, last: int, sign: int) -> None:
+        model = self._model
+        for row in range(first, last + 1):
+            index = model.index(row, 0, parent)
+            if model.isDir(index):
+                self.folders += sign
+            else:
+                self.files += sign
+                self.total_size += sign * model.size(index)
+
+    def _is_root(self, parent: QModelIndex) -> bool:
+        return parent == QModelIndex(self._root)
+
+    def _on_rows_inserted(self, parent, first, last):
+        if not self._stale and self._is_root(parent):
+            self._count_rows(parent, first, last, 1)
+
+    def _on_rows_about_to_be_removed(self, parent, first, last):
+        if not self._stale and self._is_root(parent):
+            self._count_rows(parent, first, last, -1)
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        if self._is_root(top_left.parent()):
+            self._stale = True
+
+    def _mark_stale(self):
+        self._stale = True
+
+
+class DirectoryListing:
+    """Souhrn složky načtené předem (DirectoryPrefetcher)
+
+    Položky se neukládají - zobrazení je čte samo a z předem načtené
+    složky se používá jen existence a příznak obří složky.
+    """
+
+    __slots__ = ('path', 'count', 'large', 'loaded_at')
+
+    def __init__(self, path: str, count: int, large: bool):
+        self.path = path
+        self.count = count          # Počet položek (u obří složky nejvýš SWITCH_THRESHOLD)
+        self.large = large          # Aspoň LargeDirectoryModel.SWITCH_THRESHOLD položek
+        self.loaded_at = time.monotonic()
+
+
+class DirectoryPrefetcher(QObject):
+    """Načítá na pozadí složky, do kterých uživatel pravděpodobně přejde
+
+    Tipy přicházejí ze stromu (složka pod kurzorem), ze zobrazení složky
+    (označená složka) a z historie záložky (sousední položky). Nejnovější tip
+    má přednost, najednou se čte nejvýš max_workers složek a čekající tipy
+    nad MAX_PENDING se zahazují od nejstaršího. Výpis se stat() každé položky
+    zahřeje mezipaměť souborového systému (u síťových disků to ušetří celou
+    výměnu se serverem); samotné položky se neukládají, zobrazení je po
+    přechodu čte z takto zahřáté mezipaměti. Do LRU o nejvýš MAX_LISTINGS
+    záznamech se ukládá jen souhrn (počet položek, příznak obří složky).
+    Sdílený QFileSystemModel se tipy neplní, aby samotné najíždění myší
+    nezvětšovalo jeho mezipaměť. Výpisy starší než LISTING_TTL se nepoužívají.
+    """
+
+    listing_ready = pyqtSignal(object)          # DirectoryListing
+    listing_failed = pyqtSignal(str)            # Cesta složky, kterou se nepodařilo přečíst
+    _listing_loaded = pyqtSignal(str, object)   # z pracovního vlákna: cesta, DirectoryListing nebo None
+
+    DEFAULT_MAX_WORKERS = 2
+    MAX_PENDING = 16
+    MAX_LISTINGS = 512
+    LISTING_TTL = 30.0
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, parent=None):
+        from concurrent.futures import ThreadPoolExecutor
+        super().__init__(parent)
+        self.max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="prefetch")
+        self._pending = OrderedDict()   # cesta -> None, nejnovější tip na konci
+        self._running = set()
+        self._listings = OrderedDict()  # cesta -> DirectoryListing v pořadí LRU
+        self._listing_loaded.connect(self._on_listing_loaded)
+
+    def request(self, path: str) -> None:
+        """Zařadí složku k načtení, pokud není načtená nebo se právě nečte"""
+        if not path:
+            return
+        key = os.path.normpath(path)
+        if key in self._running or self.listing(key) is not None:
+            return
+        self._pending[key] = None
+        self._pending.move_to_end(key)
+        while len(self._pending) > self.MAX_PENDING:
+            self._pending.popitem(last=False)
+        self._start_pending()
+
+    def listing(self, path: str) -> Optional[DirectoryListing]:
+        """Vrací platný předem načtený obsah složky"""
+        key = os.path.normpath(path)
+        listing = self._listings.get(key)
+        if listing is None:
+            return None
+        if time.monotonic() - listing.loaded_at > self.LISTING_TTL:
+            self._drop(key)
+            return None
+        self._listings.move_to_end(key)
+        return listing
+
+    def is_directory(self, path: str) -> bool:
+        """Jako os.path.isdir, pro předem načtenou složku bez přístupu na disk"""
+        return self.listing(path) is not None or os.path.isdir(path)
+
+    def is_large(self, path: str) -> Optional[bool]:
+        """Zda má složka aspoň LargeDirectoryModel.SWITCH_THRESHOLD položek
+
+        Bez předem načteného výpisu vrací None a složku zařadí k načtení;
+        výsledek přijde signálem listing_ready (GUI se čtením neblokuje).
+        """
+        listing = self.listing(path)
+        if listing is not None:
+            return listing.large
+        # Na zjištění čeká zobrazená záložka - mimo frontu tipů, aby ho tipy nevytlačily
+        key = os.path.normpath(path)
+        self._pending.pop(key, None)
+        if key not in self._running:
+            try:
+                self._executor.submit(self._load, key)
+            except RuntimeError:
+                return False  # Pool už je ukončený (zavírání aplikace)
+            self._running.add(key)
+        return None
+
+    def invalidate(self, path: str) -> None:
+        """Zahodí výpis změněné složky a jejích podsložek"""
+        key = os.path.normpath(path)
+        for cached in [p for p in self._listings if p == key or os.path.dirname(p) == key]:
+            self._drop(cached)
+
+    def shutdown(self) -> None:
+        self._pending.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _drop(self, key: str) -> None:
+        self._listings.pop(key, None)
+
+    def _start_pending(self) -> None:
+        while self._pending and len(self._running) < self.max_workers:
+            key, _ = self._pending.popitem(last=True)
+            try:
+                self._executor.submit(self._load, key)
+            except RuntimeError:
+                return  # Pool už je ukončený (zavírání aplikace)
+            self._running.add(key)
+
+    def _load(self, path: str) -> None:
+        """Pracovní vlákno: přečte složku včetně stat() položek"""
+        count = 0
+        large = False
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if count >= LargeDirectoryModel.SWITCH_THRESHOLD:
+                        # Obří složku čte LargeDirectoryModel, stačí vědět, že je obří
+                        large = True
+                        break
+                    count += 1
+                    try:
+                        entry.stat()
+                    except OSError:
+                        pass  # Nefunkční odkaz, položka zmizela
+        except OSError:
+            self._listing_loaded.emit(path, None)
+            return
+        self._listing_loaded.emit(path, DirectoryListing(path, count, large))
+
+    def _on_listing_loaded(self, path: str, listing: Optional[DirectoryListing]):
+        self._running.discard(path)
+        if listing is not None:
+            self._drop(path)
+            self._listings[path] = listing
+            while len(self._listings) > self.MAX_LISTINGS:
+                self._drop(next(iter(self._listings)))
+            self.listing_ready.emit(listing)
+        else:
+            self.listing_failed.emit(path)
+        self._start_pending()
+
+
+class SelectionStats:
+    """Souhrn výběru položek udržovaný z přírůstků selectionChanged
+
+    Typ a velikost položek zjišťuje SelectionStatService ve vlákně,
+    do té doby se položka počítá mezi nezjištěné (pending). Souhrn
+    sdílí informační panel i stavový řádek záložky.
+    """
+
+    _MISSING = object()
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        self.entries = {}  # cesta -> (je_složka, velikost), None dokud se nezjistí
+        self.files = 0
+        self.folders = 0
+        self.total_size = 0
+        self.pending = 0
+
+    @property
+    def count(self) -> int:
+        return len(self.entries)
+
+    def single_path(self) -> Optional[str]:
+        return next(iter(self.entries)) if len(self.entries) == 1 else None
+
+    def is_pending(self, path: str) -> bool:
+        # Volá se i z vlákna služby, zatímco GUI položky odebírá - jen jedno vyhledání ve slovníku
+        return self.entries.get(path, self._MISSING) is None
+
+    def add(self, paths: List[str]) -> List[str]:
+        """Přidá položky do výběru a vrátí ty, které je třeba zjistit"""
+        added = []
+        for path in paths:
+            if path and path not in self.entries:
+                self.entries[path] = None
+                added.append(path)
+        self.pending += len(added)
+        return added
+
+    def remove(self, paths: List[str]) -> None:
+        for path in paths:
+            if path not in self.entries:
+                continue
+            info = self.entries.pop(path)
+            if info is None:
+                self.pending -= 1
+            else:
+                self._count(info, -1)
+
+    def apply(self, results: list) -> None:
+        """Doplní zjištěné položky [(cesta, je_složka, velikost)], odznačené se přeskočí"""
+        for path, is_dir, size in results:
+            if self.is_pending(path):
+                info = (is_dir, size)
+                self.entries[path] = info
+                self.pending -= 1
+                self._count(info, 1)
+
+    def _count(self, info: tuple, sign: int) -> None:
+        is_dir, size = info
+        if is_dir:
+            self.folders += sign
+        elif is_dir is False:
+            self.files += sign
+            self.total_size += sign * size
+
+
+class SelectionStatService(QObject):
+    """Zjišťuje typ a velikost vybraných položek ve vlákně pro SelectionStats"""
+
+    stats_ready = pyqtSignal(object, object)  # SelectionStats, [(cesta, je_složka, velikost)]
+
+    BATCH_SIZE = 2048
+
+    def __init__(self, parent=None):
+        from concurrent.futures import ThreadPoolExecutor
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="selection-stat")
+
+    def request(self, stats: SelectionStats, paths: List[str]) -> None:
+        """Zařadí zjištění položek po dávkách"""
+        for start in range(0, len(paths), self.BATCH_SIZE):
+            try:
+                self._executor.submit(self._stat_paths, stats, paths[start:start + self.BATCH_SIZE])
+            except RuntimeError:
+                return  # Pool už je ukončený (zavírání aplikace)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _stat_paths(self, stats: SelectionStats, paths: List[str]) -> None:
+        results = []
+        for path in paths:
+            if not stats.is_pending(path):
+                continue  # Mezitím odznačeno
+            try:
+                info = os.stat(path)
+                results.append((path, stat.S_ISDIR(info.st_mode), info.st_size))
+            except OSError:
+                results.append((path, None, 0))  # Položka zmizela
+        if results:
+            self.stats_ready.emit(stats, results)
+
+
+class FileInfoPanel(QWidget):
+    """Informační panel pro zobrazení detailů o vybraných souborech"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.file_model = None
+        self.folder_scanner = None
+        self._scan_job_id = None
+        self.preview_service = None
+        self._preview_channel = f"panel-{id(self)}"
+        self._preview_path = None
+        self.setup_ui()
+    
+    def setup_ui(self):
+        """Vytvoří UI pro informační panel"""
+        self.setMaximumWidth(300)
+        self.setMinimumWidth(250)
+        
+        # Hlavní layout
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(10, 10, 10, 10)
+        layout.setSpacing(10)
+        
+        # Nadpis panelu
+        title = QLabel("Informace o souboru")
+        title.setStyleSheet("font-weight: bold; font-size: 14px; color: #2c3e50;")
+        layout.addWidget(title)
+        
+        # Scrollovací oblast pro obsah
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setFrameStyle(QFrame.Shape.NoFrame)
+        
+        # Widget pro obsah
+        self.content_widget = QWidget()
+        self.content_layout = QVBoxLayout(self.content_widget)
+        self.content_layout.setContentsMargins(0, 0, 0, 0)
+        self.content_layout.setSpacing(5)
+        
+        # Základní informace
+        self.info_frame = QFrame()
+        self.info_frame.setFrameStyle(QFrame.Shape.StyledPanel)
+        info_layout = QGridLayout(self.info_frame)
+        info_layout.setContentsMargins(10, 10, 10, 10)
+        info_layout.setSpacing(5)
+        
+        # Labels pro informace
+        self.name_label = QLabel("Žádný soubor nevybrán")
+        self.name_label.setWordWrap(True)
+        self.name_label.setStyleSheet("font-weight: bold;")
+        
+        self.type_label = QLabel("")
+        self.size_label = QLabel("")
+        self.modified_label = QLabel("")
+        self.created_label = QLabel("")
+        self.path_label = QLabel("")
+        self.path_label.setWordWrap(True)
+        self.path_label.setStyleSheet("font-size: 10px; color: #7f8c8d;")
+        
+        # Přidání do grid layoutu
+        info_layout.addWidget(QLabel("Název:"), 0, 0)
+        info_layout.addWidget(self.name_label, 0, 1)
+        info_layout.addWidget(QLabel("Typ:"), 1, 0)
+        info_layout.addWidget(self.type_label, 1, 1)
+        info_layout.addWidget(QLabel("Velikost:"), 2, 0)
+        info_layout.addWidget(self.size_label, 2, 1)
+        info_layout.addWidget(QLabel("Změněno:"), 3, 0)
+        info_layout.addWidget(self.modified_label, 3, 1)
+        info_layout.addWidget(QLabel("Vytvořeno:"), 4, 0)
+        info_layout.addWidget(self.created_label, 4, 1)
+        info_layout.addWidget(QLabel("Cesta:"), 5, 0, 1, 2)
+        info_layout.addWidget(self.path_label, 6, 0, 1, 2)
+        
+        self.content_layout.addWidget(self.info_frame)
+        
+        # Statistiky složky (pouze pro složky)
+        self.folder_stats_frame = QFrame()
+        self.folder_stats_frame.setFrameStyle(QFrame.Shape.StyledPanel)
+        self.folder_stats_frame.hide()
+        
+        stats_layout = QVBoxLayout(self.folder_stats_frame)
+        stats_layout.setContentsMargins(10, 10, 10, 10)
+        
+        stats_title = QLabel("Statistiky složky")
+        stats_title.setStyleSheet("font-weight: bold; color: #2c3e50;")
+        stats_layout.addWidget(stats_title)
+        
+        self.folder_items_label = QLabel("")
+        self.folder_files_label = QLabel("")
+        self.folder_folders_label = QLabel("")
+        self.folder_size_label = QLabel("")
+        
+        stats_layout.addWidget(self.folder_items_label)
+        stats_layout.addWidget(self.folder_files_label)
+        stats_layout.addWidget(self.folder_folders_label)
+        stats_layout.addWidget(self.folder_size_label)
+        
+        # Progress bar pro výpočet velikosti složky
+        self.size_progress = QProgressBar()
+        self.size_progress.setVisible(False)
+        self.size_progress.setMaximum(0)  # Neurčitý progress
+        stats_layout.addWidget(self.size_progress)
+        
+        self.content_layout.addWidget(self.folder_stats_frame)
+        
+        # Náhled (pro budoucí implementaci)
+        self.preview_frame = QFrame()
+        self.preview_frame.setFrameStyle(QFrame.Shape.StyledPanel)
+        self.preview_frame.hide()
+        
+        preview_layout = QVBoxLayout(self.preview_frame)
+        preview_layout.setContentsMargins(10, 10, 10, 10)
+        
+        preview_title = QLabel("Náhled")
+        preview_title.setStyleSheet("font-weight: bold; color: #2c3e50;")
+        preview_layout.addWidget(preview_title)
+        
+        self.preview_label = QLabel("Náhled není k dispozici")
+        self.preview_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.preview_label.setMinimumHeight(100)
+        self.preview_label.setStyleSheet("border: 1px dashed #bdc3c7; color: #7f8c8d;")
+        preview_layout.addWidget(self.preview_label)
+        
+        self.content_layout.addWidget(self.preview_frame)
+        
+        # Elastic space
+        self.content_layout.addStretch()
+        
+        scroll_area.setWidget(self.content_widget)
+        layout.addWidget(scroll_area)
+    
+    def set_file_model(self, model):
+        """Nastaví file model pro získávání informací"""
+        self.file_model = model
+    
+    def set_preview_service(self, service: PreviewService):
+        """Nastaví sdílenou službu pro dekódování náhledů"""
+        if self.preview_service is service:
+            return
+        self._cancel_preview()
+        self.preview_service = service
+        service.preview_ready.connect(self._on_preview_ready)
+    
+    def set_folder_scanner(self, scanner: FolderSizeScanner):
+        """Nastaví sdílený skener pro výpočet velikosti složek"""
+        if self.folder_scanner is scanner:
+            return
+        self._cancel_folder_scan()
+        self.folder_scanner = scanner
+        scanner.scan_progress.connect(self._on_folder_scan_progress)
+        scanner.scan_finished.connect(self._on_folder_scan_finished)
+    
+    @traced("panel")
+    def update_info(self, file_path: str):
+        """Aktualizuje informace o souboru/složce"""
+        if not file_path or not os.path.exists(file_path):
+            self.clear_info()
+            return
+        
+        # Předchozí výpočet velikosti složky už není potřeba
+        self._cancel_folder_scan()
+        
+        try:
+            # Základní informace
+            file_name = os.path.basename(file_path)
+            self.name_label.setText(file_name)
+            self.path_label.setText(file_path)
+            
+            # Získání statistik souboru
+            stat_info = os.stat(file_path)
+            
+            # Datum změny a vytvoření
+            modified_time = datetime.fromtimestamp(stat_info.st_mtime)
+            self.modified_label.setText(modified_time.strftime("%d.%m.%Y %H:%M:%S"))
+            
+            created_time = datetime.fromtimestamp(stat_info.st_ctime)
+            self.created_label.setText(created_time.strftime("%d.%m.%Y %H:%M:%S"))
+            
+            if os.path.isfile(file_path):
+                # Soubor
+                self.type_label.setText("Soubor")
+                size = stat_info.st_size
+                self.size_label.setText(self.format_size(size))
+                
+                # Skryj statistiky složky
+                self.folder_stats_frame.hide()
+                
+                # Zkus zobrazit náhled pro obrázky
+                self.update_preview(file_path)
+                
+            elif os.path.isdir(file_path):
+                # Složka
+                self.type_label.setText("Složka")
+                self.size_label.setText("Počítám...")
+                
+                # Zobraz statistiky složky
+                self.update_folder_stats(file_path)
+                self.folder_stats_frame.show()
+                
+                # Skryj náhled
+                self._cancel_preview()
+                self.preview_frame.hide()
+                
+        except Exception as e:
+            self.clear_info()
+            self.name_label.setText(f"Chyba: {str(e)}")
+    
+    @traced("panel")
+    def update_folder_stats(self, folder_path: str):
+        """Spustí rekurzivní výpočet statistik složky na pozadí"""
+        self._cancel_folder_scan()
+        
+        if self.folder_scanner is None:
+            self.set_folder_scanner(FolderSizeScanner(self))
+        
+        self.folder_items_label.setText("Celkem položek: …")
+        self.folder_files_label.setText("Soubory: …")
+        self.folder_folders_label.setText("Složky: …")
+        self.folder_size_label.setText("Velikost: …")
+        self.size_progress.setVisible(True)
+        
+        self._scan_job_id = self.folder_scanner.scan(folder_path)
+    
+    def _cancel_folder_scan(self):
+        """Zruší probíhající výpočet velikosti složky"""
+        if self._scan_job_id is not None and self.folder_scanner is not None:
+            self.folder_scanner.cancel(self._scan_job_id)
+        self._scan_job_id = None
+        self.size_progress.setVisible(False)
+    
+    def _on_folder_scan_progress(self, job_id: int, stats: FolderStats):
+        """Zobrazí průběžné součty skenu"""
+        if job_id != self._scan_job_id:
+            return
+        self._show_folder_stats(stats)
+    
+    def _on_folder_scan_finished(self, job_id: int, stats: FolderStats):
+        """Zobrazí konečné součty skenu"""
+        if job_id != self._scan_job_id:
+            return
+        self._scan_job_id = None
+        self.size_progress.setVisible(False)
+        
+        if stats.items == 0 and stats.errors > 0:
+            self.folder_items_label.setText("Nedostatečná oprávnění")
+            self.folder_files_label.setText("")
+            self.folder_folders_label.setText("")
+            self.folder_size_label.setText("")
+            self.size_label.setText("")
+            return
+        
+        self._show_folder_stats(stats)
+    
+    def _show_folder_stats(self, stats: FolderStats):
+        """Vypíše statistiky složky do panelu"""
+        size_text = self.format_size(stats.size)
+        if not stats.complete:
+            size_text += " …"
+        elif stats.errors:
+            size_text += f" ({stats.errors} nepřístupných)"
+        
+        self.folder_items_label.setText(f"Celkem položek: {stats.items}")
+        self.folder_files_label.setText(f"Soubory: {stats.files}")
+        self.folder_folders_label.setText(f"Složky: {stats.folders}")
+        self.folder_size_label.setText(f"Velikost: {size_text}")
+        self.size_label.setText(size_text if stats.complete else f"Počítám... {size_text}")
+    
+    @traced("panel")
+    def update_preview(self, file_path: str):
+        """Aktualizuje náhled souboru (obrázky se dekódují na pozadí)"""
+        # Získej příponu souboru
+        _, ext = os.path.splitext(file_path.lower())
+        
+        if ext not in IMAGE_EXTENSIONS:
+            # Skryj náhled pro nepodporované formáty
+            self._cancel_preview()
+            self.preview_frame.hide()
+            return
+        
+        if self.preview_service is None:
+            self.set_preview_service(PreviewService(self))
+        
+        self._preview_path = file_path
+        image = self.preview_service.request(self._preview_channel, file_path, 200, 150)
+        if image is not None:
+            self._show_preview_image(image)
+        else:
+            self.preview_label.setPixmap(QPixmap())
+            self.preview_label.setText("Načítám náhled…")
+            self.preview_frame.show()
+    
+    def _cancel_preview(self):
+        """Zahodí nevyřízený požadavek na náhled"""
+        self._preview_path = None
+        if self.preview_service is not None:
+            self.preview_service.cancel(self._preview_channel)
+    
+    def _on_preview_ready(self, channel: str, file_path: str, image: QImage):
+        """Zobrazí náhled dekódovaný na pozadí"""
+        if channel != self._preview_channel or file_path != self._preview_path:
+            return
+        self._show_preview_image(image)
+    
+    @traced("panel")
+    def _show_preview_image(self, image: QImage):
+        """Zobrazí hotový náhled, nebo skryje rámeček, když se nepodařilo načíst"""
+        if image.isNull():
+            self.preview_frame.hide()
+            return
+        self.preview_label.setPixmap(QPixmap.fromImage(image))
+        self.preview_label.setText("")
+        self.preview_frame.show()
+    
+    @staticmethod
+    def format_size(size: int) -> str:
+        """Formátuje velikost souboru do čitelné podoby"""
+        return format_size(size)
+    
+    def clear_info(self):
+        """Vymaže všechny informace"""
+        self._cancel_folder_scan()
+        self._cancel_preview()
+        self.name_label.setText("Žádný soubor nevybrán")
+        self.type_label.setText("")
+        self.size_label.setText("")
+        self.modified_label.setText("")
+        self.created_label.setText("")
+        self.path_label.setText("")
+        self.folder_stats_frame.hide()
+        self.preview_frame.hide()
+    
+    @traced("panel")
+    def show_selection_stats(self, stats: SelectionStats):
+        """Zobrazí souhrn výběru více položek"""
+        self._cancel_folder_scan()
+        self._cancel_preview()
+        
+        size_text = self.format_size(stats.total_size)
+        if stats.pending:
+            size_text += f" (zjišťuji {stats.pending} položek…)"
+        
+        self.name_label.setText(f"Vybráno {stats.count} položek")
+        self.type_label.setText("Více položek")
+        self.size_label.setText(size_text)
+        self.modified_label.setText("")
+        self.created_label.setText("")
+        self.path_label.setText(f"Soubory: {stats.files}, Složky: {stats.folders}")
+        
+        self.folder_stats_frame.hide()
+        self.preview_frame.hide()
+
+
+class HistoryEntry:
+    """Položka historie navigace se stavem zobrazení z odchodu ze složky"""
+
+    __slots__ = ('path', 'state', 'mtime_ns', 'large', 'listing')
+
+    def __init__(self, path: str):
+        self.path = path
+        self.state = None       # capture_tab_view_state() (výběr, posun, řazení, filtr)
+        self.mtime_ns = None    # Čas změny složky při odchodu - shoda znamená nezměněný obsah
+        self.large = False      # Složku zobrazoval LargeDirectoryModel
+        self.listing = None     # LargeDirectoryModel.snapshot() obří složky
+
+
+class NavigationHistory:
+    """Třída pro správu historie navigace
+
+    Historie je kruhová, nad max_entries se zapomínají nejstarší položky.
+    Načtený obsah obřích složek drží jen MAX_CACHED_LISTINGS naposledy
+    uložených položek, ostatní si pamatují jen stav zobrazení.
+    """
+    
+    DEFAULT_MAX_ENTRIES = 100
+    MAX_CACHED_LISTINGS = 3
+    
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.history = deque(maxlen=max_entries)  # HistoryEntry
+        self.current_index: int = -1
+        self._listing_entries = []  # Položky s uloženým obsahem, od nejstarší
+    
+    def add_path(self, path: str) -> None:
+        """Přidá cestu do historie"""
+        # Odstraní všechny cesty za aktuální pozicí
+        while len(self.history) > self.current_index + 1:
+            self._forget(self.history.pop())
+        if len(self.history) == self.history.maxlen:
+            self._forget(self.history[0])  # Při append ji deque zahodí
+        self.history.append(HistoryEntry(path))
+        self.current_index = len(self.history) - 1
+    
+    def current(self) -> Optional[HistoryEntry]:
+        """Vrací aktuální položku historie"""
+        return self.history[self.current_index] if self.current_index >= 0 else None
+    
+    def store_listing(self, entry: HistoryEntry, listing) -> None:
+        """Uloží k položce načtený obsah složky (None ho zahodí)"""
+        self._forget(entry)
+        entry.listing = listing
+        if listing is not None:
+            self._listing_entries.append(entry)
+            while len(self._listing_entries) > self.MAX_CACHED_LISTINGS:
+                self._listing_entries.pop(0).listing = None
+    
+    def _forget(self, entry: HistoryEntry) -> None:
+        if entry.listing is not None:
+            entry.listing = None
+            self._listing_entries.remove(entry)
+    
+    def can_go_back(self) -> bool:
+        """Kontroluje, zda je možné jít zpět"""
+        return self.current_index > 0
+    
+    def can_go_forward(self) -> bool:
+        """Kontroluje, zda je možné jít vpřed"""
+        return self.current_index < len(self.history) - 1
+    
+    def go_back(self) -> Optional[str]:
+        """Vrací předchozí cestu"""
+        if self.can_go_back():
+            self.current_index -= 1
+            return self.history[self.current_index].path
+        return None
+    
+    def go_forward(self) -> Optional[str]:
+        """Vrací následující cestu"""
+        if self.can_go_forward():
+            self.current_index += 1
+            return self.history[self.current_index].path
+        return None
+    
+    def paths(self) -> List[str]:
+        """Cesty historie od nejstarší (pro uložení relace)"""
+        return [entry.path for entry in self.history]
+    
+    def restore(self, paths: List[str], index: int) -> None:
+        """Obnoví historii z uložených cest (stavy zobrazení se neukládají)"""
+        self.history.clear()
+        self._listing_entries.clear()
+        dropped = max(0, len(paths) - self.history.maxlen)
+        for path in paths[dropped:]:
+            self.history.append(HistoryEntry(path))
+        self.current_index = min(max(index - dropped, 0), len(self.history) - 1)
+    
+    def neighbours(self) -> List[str]:
+        """Vrací cesty, na které vede zpět a vpřed"""
+        return [self.history[i].path for i in (self.current_index - 1, self.current_index + 1)
+                if 0 <= i < len(self.history)]
+
+
+class ConflictPolicy(Enum):
+    """Řešení kolizí názvů při kopírování a přesunu (platí pro celou úlohu)"""
+    SKIP = "skip"            # Existující položky ponechat
+    OVERWRITE = "overwrite"  # Přepsat soubory, složky sloučit
+    RENAME = "rename"        # Ponechat obě, nová položka dostane číslo
+
+
+class JobCancelled(Exception):
+    """Vyvolá se v pracovním vlákně, když uživatel úlohu zruší"""
+
+
+# Linuxový ioctl pro sdílení bloků souboru (reflink) na CoW souborových systémech (Btrfs, XFS)
+FICLONE = 0x40049409
+
+COPY_CHUNK_SIZE = 8 * 1024 * 1024  # Velikost bloku pro kopírování v jádře i přes buffer
+
+
+def copy_file_contents(fsrc, fdst, on_chunk) -> None:
+    """Zkopíruje obsah otevřeného souboru co nejlevnější dostupnou cestou
+
+    Pořadí: reflink (FICLONE), os.copy_file_range, os.sendfile a nakonec
+    čtení po velkých blocích. on_chunk(n) se volá po každém bloku a může
+    vyvolat JobCancelled.
+    """
+    in_fd = fsrc.fileno()
+    out_fd = fdst.fileno()
+    size = os.fstat(in_fd).st_size
+
+    if fcntl is not None and sys.platform.startswith('linux') and size > 0:
+        try:
+            fcntl.ioctl(out_fd, FICLONE, in_fd)
+            on_chunk(size)
+            return
+        except OSError:
+            pass
+
+    copied = 0
+    for kernel_copy in ('copy_file_range', 'sendfile'):
+        if not hasattr(os, kernel_copy) or not sys.platform.startswith('linux'):
+            continue
+        try:
+            while True:
+                if kernel_copy == 'copy_file_range':
+                    n = os.copy_file_range(in_fd, out_fd, COPY_CHUNK_SIZE)
+                else:
+                    n = os.sendfile(out_fd, in_fd, copied, COPY_CHUNK_SIZE)
+                if n == 0:
+                    break
+                copied += n
+                on_chunk(n)
+            if copied >= size:
+                return
+        except OSError as e:
+            # Nepodporováno (jiné FS, síťový disk) - zkus další způsob, ale jen od začátku
+            if copied or e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL,
+                                         errno.EOPNOTSUPP, errno.EBADF, errno.ENOTSUP):
+                raise
+
+    fsrc.seek(copied)
+    fdst.seek(copied)
+    buffer = bytearray(COPY_CHUNK_SIZE)
+    view = memoryview(buffer)
+    while True:
+        n = fsrc.readinto(buffer)
+        if not n:
+            break
+        fdst.write(view[:n])
+        on_chunk(n)
+
+
+class TransferProgress:
+    """Průběh úlohy se soubory (kopie předávaná do GUI)"""
+
+    __slots__ = ('bytes_done', 'bytes_total', 'files_done', 'files_total',
+                 'elapsed', 'current', 'paused')
+
+    def __init__(self):
+        self.bytes_done = 0
+        self.bytes_total = 0
+        self.files_done = 0
+        self.files_total = 0
+        self.elapsed = 0.0      # Čistý čas běhu bez pauz v sekundách
+        self.current = ""       # Právě zpracovávaná položka
+        self.paused = False
+
+    @property
+    def throughput(self) -> float:
+        """Propustnost v bajtech za sekundu"""
+        return self.bytes_done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Odhad zbývajícího času v sekundách"""
+        throughput = self.throughput
+        if throughput <= 0 or self.bytes_total <= self.bytes_done:
+            return None
+        return (self.bytes_total - self.bytes_done) / throughput
+
+    def copy(self) -> 'TransferProgress':
+        """Vrací nezávislou kopii průběhu"""
+        other = TransferProgress()
+        for name in self.__slots__:
+            setattr(other, name, getattr(self, name))
+        return other
+
+
+class FileJob:
+    """Základ úlohy se soubory zpracovávané na pozadí
+
+    Úloha běží v pracovním vlákně TransferEngine. Pravidelně volá check(),
+    kde se zastaví při pauze a při zrušení vyvolá JobCancelled. Chyby
+    jednotlivých položek sbírá do errors místo přerušení celé úlohy.
+    """
+
+    PROGRESS_INTERVAL = 0.1  # Minimální odstup průběžných signálů v sekundách
+
+    def __init__(self, title: str):
+        self.job_id = 0
+        self.title = title
+        self.progress = TransferProgress()
+        self.errors = []            # (cesta, text chyby)
+        self.engine = None
+        self._cancelled = threading.Event()
+        self._resumed = threading.Event()
+        self._resumed.set()
+        self._started_at = None
+        self._paused_time = 0.0
+        self._last_report = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        """True po zrušení úlohy"""
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """Zruší úlohu (i pozastavenou)"""
+        self._cancelled.set()
+        self._resumed.set()
+
+    def pause(self) -> None:
+        """Pozastaví úlohu na nejbližším kontrolním bodě"""
+        self._resumed.clear()
+
+    def resume(self) -> None:
+        """Pokračuje v pozastavené úloze"""
+        self._resumed.set()
+
+    @property
+    def paused(self) -> bool:
+        """True, pokud je úloha pozastavená"""
+        return not self._resumed.is_set()
+
+    def check(self) -> None:
+        """Kontrolní bod: počká během pauzy a při zrušení vyvolá JobCancelled"""
+        if not self._resumed.is_set():
+            paused_at = time.monotonic()
+            self.report(force=True)
+            self._resumed.wait()
+            self._paused_time += time.monotonic() - paused_at
+        if self._cancelled.is_set():
+            raise JobCancelled()
+
+    def add_bytes(self, count: int) -> None:
+        """Přičte zpracované bajty a zkontroluje pauzu/zrušení"""
+        self.progress.bytes_done += count
+        self.report()
+        self.check()
+
+    def add_error(self, path: str, error) -> None:
+        """Zaznamená chybu položky"""
+        self.errors.append((path, str(error)))
+
+    def report(self, force: bool = False) -> None:
+        """Pošle průběh do GUI (nejvýš jednou za PROGRESS_INTERVAL)"""
+        now = time.monotonic()
+        if not force and now - self._last_report < self.PROGRESS_INTERVAL:
+            return
+        self._last_report = now
+        if self._started_at is not None:
+            self.progress.elapsed = now - self._started_at - self._paused_time
+        self.progress.paused = self.paused
+        if self.engine is not None:
+            self.engine.job_progress.emit(self.job_id, self.progress.copy())
+
+    def execute(self) -> None:
+        """Spustí úlohu (volá TransferEngine v pracovním vlákně)"""
+        self._started_at = time.monotonic()
+        self.run()
+        self.report(force=True)
+
+    def run(self) -> None:
+        """Vlastní práce úlohy - implementují potomci"""
+        raise NotImplementedError
+
+    def summary(self) -> str:
+        """Text zprávy po úspěšném dokončení"""
+        return f"{self.title}: hotovo"
+
+    def error_summary(self) -> str:
+        """Jedna souhrnná zpráva o všech chybách úlohy"""
+        lines = [f"{self.title}: {len(self.errors)} položek se nepodařilo zpracovat"]
+        for path, error in self.errors[:10]:
+            lines.append(f"• {path}: {error}")
+        if len(self.errors) > 10:
+            lines.append(f"… a dalších {len(self.errors) - 10}")
+        return "\n".join(lines)
+
+
+class TransferJob(FileJob):
+    """Kopírování nebo přesun položek do cílové složky"""
+
+    def __init__(self, sources: List[str], destination: str, move: bool = False,
+                 policy: ConflictPolicy = ConflictPolicy.RENAME):
+        super().__init__("Přesun" if move else "Kopírování")
+        self.sources = [os.path.abspath(path) for path in sources]
+        self.destination = os.path.abspath(destination)
+        self.move = move
+        self.policy = policy
+        self.done = 0       # Dokončené položky nejvyšší úrovně
+        self.skipped = 0    # Položky přeskočené kvůli kolizi
+
+    def run(self) -> None:
+        """Naplánuje položky, změří objem a provede přenos"""
+        plan = []
+        for source in self.sources:
+            self.check()
+            target = os.path.join(self.destination, os.path.basename(source.rstrip(os.sep)) or source)
+            if os.path.isdir(source) and _is_same_or_inside(self.destination, source):
+                self.add_error(source, "Složku nelze kopírovat do sebe sama")
+                continue
+            if self.move and os.path.normcase(source) == os.path.normcase(target):
+                continue
+            target = self._resolve_conflict(source, target)
+            if target is None:
+                self.skipped += 1
+                continue
+            plan.append((source, target))
+
+        # Přesun v rámci jednoho zařízení je jen přejmenování (i při slučování složek)
+        remaining = []
+        for source, target in plan:
+            if self.move and _same_device(source, self.destination):
+                if os.path.isdir(target) and not os.path.islink(target):
+                    self.check()
+                    errors_before = len(self.errors)
+                    self._merge_tree(source, target)
+                    if len(self.errors) == errors_before:
+                        self.done += 1
+                    continue
+                try:
+                    os.replace(source, target)
+                    self.done += 1
+                    continue
+                except OSError:
+                    pass
+            remaining.append((source, target))
+
+        for source, _ in remaining:
+            self.check()
+            files, size = self._measure(source)
+            self.progress.files_total += files
+            self.progress.bytes_total += size
+        self.report(force=True)
+
+        for source, target in remaining:
+            self.check()
+            errors_before = len(self.errors)
+            try:
+                if os.path.isdir(source) and not os.path.islink(source):
+                    self._copy_tree(source, target)
+                else:
+                    self._copy_file(source, target)
+            except JobCancelled:
+                raise
+            except OSError as e:
+                self.add_error(source, e)
+
+            if len(self.errors) == errors_before:
+                self.done += 1
+                if self.move:
+                    self._remove_source(source)
+
+    def _measure(self, path: str) -> tuple:
+        """Spočítá soubory a bajty položky (scandir, bez sledování symlinků)"""
+        try:
+            if not os.path.isdir(path) or os.path.islink(path):
+                return 1, os.lstat(path).st_size
+        except OSError:
+            return 1, 0
+
+        files = 0
+        size = 0
+        stack = [path]
+        while stack:
+            self.check()
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            else:
+                                files += 1
+                                size += entry.stat(follow_symlinks=False).st_size
+                        except OSError:
+                            pass
+            except OSError:
+                pass
+        return files, size
+
+    def _resolve_conflict(self, source: str, target: str) -> Optional[str]:
+        """Vrací cíl podle pravidla kolizí úlohy, None znamená přeskočit"""
+        if not os.path.lexists(target):
+            return target
+        try:
+            same = os.path.samefile(source, target)
+        except OSError:
+            same = False
+        if self.policy == ConflictPolicy.RENAME:
+            return _unique_path(target)
+        if same or self.policy == ConflictPolicy.SKIP:
+            return None
+        # Přepsání: složky se slučují, soubor se složkou zaměnit nelze
+        source_is_dir = os.path.isdir(source) and not os.path.islink(source)
+        target_is_dir = os.path.isdir(target) and not os.path.islink(target)
+        if source_is_dir != target_is_dir:
+            self.add_error(source, "Cíl je jiného typu (soubor/složka)")
+            return None
+        return target
+
+    def _copy_tree(self, source: str, target: str) -> None:
+        """Rekurzivně zkopíruje složku (chyby položek se sbírají)"""
+        os.makedirs(target, exist_ok=True)
+        self.progress.current = source
+        try:
+            with os.scandir(source) as iterator:
+                entries = list(iterator)
+        except OSError as e:
+            self.add_error(source, e)
+            return
+
+        for entry in entries:
+            self.check()
+            child_target = os.path.join(target, entry.name)
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if os.path.lexists(child_target):
+                    resolved = self._resolve_conflict(entry.path, child_target)
+                    if resolved is None:
+                        if not is_dir:
+                            self.progress.files_done += 1
+                            self.progress.bytes_done += entry.stat(follow_symlinks=False).st_size
+                        continue
+                    child_target = resolved
+                if is_dir:
+                    self._copy_tree(entry.path, child_target)
+                else:
+                    self._copy_file(entry.path, child_target)
+            except JobCancelled:
+                raise
+            except OSError as e:
+                self.add_error(entry.path, e)
+
+        try:
+            shutil.copystat(source, target)
+        except OSError:
+            pass
+
+    def _merge_tree(self, source: str, target: str) -> None:
+        """Sloučí složku do existující složky na stejném zařízení
+
+        Položky, které v cíli chybí, i přepisované soubory se jen přejmenují
+        (os.replace), do hloubky se prochází pouze kolidující podsložky.
+        Vyprázdněná zdrojová složka se nakonec odstraní.
+        """
+        self.progress.current = source
+        errors_at_start = len(self.errors)
+        try:
+            with os.scandir(source) as iterator:
+                entries = list(iterator)
+        except OSError as e:
+            self.add_error(source, e)
+            return
+
+        for entry in entries:
+            self.check()
+            child_target = os.path.join(target, entry.name)
+            try:
+                if os.path.lexists(child_target):
+                    errors_before = len(self.errors)
+                    resolved = self._resolve_conflict(entry.path, child_target)
+                    if resolved is None:
+                        # Tentýž soubor už v cíli je, zdroj stačí odstranit (jako po kopii)
+                        if len(self.errors) == errors_before and not entry.is_dir(follow_symlinks=False):
+                            os.remove(entry.path)
+                        continue
+                    if os.path.isdir(resolved) and not os.path.islink(resolved):
+                        self._merge_tree(entry.path, resolved)
+                        continue
+                    child_target = resolved
+                try:
+                    os.replace(entry.path, child_target)
+                except OSError as e:
+                    if e.errno != errno.EXDEV:
+                        raise
+                    # Přípojný bod uvnitř zdroje - položka se musí zkopírovat
+                    errors_before = len(self.errors)
+                    if entry.is_dir(follow_symlinks=False):
+                        self._copy_tree(entry.path, child_target)
+                    else:
+                        self._copy_file(entry.path, child_target)
+                    if len(self.errors) == errors_before:
+                        self._remove_source(entry.path)
+            except JobCancelled:
+                raise
+            except OSError as e:
+                self.add_error(entry.path, e)
+
+        if len(self.errors) > errors_at_start:
+            return  # Nepřesunuté položky zůstávají ve zdroji
+        try:
+            os.rmdir(source)
+        except OSError as e:
+            self.add_error(source, e)
+
+    def _copy_file(self, source: str, target: str) -> None:
+        """Zkopíruje jeden soubor nebo symlink
+
+        Kopie vzniká pod dočasným názvem vedle cíle a existující cíl nahradí
+        až hotová (os.replace), takže se přepisovaný soubor nikdy neotevře
+        k zápisu - symlink v cíli se nahradí, ne sleduje. Při zrušení nebo
+        chybě se maže jen dočasný soubor a původní cíl zůstane beze změny.
+        """
+        self.progress.current = source
+        if os.path.islink(source):
+            link_target = os.readlink(source)
+            temporary = _temporary_path(target)
+            os.symlink(link_target, temporary)
+            try:
+                os.replace(temporary, target)
+            except OSError:
+                _remove_quietly(temporary)
+                raise
+            self.progress.files_done += 1
+            return
+
+        with open(source, 'rb') as fsrc:
+            temporary, fdst = _open_temporary(target)
+            try:
+                with fdst:
+                    copy_file_contents(fsrc, fdst, self.add_bytes)
+                shutil.copystat(source, temporary)
+                os.replace(temporary, target)
+            except BaseException:
+                # Nedokončený soubor by byl jen poškozená kopie
+                _remove_quietly(temporary)
+                raise
+        self.progress.files_done += 1
+        self.report()
+
+    def _remove_source(self, source: str) -> None:
+        """Po úspěšném přesunu mezi zařízeními smaže zdroj"""
+        try:
+            if os.path.isdir(source) and not os.path.islink(source):
+                shutil.rmtree(source)
+            else:
+                os.remove(source)
+        except OSError as e:
+            self.add_error(source, e)
+
+    def summary(self) -> str:
+        """Text zprávy po úspěšném dokončení"""
+        verb = "Přesunuto" if self.move else "Zkopírováno"
+        message = f"{verb}: {self.done} položek"
+        if self.progress.bytes_done:
+            message += f" ({format_size(self.progress.bytes_done)})"
+        if self.skipped:
+            message += f", přeskočeno: {self.skipped}"
+        return message
+
+
+class DeleteJob(FileJob):
+    """Mazání souborů a složek na pozadí
+
+    Strom se prochází po úrovních: soubory všech složek jedné úrovně se
+    mažou souběžně v poolu vláken, prázdné složky se pak odstraní od
+    nejhlubší úrovně. Chyby se sbírají a úloha pokračuje dál.
+    """
+
+    def __init__(self, paths: List[str], max_workers: Optional[int] = None):
+        super().__init__("Mazání")
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 2) * 2)
+        self._counter_lock = threading.Lock()
+
+    def run(self) -> None:
+        """Smaže všechny položky úlohy"""
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="delete") as pool:
+            for path in self.paths:
+                self.check()
+                self.progress.current = path
+                if os.path.isdir(path) and not os.path.islink(path):
+                    self._delete_tree(path, pool)
+                else:
+                    self._unlink(path)
+
+    def _delete_tree(self, root: str, pool: "ThreadPoolExecutor") -> None:
+        """Smaže složku i s obsahem"""
+        levels = []
+        level = [root]
+        while level:
+            levels.append(level)
+            next_level = []
+            for subdirs in pool.map(self._clear_directory, level):
+                next_level.extend(subdirs)
+            level = next_level
+
+        for level in reversed(levels):
+            self.check()
+            list(pool.map(self._remove_directory, level))
+
+    def _clear_directory(self, path: str) -> List[str]:
+        """Smaže soubory ve složce a vrátí její podsložky (běží v poolu)"""
+        self.check()
+        subdirs = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    is_junction = getattr(entry, 'is_junction', None)
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        is_dir = False
+                    if is_dir and not (is_junction and is_junction()):
+                        subdirs.append(entry.path)
+                    elif is_dir:
+                        # Junction se maže jako odkaz, obsah cíle zůstává
+                        self._remove_directory(entry.path)
+                    else:
+                        self._unlink(entry.path)
+        except JobCancelled:
+            raise
+        except OSError as e:
+            self.add_error(path, e)
+        return subdirs
+
+    def _unlink(self, path: str) -> None:
+        """Smaže soubor nebo odkaz (včetně souborů jen pro čtení na Windows)"""
+        try:
+            try:
+                os.unlink(path)
+            except PermissionError:
+                if not sys.platform.startswith('win'):
+                    raise
+                os.chmod(path, stat.S_IWRITE)
+                os.unlink(path)
+        except OSError as e:
+            self.add_error(path, e)
+            return
+        self._count_removed()
+
+    def _remove_directory(self, path: str) -> None:
+        """Odstraní prázdnou složku"""
+        try:
+            os.rmdir(path)
+        except OSError as e:
+            # Složka s nesmazaným obsahem - chyba už je zaznamenaná u obsahu
+            if e.errno not in (errno.ENOTEMPTY, errno.EEXIST) or not self.errors:
+                self.add_error(path, e)
+            return
+        self._count_removed()
+
+    def _count_removed(self) -> None:
+        """Započítá smazanou položku a zkontroluje pauzu/zrušení"""
+        with self._counter_lock:
+            self.progress.files_done += 1
+        self.report()
+        self.check()
+
+    def add_error(self, path: str, error) -> None:
+        """Zaznamená chybu položky (volá se z více vláken)"""
+        with self._counter_lock:
+            super().add_error(path, error)
+
+    def summary(self) -> str:
+        """Text zprávy po úspěšném dokončení"""
+        return f"Smazáno: {self.progress.files_done} položek"
+
+
+class RenameRule:
+    """Pravidlo hromadného přejmenování
+
+    Šablona může obsahovat {name} (název bez přípony po nahrazení),
+    {ext} (přípona bez tečky), {n} (počítadlo) a {date} (datum změny).
+    Přípona se k výsledku připojí automaticky, pokud keep_extension.
+    """
+
+    CASES = ("none", "lower", "upper", "title")
+    TOKEN_PATTERN = re.compile(r"\{(name|ext|n|date)\}")
+
+    def __init__(self, template: str = "{name}", find: str = "", replace: str = "",
+                 use_regex: bool = False, case: str = "none", counter_start: int = 1,
+                 counter_step: int = 1, counter_digits: int = 1, date_format: str = "%Y-%m-%d",
+                 keep_extension: bool = True):
+        self.template = template
+        self.find = find
+        self.replace = replace
+        self.use_regex = use_regex
+        self.case = case
+        self.counter_start = counter_start
+        self.counter_step = counter_step
+        self.counter_digits = counter_digits
+        self.date_format = date_format
+        self.keep_extension = keep_extension
+        # Neplatný regulární výraz vyvolá re.error už tady, ne u každého souboru
+        self._regex = re.compile(find) if use_regex and find else None
+
+    def needs_stat(self) -> bool:
+        """Kontroluje, zda šablona potřebuje datum změny souboru"""
+        return "{date}" in self.template
+
+    def new_name(self, path: str, position: int, is_dir: bool = False, stat_info=None) -> str:
+        """Vrací nový název položky na dané pozici výběru"""
+        name = os.path.basename(path)
+        stem, ext = (name, "") if is_dir else os.path.splitext(name)
+
+        if self.find:
+            if self._regex is not None:
+                stem = self._regex.sub(self.replace, stem)
+            else:
+                stem = stem.replace(self.find, self.replace)
+
+        number = self.counter_start + position * self.counter_step
+        values = {
+            'name': stem,
+            'ext': ext.lstrip('.'),
+            'n': str(number).zfill(self.counter_digits),
+            'date': datetime.fromtimestamp(stat_info.st_mtime).strftime(self.date_format) if stat_info else "",
+        }
+        result = self.TOKEN_PATTERN.sub(lambda match: values[match.group(1)], self.template)
+
+        if self.case == "lower":
+            result = result.lower()
+        elif self.case == "upper":
+            result = result.upper()
+        elif self.case == "title":
+            result = result.title()
+
+        return result + ext if self.keep_extension else result
+
+
+# Znaky, které nesmí být v názvu souboru
+INVALID_NAME_CHARS = set('<>:"/\\|?*\0') if sys.platform.startswith('win') else {'/', '\0'}
+
+
+class BatchRenamePlan:
+    """Výsledek výpočtu hromadného přejmenování (náhled a kontrola kolizí)"""
+
+    def __init__(self):
+        self.rows = []      # (původní cesta, nový název, problém nebo "")
+        self.pairs = []     # (původní cesta, nová cesta) pro změněné položky
+        self.problems = 0
+
+    @classmethod
+    def build(cls, paths: List[str], rule: RenameRule, cancelled=None) -> 'BatchRenamePlan':
+        """Spočítá nové názvy a zkontroluje kolize ještě před změnou na disku
+
+        Cíl smí být jen na místě položky, která se sama úspěšně přejmenuje.
+        Vybrané položky, které název nemění nebo mají problém, zůstávají
+        na disku a kolidují jako kterýkoli jiný soubor.
+        """
+        plan = cls()
+        key = os.path.normcase
+        targets = {}
+
+        for position, path in enumerate(paths):
+            if cancelled is not None and cancelled():
+                return plan
+            try:
+                stat_info = os.stat(path) if rule.needs_stat() else None
+            except OSError:
+                stat_info = None
+            new_name = rule.new_name(path, position, os.path.isdir(path), stat_info)
+            new_path = os.path.join(os.path.dirname(path), new_name)
+            plan.rows.append([path, new_name, ""])
+            if new_path != path:
+                targets.setdefault(key(new_path), []).append(len(plan.rows) - 1)
+
+        # Problémová položka zůstane na místě a může zablokovat další cíl - opakuje se do ustálení
+        moving = {key(plan.rows[row_index][0]) for row_indexes in targets.values() for row_index in row_indexes}
+        changed = True
+        while changed:
+            changed = False
+            for target_key, row_indexes in targets.items():
+                for row_index in row_indexes:
+                    row = plan.rows[row_index]
+                    if row[2]:
+                        continue
+                    path, new_name = row[0], row[1]
+                    new_path = os.path.join(os.path.dirname(path), new_name)
+                    if not new_name or new_name in ('.', '..') or INVALID_NAME_CHARS & set(new_name):
+                        row[2] = "Neplatný název"
+                    elif len(row_indexes) > 1:
+                        row[2] = "Stejný název jako jiná položka"
+                    elif (target_key not in moving and os.path.lexists(new_path)
+                          and key(new_path) != key(path)):
+                        row[2] = "Položka s tímto názvem už existuje"
+                    else:
+                        continue
+                    moving.discard(key(path))
+                    plan.problems += 1
+                    changed = True
+
+        for target_key, row_indexes in targets.items():
+            for row_index in row_indexes:
+                path, new_name, problem = plan.rows[row_index]
+                if not problem:
+                    plan.pairs.append((path, os.path.join(os.path.dirname(path), new_name)))
+        return plan
+
+
+def order_renames(pairs: List[tuple]) -> List[tuple]:
+    """Seřadí přejmenování tak, aby žádné nepřepsalo dosud nepřejmenovanou položku
+
+    Cykly (a→b, b→a) se rozpojí přes dočasný název.
+    """
+    key = os.path.normcase
+    pending = {key(source): (source, target) for source, target in pairs}
+    reserved = {key(target) for _, target in pairs}
+    steps = []
+    temp_counter = 0
+
+    while pending:
+        progressed = False
+        for source_key, (source, target) in list(pending.items()):
+            blocker = key(target)
+            if blocker != source_key and blocker in pending:
+                continue
+            steps.append((source, target))
+            del pending[source_key]
+            progressed = True
+
+        if not progressed:
+            # Všechny zbývající cíle jsou obsazené - jde o cyklus
+            source_key, (source, target) = next(iter(pending.items()))
+            while True:
+                temp_counter += 1
+                temp_path = f"{source}.rename-{temp_counter}.tmp"
+                if key(temp_path) not in reserved and not os.path.lexists(temp_path):
+                    break
+            steps.append((source, temp_path))
+            del pending[source_key]
+            pending[key(temp_path)] = (temp_path, target)
+    return steps
+
+
+class BatchRenameJob(FileJob):
+    """Provedení hromadného přejmenování se zpětným vrácením při chybě"""
+
+    def __init__(self, pairs: List[tuple]):
+        super().__init__("Hromadné přejmenování")
+        self.pairs = pairs
+
+    def run(self) -> None:
+        """Přejmenuje položky v bezpečném pořadí, při chybě vrátí hotové kroky"""
+        steps = order_renames(self.pairs)
+        final_targets = {target for _, target in self.pairs}
+        self.progress.files_total = len(self.pairs)
+        completed = []
+        try:
+            for source, target in steps:
+                self.check()
+                # os.rename na POSIXu existující soubor tiše přepíše
+                if os.path.lexists(target) and os.path.normcase(source) != os.path.normcase(target):
+                    raise FileExistsError(errno.EEXIST, "Cíl už existuje", target)
+                os.rename(source, target)
+                completed.append((source, target))
+                if target in final_targets:
+                    self.progress.files_done += 1
+                self.report()
+        except (OSError, JobCancelled) as e:
+            for source, target in reversed(completed):
+                try:
+                    os.rename(target, source)
+                except OSError as rollback_error:
+                    self.add_error(target, rollback_error)
+            if isinstance(e, JobCancelled):
+                raise
+            self.add_error(getattr(e, 'filename', None) or source, e)
+
+    def summary(self) -> str:
+        """Text zprávy po úspěšném dokončení"""
+        return f"Přejmenováno: {len(self.pairs)} položek"
+
+    def error_summary(self) -> str:
+        """Souhrn chyb s informací o vrácení změn"""
+        return super().error_summary() + "\nDokončená přejmenování byla vrácena zpět."
+
+
+class DeduplicateJob(FileJob):
+    """Nahrazení duplicitních souborů pevným odkazem či reflinkem na ponechaný soubor, nebo jejich smazání
+
+    Před náhradou i smazáním se otiskem celého obsahu ověří, že ponechaný
+    soubor existuje a soubory se od hledání nezměnily. Odkaz vzniká vedle duplicity pod dočasným názvem a duplicitu
+    nahradí až hotový, takže při chybě zůstane duplicita beze změny.
+    Reflink (FICLONE) sdílí bloky jen na CoW souborových systémech Linuxu,
+    duplicita si na rozdíl od pevného odkazu ponechá svá oprávnění a časy.
+    """
+
+    HARDLINK = "hardlink"
+    REFLINK = "reflink"
+    DELETE = "delete"
+
+    TITLES = {HARDLINK: "Pevné odkazy na duplicity", REFLINK: "Reflinky duplicit", DELETE: "Smazání duplicit"}
+
+    def __init__(self, pairs: List[tuple], mode: str):
+        super().__init__(self.TITLES[mode])
+        self.pairs = pairs  # (duplicita, ponechaný soubor)
+        self.mode = mode
+        self.processed = []  # Úspěšně nahrazené nebo smazané duplicity
+        self._digests = {}  # Ponechaný soubor -> otisk obsahu (ověřuje se jednou)
+
+    def run(self) -> None:
+        """Nahradí duplicity, chyby jednotlivých souborů sbírá"""
+        self.progress.files_total = len(self.pairs)
+        for duplicate, original in self.pairs:
+            self.check()
+            self.progress.current = duplicate
+            try:
+                self._verify(duplicate, original)
+                if self.mode == self.DELETE:
+                    os.unlink(duplicate)
+                else:
+                    self._replace(duplicate, original)
+            except OSError as e:
+                self.add_error(duplicate, e)
+                continue
+            self.processed.append(duplicate)
+            self.progress.files_done += 1
+            self.report()
+
+    def _verify(self, duplicate: str, original: str) -> None:
+        """Ověří, že duplicita má stále stejný obsah jako ponechaný soubor"""
+        duplicate_info = os.stat(duplicate)
+        original_info = os.stat(original)
+        if os.path.samestat(duplicate_info, original_info):
+            if self.mode == self.DELETE:
+                return  # Pevný odkaz na ponechaný soubor - obsah zůstane zachován
+            raise OSError(errno.EEXIST, "Soubor už je odkazem na ponechaný soubor")
+        if original not in self._digests:
+            self._digests[original] = hash_file_contents(original)
+        if (duplicate_info.st_size != original_info.st_size or self._digests[original] is None
+                or hash_file_contents(duplicate) != self._digests[original]):
+            raise OSError(errno.EAGAIN, "Soubor se od hledání duplicit změnil")
+
+    def _replace(self, duplicate: str, original: str) -> None:
+        """Nahradí duplicitu hotovým odkazem (při chybě se maže jen vlastní dočasný soubor)"""
+        if self.mode == self.REFLINK and (fcntl is None or not sys.platform.startswith('linux')):
+            raise OSError(errno.EOPNOTSUPP, "Reflink je dostupný jen na Linuxu")
+        temporary = self._create_link(duplicate, original)
+        try:
+            if self.mode == self.REFLINK:
+                shutil.copystat(duplicate, temporary)
+            os.replace(temporary, duplicate)
+        except OSError:
+            self._remove_temporary(temporary)
+            raise
+
+    def _create_link(self, duplicate: str, original: str) -> str:
+        """Vytvoří odkaz na ponechaný soubor pod volným dočasným názvem vedle duplicity
+
+        Existující soubor se nikdy nepřepíše ani nesmaže, při kolizi se
+        zkusí jiný náhodný název.
+        """
+        folder, name = os.path.split(duplicate)
+        for _ in range(100):
+            temporary = os.path.join(folder, f".{name}.{os.urandom(4).hex()}.flexifiles-link")
+            try:
+                if self.mode == self.HARDLINK:
+                    os.link(original, temporary)
+                    return temporary
+                dst = open(temporary, "xb")
+            except FileExistsError:
+                continue
+            # Soubor vytvořilo toto volání, při chybě klonování ho lze smazat
+            try:
+                with dst, open(original, "rb") as src:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            except OSError:
+                self._remove_temporary(temporary)
+                raise
+            return temporary
+        raise OSError(errno.EEXIST, "Nepodařilo se najít volný dočasný název pro odkaz")
+
+    @staticmethod
+    def _remove_temporary(temporary: str) -> None:
+        try:
+            os.unlink(temporary)
+        except OSError:
+            pass
+
+    def summary(self) -> str:
+        """Text zprávy po úspěšném dokončení"""
+        if self.mode == self.DELETE:
+            return f"Smazáno duplicit: {self.progress.files_done}"
+        return f"Nahrazeno duplicit: {self.progress.files_done}"
+
+
+def _is_same_or_inside(path: str, folder: str) -> bool:
+    """Kontroluje, zda path je folder nebo leží uvnitř něj"""
+    path = os.path.normcase(os.path.realpath(path))
+    folder = os.path.normcase(os.path.realpath(folder))
+    return path == folder or path.startswith(folder.rstrip(os.sep) + os.sep)
+
+
+def _same_device(path: str, other: str) -> bool:
+    """Kontroluje, zda obě cesty leží na stejném zařízení"""
+    try:
+        return os.lstat(path).st_dev == os.stat(other).st_dev
+    except OSError:
+        return False
+
+
+def _temporary_path(target: str) -> str:
+    """Volný dočasný název vedle cíle (skrytý, s náhodnou příponou)"""
+    folder, name = os.path.split(target)
+    while True:
+        candidate = os.path.join(folder, f".{name}.{os.urandom(4).hex()}.flexifiles-part")
+        if not os.path.lexists(candidate):
+            return candidate
+
+
+def _open_temporary(target: str) -> tuple:
+    """Vytvoří a otevře nový dočasný soubor vedle cíle - existující soubor se nikdy neotevře"""
+    while True:
+        temporary = _temporary_path(target)
+        try:
+            return temporary, open(temporary, 'xb')
+        except FileExistsError:
+            continue
+
+
+def _remove_quietly(path: str) -> None:
+    """Smaže soubor a chybu ignoruje"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _unique_path(path: str) -> str:
+    """Vrací volnou cestu ve tvaru 'název (2).přípona'"""
+    folder, name = os.path.split(path)
+    stem, ext = os.path.splitext(name)
+    if os.path.isdir(path):
+        stem, ext = name, ""
+    counter = 2
+    while True:
+        candidate = os.path.join(folder, f"{stem} ({counter}){ext}")
+        if not os.path.lexists(candidate):
+            return candidate
+        counter += 1
+
+
+class TransferEngine(QObject):
+    """Fronta úloh se soubory zpracovávaná jedním pracovním vláknem
+
+    Úlohy běží postupně v pořadí zařazení, aby se souběžné kopie
+    nepraly o stejný disk. GUI dostává průběh, dokončení a souhrn chyb
+    signály; pauza a zrušení se řídí přes identifikátor úlohy.
+    """
+
+    job_queued = pyqtSignal(int, str)       # job_id, název úlohy
+    job_progress = pyqtSignal(int, object)  # job_id, TransferProgress
+    job_finished = pyqtSignal(int, str)     # job_id, souhrn
+    job_failed = pyqtSignal(int, str)       # job_id, souhrn chyb
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._queue = queue.Queue()
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._next_job_id = 1
+        self._thread = None
+
+    def submit(self, job: FileJob) -> int:
+        """Zařadí úlohu do fronty a vrátí její identifikátor"""
+        with self._lock:
+            job.job_id = self._next_job_id
+            self._next_job_id += 1
+            job.engine = self
+            self._jobs[job.job_id] = job
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="file-jobs", daemon=True)
+                self._thread.start()
+        self._queue.put(job)
+        self.job_queued.emit(job.job_id, job.title)
+        return job.job_id
+
+    def job(self, job_id: int) -> Optional[FileJob]:
+        """Vrací úlohu podle identifikátoru (jen čekající a běžící)"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def active_jobs(self) -> List[FileJob]:
+        """Vrací čekající a běžící úlohy v pořadí zařazení"""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: int) -> None:
+        """Zruší úlohu"""
+        job = self.job(job_id)
+        if job:
+            job.cancel()
+
+    def cancel_all(self) -> None:
+        """Zruší všechny čekající a běžící úlohy"""
+        for job in self.active_jobs():
+            job.cancel()
+
+    def shutdown(self) -> None:
+        """Zruší úlohy a ukončí pracovní vlákno"""
+        self.cancel_all()
+        self._queue.put(None)
+
+    def _worker(self) -> None:
+        """Smyčka pracovního vlákna"""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            try:
+                if job.cancelled:
+                    raise JobCancelled()
+                with TRACER.span(job.title, "soubory"):
+                    job.execute()
+            except JobCancelled:
+                self._finish(job, lambda: self.job_finished.emit(job.job_id, f"{job.title}: zrušeno"))
+                continue
+            except Exception as e:
+                job.add_error(job.title, e)
+
+            if job.errors:
+                self._finish(job, lambda: self.job_failed.emit(job.job_id, job.error_summary()))
+            else:
+                self._finish(job, lambda: self.job_finished.emit(job.job_id, job.summary()))
+
+    def _finish(self, job: FileJob, emit) -> None:
+        """Vyřadí úlohu ze seznamu a pošle výsledný signál"""
+        with self._lock:
+            self._jobs.pop(job.job_id, None)
+        emit()
+
+
+class FileOperations(QObject):
+    """Třída pro operace se soubory a složkami"""
+    
+    operation_completed = pyqtSignal(str)  # Signál po dokončení operace
+    operation_failed = pyqtSignal(str)     # Signál při chybě
+    job_completed = pyqtSignal(str)        # Signál po dokončení úlohy na pozadí
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Kopírování a přesun běží na pozadí; dokončení má vlastní signál, protože
+        # složky se mezitím obnovují samy (QFileSystemModel, sledování obřích složek)
+        self.transfer_engine = TransferEngine(self)
+        self.transfer_engine.job_finished.connect(lambda job_id, message: self.job_completed.emit(message))
+        self.transfer_engine.job_failed.connect(lambda job_id, message: self.operation_failed.emit(message))
+    
+    @traced("soubory")
+    def create_folder(self, parent_path: str, folder_name: str) -> bool:
+        """Vytvoří novou složku"""
+        try:
+            new_path = os.path.join(parent_path, folder_name)
+            os.makedirs(new_path, exist_ok=False)
+            self.operation_completed.emit(f"Složka '{folder_name}' byla vytvořena")
+            return True
+        except FileExistsError:
+            self.operation_failed.emit(f"Složka '{folder_name}' již existuje")
+        except Exception as e:
+            self.operation_failed.emit(f"Chyba při vytváření složky: {str(e)}")
+        return False
+    
+    @traced("soubory")
+    def delete_item(self, path: str) -> bool:
+        """Smaže soubor nebo složku (složky na pozadí, výsledek přijde signálem)"""
+        try:
+            if os.path.islink(path) or os.path.isfile(path):
+                os.remove(path)
+                self.operation_completed.emit(f"Soubor byl smazán")
+            elif os.path.isdir(path):
+                self.transfer_engine.submit(DeleteJob([path]))
+            return True
+        except Exception as e:
+            self.operation_failed.emit(f"Chyba při mazání: {str(e)}")
+        return False
+    
+    @traced("soubory")
+    def copy_items(self, sources: List[str], destination: str, move: bool = False,
+                   policy: ConflictPolicy = ConflictPolicy.RENAME) -> int:
+        """Zařadí kopírování nebo přesun položek do fronty a vrátí id úlohy"""
+        return self.transfer_engine.submit(TransferJob(sources, destination, move, policy))
+    
+    @traced("soubory")
+    def batch_rename(self, pairs: List[tuple]) -> int:
+        """Zařadí hromadné přejmenování (dvojice původní/nová cesta) a vrátí id úlohy"""
+        return self.transfer_engine.submit(BatchRenameJob(pairs))
+    
+    @traced("soubory")
+    def deduplicate(self, job: DeduplicateJob) -> int:
+        """Zařadí ověřenou náhradu nebo smazání duplicit a vrátí id úlohy"""
+        return self.transfer_engine.submit(job)
+    
+    @traced("soubory")
+    def rename_item(self, old_path: str, new_name: str) -> bool:
+        """Přejmenuje soubor nebo složku"""
+        try:
+            parent_dir = os.path.dirname(old_path)
+            new_path = os.path.join(parent_dir, new_name)
+            os.rename(old_path, new_path)
+            self.operation_completed.emit(f"Položka byla přejmenována na '{new_name}'")
+            return True
+        except Exception as e:
+            self.operation_failed.emit(f"Chyba při přejmenování: {str(e)}")
+        return False
+
+
+class FileNameIndex:
+    """Perzistentní index názvů souborů pro okamžité hledání (SQLite)
+
+    Každá indexovaná složka má řádek v tabulce dirs s cestou a st_mtime_ns,
+    její přímé položky jsou v tabulce entries. Názvy se zrcadlí do FTS5
+    tabulky s trigramovým tokenizérem, takže dotazy LIKE '%text%' se
+    vyhodnocují přes trigramy a ne průchodem všech řádků. Bez FTS5
+    (starší SQLite) se hledá přímo v entries. Změna mtime složky znamená
+    přidání, smazání nebo přejmenování položky, podle ní se index
+    aktualizuje po jednotlivých složkách.
+    """
+
+    DEFAULT_LIMIT = 500
+
+    def __init__(self, db_path: str):
+        import sqlite3
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS dirs (
+                id INTEGER PRIMARY KEY,
+                path TEXT NOT NULL UNIQUE,
+                mtime_ns INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY,
+                dir_id INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                is_dir INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_dir ON entries(dir_id);
+        """)
+        self.fts = self._create_fts()
+        self._conn.commit()
+        # Hledání běží v GUI vlákně vlastním spojením, aby nečekalo na zápisy indexeru (WAL)
+        self._reader = sqlite3.connect(db_path, check_same_thread=False)
+
+    def _create_fts(self) -> bool:
+        """Vytvoří trigramovou FTS5 tabulku napojenou na entries triggery"""
+        import sqlite3
+        try:
+            self._conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS names USING fts5(
+                    name, content='entries', content_rowid='id', tokenize='trigram', detail='none'
+                );
+                CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+                    INSERT INTO names(rowid, name) VALUES (new.id, new.name);
+                END;
+                CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+                    INSERT INTO names(names, rowid, name) VALUES ('delete', old.id, old.name);
+                END;
+            """)
+            return True
+        except sqlite3.OperationalError:
+            # SQLite bez FTS5 nebo trigramového tokenizéru (< 3.34)
+            return False
+
+    def directory_state(self, path: str) -> Optional[tuple]:
+        """Vrací (dir_id, mtime_ns) indexované složky"""
+        with self._lock:
+            if self._conn is None:
+                return None
+            return self._conn.execute("SELECT id, mtime_ns FROM dirs WHERE path = ?", (path,)).fetchone()
+
+    def subdirectories(self, dir_id: int) -> List[str]:
+        """Vrací názvy podsložek uložených u složky"""
+        with self._lock:
+            if self._conn is None:
+                return []
+            rows = self._conn.execute(
+                "SELECT name FROM entries WHERE dir_id = ? AND is_dir = 1", (dir_id,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def sync_directory(self, path: str, mtime_ns: int, listing: dict) -> List[str]:
+        """Porovná uložený obsah složky s aktuálním výpisem a zapíše rozdíl
+
+        listing: název -> je složka. Vrací názvy podsložek, které v indexu
+        dosud nebyly (jejich podstrom je potřeba projít celý).
+        """
+        with self._lock:
+            if self._conn is None:
+                return []
+            row = self._conn.execute("SELECT id FROM dirs WHERE path = ?", (path,)).fetchone()
+            if row is None:
+                dir_id = self._conn.execute(
+                    "INSERT INTO dirs (path, mtime_ns) VALUES (?, ?)", (path, mtime_ns)
+                ).lastrowid
+                stored = {}
+            else:
+                dir_id = row[0]
+                self._conn.execute("UPDATE dirs SET mtime_ns = ? WHERE id = ?", (mtime_ns, dir_id))
+                stored = {
+                    name: (entry_id, bool(is_dir)) for entry_id, name, is_dir in self._conn.execute(
+                        "SELECT id, name, is_dir FROM entries WHERE dir_id = ?", (dir_id,)
+                    )
+                }
+
+            removed = [(name, entry) for name, entry in stored.items() if listing.get(name) != entry[1]]
+            added = [(name, is_dir) for name, is_dir in listing.items()
+                     if name not in stored or stored[name][1] != is_dir]
+            self._conn.executemany("DELETE FROM entries WHERE id = ?", ((entry[0],) for _, entry in removed))
+            for name, (_, was_dir) in removed:
+                if was_dir:
+                    self._forget_tree(os.path.join(path, name))
+            self._conn.executemany(
+                "INSERT INTO entries (dir_id, name, is_dir) VALUES (?, ?, ?)",
+                ((dir_id, name, int(is_dir)) for name, is_dir in added)
+            )
+        return [name for name, is_dir in added if is_dir]
+
+    def forget(self, path: str) -> None:
+        """Odstraní složku a celý její podstrom z indexu"""
+        with self._lock:
+            if self._conn is not None:
+                self._forget_tree(path)
+
+    def _forget_tree(self, path: str) -> None:
+        """Smaže složky podstromu i jejich položky (volá se pod zámkem)"""
+        prefix = path.rstrip(os.sep) + os.sep
+        dir_ids = [row[0] for row in self._conn.execute(
+            "SELECT id FROM dirs WHERE path = ? OR substr(path, 1, ?) = ?", (path, len(prefix), prefix)
+        )]
+        self._conn.executemany("DELETE FROM entries WHERE dir_id = ?", ((dir_id,) for dir_id in dir_ids))
+        self._conn.executemany("DELETE FROM dirs WHERE id = ?", ((dir_id,) for dir_id in dir_ids))
+
+    def forget_outside(self, roots: List[str]) -> None:
+        """Smaže složky, které neleží v žádném z indexovaných kořenů"""
+        with self._lock:
+            if self._conn is None:
+                return
+            stale = [path for (path,) in self._conn.execute("SELECT path FROM dirs")
+                     if not any(_is_same_or_inside(path, root) for root in roots)]
+            for path in stale:
+                self._forget_tree(path)
+            self._conn.commit()
+
+    def commit(self) -> None:
+        """Potvrdí zapsané změny"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.commit()
+
+    def count(self) -> int:
+        """Počet indexovaných položek"""
+        if self._reader is None:
+            return 0
+        return self._reader.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    @staticmethod
+    def _like_pattern(pattern: str, glob: bool) -> str:
+        """Převede dotaz na vzor LIKE, který vrací nadmnožinu shod
+
+        Znaky % a _ se záměrně neescapují - LIKE s ESCAPE už trigramy
+        nezrychlí. Přesná shoda se ověřuje v Pythonu.
+        """
+        if not glob:
+            return f"%{pattern}%"
+        like = re.sub(r"\[[^\]]*\]", "_", pattern)
+        return like.replace("*", "%").replace("?", "_")
+
+    def search(self, pattern: str, limit: int = DEFAULT_LIMIT) -> List[tuple]:
+        """Hledá názvy podle podřetězce nebo masky (*, ?, [...]) bez ohledu na velikost písmen
+
+        Vrací nejvýše limit trojic (cesta, název, je složka).
+        """
+        import sqlite3
+        pattern = pattern.strip()
+        if not pattern or self._reader is None:
+            return []
+        glob = any(char in pattern for char in "*?[")
+        folded = pattern.casefold()
+        if glob:
+            matches = lambda name: fnmatch.fnmatchcase(name.casefold(), folded)
+        else:
+            matches = lambda name: folded in name.casefold()
+
+        if self.fts:
+            query = ("SELECT d.path, e.name, e.is_dir FROM names "
+                     "JOIN entries e ON e.id = names.rowid JOIN dirs d ON d.id = e.dir_id "
+                     "WHERE names.name LIKE ?")
+        else:
+            query = ("SELECT d.path, e.name, e.is_dir FROM entries e "
+                     "JOIN dirs d ON d.id = e.dir_id WHERE e.name LIKE ?")
+        results = []
+        try:
+            # Kurzor se čte líně, po naplnění limitu se dotaz dál nevyhodnocuje
+            for dir_path, name, is_dir in self._reader.execute(query, (self._like_pattern(pattern, glob),)):
+                if matches(name):
+                    results.append((os.path.join(dir_path, name), name, bool(is_dir)))
+                    if len(results) >= limit:
+                        break
+        except sqlite3.Error:
+            return results
+        return results
+
+    def close(self) -> None:
+        """Zavře databázi"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+
+
+class FileIndexer(QObject):
+    """Udržuje FileNameIndex aktuální pomocí jednoho vlákna na pozadí
+
+    Úplný průchod kořenů porovnává mtime každé složky s indexem:
+    nezměněná složka stojí jediné stat() a do podsložek se sestupuje podle
+    indexu, změněná se přečte přes scandir a zapíše se jen rozdíl.
+    Jednotlivé složky hlášené změnami na disku (watcher, načtení modelem,
+    operace se soubory) se zařazují přednostně a kontrolují nerekurzivně.
+    Symbolické odkazy a junctiony se nenásledují.
+    """
+
+    index_updated = pyqtSignal(int)      # počet změněných složek
+    sweep_finished = pyqtSignal(int)     # počet indexovaných položek
+
+    COMMIT_INTERVAL = 0.5  # s - jak často se potvrzuje zápis a posílá index_updated
+
+    def __init__(self, index: FileNameIndex, roots: List[str], parent=None):
+        super().__init__(parent)
+        self.index = index
+        self.roots = self._normalize_roots(roots)
+        self._queue = queue.PriorityQueue()
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._pending_dirs = set()
+        self._sweep_pending = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _normalize_roots(roots: List[str]) -> List[str]:
+        """Odstraní neexistující a vnořené kořeny"""
+        normalized = sorted({os.path.realpath(root) for root in roots if os.path.isdir(root)})
+        result = []
+        for root in normalized:
+            if not any(_is_same_or_inside(root, kept) for kept in result):
+                result.append(root)
+        return result
+
+    def start(self) -> None:
+        """Spustí vlákno a úplný průchod kořenů"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name="file-indexer", daemon=True)
+            self._thread.start()
+        self.sweep()
+
+    def set_roots(self, roots: List[str]) -> None:
+        """Změní indexované kořeny, zapomene složky mimo ně a spustí průchod"""
+        self.roots = self._normalize_roots(roots)
+        self._put(1, ("roots", list(self.roots)))
+        self.sweep()
+
+    def sweep(self) -> None:
+        """Zařadí úplný průchod všech kořenů (nejvýše jeden čekající)"""
+        with self._lock:
+            if self._sweep_pending:
+                return
+            self._sweep_pending = True
+        self._put(2, ("sweep", None))
+
+    def invalidate(self, path: str) -> None:
+        """Přednostně zkontroluje jednu složku (pokud leží v indexovaném kořeni)"""
+        # Kořeny jsou uložené přes realpath - stejný tvar potřebuje i cesta z událostí
+        # (domovská složka přes symlink, /tmp na macOS), jinak by se složka indexovala pod jiným názvem
+        path = os.path.realpath(path)
+        if not any(_is_same_or_inside(path, root) for root in self.roots):
+            return
+        with self._lock:
+            if path in self._pending_dirs:
+                return
+            self._pending_dirs.add(path)
+        self._put(0, ("dir", path))
+
+    def shutdown(self) -> None:
+        """Ukončí vlákno (rozpracovaný průchod se přeruší)"""
+        self._stop.set()
+        self._put(-1, ("stop", None))
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def _put(self, priority: int, task: tuple) -> None:
+        with self._lock:
+            self._sequence += 1
+            self._queue.put((priority, self._sequence, task))
+
+    def _worker(self) -> None:
+        """Smyčka pracovního vlákna"""
+        import sqlite3
+        while not self._stop.is_set():
+            _, _, (kind, argument) = self._queue.get()
+            if kind == "stop":
+                break
+            try:
+                if kind == "dir":
+                    with self._lock:
+                        self._pending_dirs.discard(argument)
+                    self._walk(argument, recursive=False)
+                elif kind == "roots":
+                    self.index.forget_outside(argument)
+                elif kind == "sweep":
+                    with self._lock:
+                        self._sweep_pending = False
+                    for root in self.roots:
+                        self._walk(root, recursive=True)
+                    self.sweep_finished.emit(self.index.count())
+            except sqlite3.Error as e:
+                print(f"Indexování selhalo: {e}")
+        self.index.commit()
+
+    def _walk(self, root: str, recursive: bool) -> None:
+        """Projde složku (a případně podstrom) a zapíše změny do indexu
+
+        I při nerekurzivní kontrole se nově objevené podsložky projdou
+        celé, protože v indexu zatím nic nemají.
+        """
+        stack = [(root, recursive)]
+        changed = 0
+        last_commit = time.monotonic()
+        while stack and not self._stop.is_set():
+            path, deep = stack.pop()
+            try:
+                stat_info = os.stat(path, follow_symlinks=False)
+            except OSError:
+                stat_info = None
+            if stat_info is None or not stat.S_ISDIR(stat_info.st_mode):
+                self.index.forget(path)
+                changed += 1
+                continue
+
+            state = self.index.directory_state(path)
+            if state is not None and state[1] == stat_info.st_mtime_ns:
+                if deep:
+                    stack.extend((os.path.join(path, name), True) for name in self.index.subdirectories(state[0]))
+                continue
+
+            listing = {}
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        # Symlinky a junctiony na složky se indexují jen jako položky
+                        is_junction = getattr(entry, 'is_junction', None)
+                        try:
+                            is_dir = entry.is_dir(follow_symlinks=False) and not (is_junction and is_junction())
+                        except OSError:
+                            is_dir = False
+                        listing[entry.name] = is_dir
+            except OSError:
+                continue
+            new_dirs = self.index.sync_directory(path, stat_info.st_mtime_ns, listing)
+            changed += 1
+            if deep:
+                stack.extend((os.path.join(path, name), True) for name, is_dir in listing.items() if is_dir)
+            else:
+                stack.extend((os.path.join(path, name), True) for name in new_dirs)
+
+            now = time.monotonic()
+            if now - last_commit >= self.COMMIT_INTERVAL:
+                self.index.commit()
+                self.index_updated.emit(changed)
+                changed = 0
+                last_commit = now
+
+        self.index.commit()
+        if changed:
+            self.index_updated.emit(changed)
+
+
+class SearchCriteria:
+    """Podmínky hledání podle názvu, typu, velikosti a data změny
+
+    Maska bez zástupných znaků hledá podřetězec, s * ? [...] celý název;
+    velká a malá písmena se nerozlišují. Velikost a datum změny se
+    ověřují až u položek, které vyhovují názvem, takže stat() se volá
+    jen pro ně.
+    """
+
+    KINDS = ("all", "files", "dirs")
+
+    def __init__(self, pattern: str = "", use_regex: bool = False, kind: str = "all",
+                 min_size: Optional[int] = None, max_size: Optional[int] = None,
+                 modified_after: Optional[float] = None, modified_before: Optional[float] = None):
+        if kind not in self.KINDS:
+            raise ValueError(f"Neznámý typ položek: {kind}")
+        self.pattern = pattern
+        self.use_regex = use_regex
+        self.kind = kind
+        self.min_size = min_size
+        self.max_size = max_size
+        self.modified_after = modified_after
+        self.modified_before = modified_before
+        # Maska fnmatch musí pokrýt celý název, podřetězec a regulární výraz kdekoli v něm
+        self._full_match = not use_regex and any(char in pattern for char in "*?[")
+        if use_regex:
+            self._regex = re.compile(pattern, re.IGNORECASE)  # Neplatný výraz vyvolá re.error
+        elif self._full_match:
+            self._regex = re.compile(fnmatch.translate(pattern), re.IGNORECASE)
+        elif pattern:
+            self._regex = re.compile(re.escape(pattern), re.IGNORECASE)
+        else:
+            self._regex = None
+
+    @property
+    def needs_stat(self) -> bool:
+        """Zda je kvůli velikosti nebo datu potřeba stat() položky"""
+        return any(value is not None for value in
+                   (self.min_size, self.max_size, self.modified_after, self.modified_before))
+
+    def matches_name(self, name: str, is_dir: bool) -> bool:
+        """Ověří název a typ položky (bez systémových volání)"""
+        if self.kind == "files" and is_dir or self.kind == "dirs" and not is_dir:
+            return False
+        if self._regex is None:
+            return True
+        if self._full_match:
+            return self._regex.match(name) is not None
+        return self._regex.search(name) is not None
+
+    def matches_stat(self, stat_info, is_dir: bool) -> bool:
+        """Ověří velikost (jen u souborů) a datum změny"""
+        if not is_dir:
+            if self.min_size is not None and stat_info.st_size < self.min_size:
+                return False
+            if self.max_size is not None and stat_info.st_size > self.max_size:
+                return False
+        elif self.min_size is not None or self.max_size is not None:
+            return False
+        if self.modified_after is not None and stat_info.st_mtime < self.modified_after:
+            return False
+        if self.modified_before is not None and stat_info.st_mtime > self.modified_before:
+            return False
+        return True
+
+
+class ContentQuery:
+    """Dotaz na hledání textu uvnitř souborů
+
+    Hledá se v bajtech (UTF-8). Prostý text bez ignorování velikosti
+    písmen se hledá přímo přes mmap.find, ostatní přes zkompilovaný
+    bajtový regulární výraz. U prostého textu se velikost ignoruje i pro
+    diakritiku (č/Č), u regulárního výrazu jen pro znaky ASCII.
+    """
+
+    DEFAULT_MAX_FILE_SIZE = 50 * 1024 * 1024
+
+    def __init__(self, text: str, use_regex: bool = False, case_sensitive: bool = False,
+                 file_mask: str = "", max_file_size: int = DEFAULT_MAX_FILE_SIZE):
+        if not text:
+            raise ValueError("Zadejte hledaný text")
+        self.text = text
+        self.use_regex = use_regex
+        self.case_sensitive = case_sensitive
+        self.max_file_size = max_file_size
+        self.masks = [mask.strip() for mask in re.split(r"[;,]", file_mask) if mask.strip()]
+        self._mask_regex = re.compile(
+            "|".join(fnmatch.translate(mask) for mask in self.masks), re.IGNORECASE
+        ) if self.masks else None
+        compile_pattern(self.pattern_args())  # Neplatný výraz vyvolá re.error už v GUI
+
+    def pattern_args(self) -> tuple:
+        """Parametry vzoru předávané pracovním procesům (musí jít serializovat)"""
+        return (self.text, self.use_regex, self.case_sensitive)
+
+    def file_matches(self, name: str) -> bool:
+        """Ověří název souboru proti maskám (bez masek vyhovuje každý)"""
+        return self._mask_regex is None or self._mask_regex.match(name) is not None
+
+
+GREP_SNIFF_SIZE = 8192          # Začátek souboru kontrolovaný na nulové bajty
+GREP_MAX_MATCHES_PER_FILE = 1000
+GREP_EXCERPT_LENGTH = 200
+_grep_patterns = {}             # Zkompilované vzory v pracovním procesu
+
+
+def compile_pattern(args: tuple):
+    """Vrací bajtový literál pro rychlou cestu, nebo zkompilovaný bajtový regex"""
+    pattern = _grep_patterns.get(args)
+    if pattern is None:
+        text, use_regex, case_sensitive = args
+        needle = text.encode("utf-8")
+        if not use_regex and (case_sensitive or needle.lower() == needle.upper()):
+            pattern = needle
+        elif use_regex:
+            pattern = re.compile(needle, re.MULTILINE | (0 if case_sensitive else re.IGNORECASE))
+        else:
+            # Bajtový IGNORECASE zná jen ASCII, ostatní písmena dostanou obě varianty
+            source = b"".join(
+                re.escape(char.encode("utf-8")) if char.isascii() or char.lower() == char.upper()
+                else b"(?:" + re.escape(char.lower().encode("utf-8")) + b"|"
+                + re.escape(char.upper().encode("utf-8")) + b")"
+                for char in text
+            )
+            pattern = re.compile(source, re.IGNORECASE)
+        _grep_patterns[args] = pattern
+    return pattern
+
+
+def grep_file(path: str, pattern) -> Optional[List[tuple]]:
+    """Najde řádky souboru odpovídající vzoru (None pro binární a nečitelné soubory)
+
+    Soubor se čte přes mmap; po nálezu se pokračuje až za koncem řádku,
+    takže každý řádek se vrátí nejvýše jednou jako (číslo řádku, úryvek).
+    """
+    import mmap
+    try:
+        with open(path, "rb") as f:
+            if b"\0" in f.read(GREP_SNIFF_SIZE):
+                return None
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                matches = []
+                position = 0
+                counted_to = 0
+                line_number = 1
+                while len(matches) < GREP_MAX_MATCHES_PER_FILE:
+                    if isinstance(pattern, bytes):
+                        start = data.find(pattern, position)
+                        if start < 0:
+                            break
+                        end = start + len(pattern)
+                    else:
+                        found = pattern.search(data, position)
+                        if found is None:
+                            break
+                        start, end = found.span()
+                    line_start = data.rfind(b"\n", 0, start) + 1
+                    line_end = data.find(b"\n", end if end > start else start)
+                    if line_end < 0:
+                        line_end = len(data)
+                    line_number += data[counted_to:line_start].count(b"\n")
+                    counted_to = line_start
+                    # Dlouhé řádky se zkrátí na okolí nálezu
+                    excerpt_start = max(line_start, start - GREP_EXCERPT_LENGTH // 3)
+                    excerpt = data[excerpt_start:min(line_end, excerpt_start + GREP_EXCERPT_LENGTH)]
+                    text = excerpt.decode("utf-8", errors="replace").strip()
+                    if excerpt_start > line_start:
+                        text = "…" + text
+                    matches.append((line_number, text))
+                    position = line_end + 1
+                return matches
+    except (OSError, ValueError):
+        return None
+
+
+def grep_files(paths: List[str], pattern_args: tuple) -> tuple:
+    """Úloha pracovního procesu: prohledá dávku souborů
+
+    Vrací (nálezy [(cesta, číslo řádku, úryvek)], počet přeskočených
+    binárních nebo nečitelných souborů).
+    """
+    pattern = compile_pattern(pattern_args)
+    results = []
+    skipped = 0
+    for path in paths:
+        matches = grep_file(path, pattern)
+        if matches is None:
+            skipped += 1
+            continue
+        results.extend((path, line_number, text) for line_number, text in matches)
+    return results, skipped
+
+
+class FolderSearcher(QObject):
+    """Průběžné hledání ve stromu složky na pozadí
+
+    Strom se prochází do šířky přes scandir v samostatném vlákně.
+    Nalezené položky se posílají po dávkách signálem results_found: první
+    dávka hned po prvním nálezu, další nejpozději po BATCH_INTERVAL nebo
+    při BATCH_SIZE položkách. Vlákno si výsledky nedrží, po odeslání dávky
+    patří jen modelu. Symbolické odkazy a junctiony se nenásledují.
+
+    Při hledání podle názvu (SearchCriteria) je řádek výsledku
+    (cesta, název, nadřazená složka, velikost, mtime, je složka). Při
+    hledání v obsahu (ContentQuery) se soubory posílají po dávkách do
+    poolu procesů a řádek je (cesta, název, složka, číslo řádku, úryvek,
+    False).
+    """
+
+    results_found = pyqtSignal(int, object)            # job_id, seznam řádků
+    search_finished = pyqtSignal(int, int, bool, str)  # job_id, počet nálezů, zrušeno, poznámka
+
+    BATCH_INTERVAL = 0.05  # s
+    BATCH_SIZE = 500
+    MAX_RESULTS = 100_000  # Ochrana paměti modelu při příliš obecném dotazu
+    GREP_BATCH_FILES = 64                   # Souborů v jedné úloze procesu
+    GREP_BATCH_BYTES = 16 * 1024 * 1024     # Objem dat v jedné úloze (rychlejší zrušení)
+
+    def __init__(self, parent=None, max_processes: Optional[int] = None):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._next_job_id = 1
+        self._cancel_events = {}
+        self._max_processes = max_processes or min(8, os.cpu_count() or 2)
+        self._process_pool = None
+
+    def search(self, root: str, criteria) -> int:
+        """Spustí hledání (SearchCriteria nebo ContentQuery) a vrátí identifikátor úlohy"""
+        with self._lock:
+            job_id = self._next_job_id
+            self._next_job_id += 1
+            cancelled = threading.Event()
+            self._cancel_events[job_id] = cancelled
+        target = self._run_content if isinstance(criteria, ContentQuery) else self._run
+        threading.Thread(
+            target=target, args=(job_id, root, criteria, cancelled), name="folder-search", daemon=True
+        ).start()
+        return job_id
+
+    def cancel(self, job_id: int) -> None:
+        """Zruší hledání"""
+        with self._lock:
+            cancelled = self._cancel_events.get(job_id)
+        if cancelled:
+            cancelled.set()
+
+    def shutdown(self) -> None:
+        """Zruší všechna běžící hledání a ukončí pracovní procesy"""
+        with self._lock:
+            events = list(self._cancel_events.values())
+            pool, self._process_pool = self._process_pool, None
+        for cancelled in events:
+            cancelled.set()
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def process_pool(self) -> "ProcessPoolExecutor":
+        """Pool procesů se vytváří až při prvním použití a pak se znovu používá (i hledáním duplicit)"""
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        with self._lock:
+            if self._process_pool is None:
+                # spawn i na Linuxu - fork procesu s běžícími vlákny Qt není bezpečný
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self._max_processes, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._process_pool
+
+    @staticmethod
+    def _walk(root: str, cancelled: threading.Event):
+        """Prochází strom do šířky, vrací (složka, položka, je složka)"""
+        pending = deque([root])
+        while pending and not cancelled.is_set():
+            folder = pending.popleft()
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        if cancelled.is_set():
+                            return
+                        is_junction = getattr(entry, 'is_junction', None)
+                        try:
+                            is_dir = entry.is_dir(follow_symlinks=False) and not (is_junction and is_junction())
+                        except OSError:
+                            is_dir = False
+                        if is_dir:
+                            pending.append(entry.path)
+                        yield folder, entry, is_dir
+            except OSError:
+                continue
+
+    def _run(self, job_id: int, root: str, criteria: SearchCriteria, cancelled: threading.Event) -> None:
+        """Prochází strom a posílá dávky nálezů podle názvu"""
+        batch = []
+        found = 0
+        last_emit = time.monotonic()
+        needs_stat = criteria.needs_stat
+        for folder, entry, is_dir in self._walk(root, cancelled):
+            if not criteria.matches_name(entry.name, is_dir):
+                continue
+            try:
+                stat_info = entry.stat(follow_symlinks=False)
+            except OSError:
+                if needs_stat:
+                    continue
+                stat_info = None
+            if needs_stat and not criteria.matches_stat(stat_info, is_dir):
+                continue
+            batch.append((
+                entry.path, entry.name, folder,
+                None if is_dir or stat_info is None else stat_info.st_size,
+                stat_info.st_mtime if stat_info else None, is_dir
+            ))
+            found += 1
+            now = time.monotonic()
+            if found == 1 or len(batch) >= self.BATCH_SIZE or now - last_emit >= self.BATCH_INTERVAL:
+                self.results_found.emit(job_id, batch)
+                batch = []
+                last_emit = now
+            if found >= self.MAX_RESULTS:
+                break
+        if batch:
+            self.results_found.emit(job_id, batch)
+        self._finish(job_id, found, cancelled, "")
+
+    def _run_content(self, job_id: int, root: str, query: ContentQuery, cancelled: threading.Event) -> None:
+        """Rozdělí soubory stromu do poolu procesů a posílá nálezy, jak přicházejí"""
+        from concurrent.futures import wait, FIRST_COMPLETED, ALL_COMPLETED
+        pool = self.process_pool()
+        pattern_args = query.pattern_args()
+        max_in_flight = self._max_processes * 2
+        in_flight = set()
+        found = 0
+        searched = 0
+        skipped_binary = 0
+        skipped_large = 0
+
+        def collect(wait_for_all: bool) -> None:
+            nonlocal found, skipped_binary
+            done, _ = wait(in_flight, return_when=ALL_COMPLETED if wait_for_all else FIRST_COMPLETED)
+            for future in done:
+                in_flight.discard(future)
+                try:
+                    results, skipped = future.result()
+                except Exception:  # Spadlý pracovní proces - dávka se počítá jako přeskočená
+                    continue
+                skipped_binary += skipped
+                if results and not cancelled.is_set() and found < self.MAX_RESULTS:
+                    results = results[:self.MAX_RESULTS - found]
+                    found += len(results)
+                    self.results_found.emit(job_id, [
+                        (path, os.path.basename(path), os.path.dirname(path), line_number, text, False)
+                        for path, line_number, text in results
+                    ])
+
+        batch = []
+        batch_bytes = 0
+        for _, entry, is_dir in self._walk(root, cancelled):
+            if is_dir or found >= self.MAX_RESULTS or not query.file_matches(entry.name):
+                continue
+            try:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                size = entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue
+            if size > query.max_file_size:
+                skipped_large += 1
+                continue
+            batch.append(entry.path)
+            batch_bytes += size
+            searched += 1
+            if len(batch) >= self.GREP_BATCH_FILES or batch_bytes >= self.GREP_BATCH_BYTES:
+                in_flight.add(pool.submit(grep_files, batch, pattern_args))
+                batch = []
+                batch_bytes = 0
+                # Omezení rozpracovaných dávek drží procházení stromu v tempu s procesy
+                while len(in_flight) >= max_in_flight and not cancelled.is_set():
+                    collect(wait_for_all=False)
+        if batch and not cancelled.is_set():
+            in_flight.add(pool.submit(grep_files, batch, pattern_args))
+        if cancelled.is_set():
+            for future in in_flight:
+                future.cancel()
+        elif in_flight:
+            collect(wait_for_all=True)
+
+        notes = [f"prohledáno souborů: {searched}"]
+        if skipped_binary:
+            notes.append(f"přeskočeno binárních: {skipped_binary}")
+        if skipped_large:
+            notes.append(f"přeskočeno velkých: {skipped_large}")
+        self._finish(job_id, found, cancelled, ", ".join(notes))
+
+    def _finish(self, job_id: int, found: int, cancelled: threading.Event, note: str) -> None:
+        with self._lock:
+            self._cancel_events.pop(job_id, None)
+        self.search_finished.emit(job_id, found, cancelled.is_set(), note)
+
+
+DUPLICATE_EDGE_BLOCK = 64 * 1024         # Začátek a konec souboru pro předběžný otisk
+DUPLICATE_READ_SIZE = 1024 * 1024        # Blok čtení při otisku celého obsahu
+
+
+def hash_file_edges(path: str, size: int) -> Optional[bytes]:
+    """Otisk prvního a posledního bloku souboru (None pro nečitelný soubor)"""
+    import hashlib
+    digest = hashlib.blake2b(digest_size=20)
+    try:
+        with open(path, "rb") as f:
+            if size <= 2 * DUPLICATE_EDGE_BLOCK:
+                digest.update(f.read(size))
+            else:
+                digest.update(f.read(DUPLICATE_EDGE_BLOCK))
+                f.seek(size - DUPLICATE_EDGE_BLOCK)
+                digest.update(f.read(DUPLICATE_EDGE_BLOCK))
+    except OSError:
+        return None
+    return digest.digest()
+
+
+def hash_file_contents(path: str) -> Optional[bytes]:
+    """Otisk celého obsahu souboru čteného po blocích (None pro nečitelný soubor)"""
+    import hashlib
+    digest = hashlib.blake2b(digest_size=20)
+    buffer = bytearray(DUPLICATE_READ_SIZE)
+    view = memoryview(buffer)
+    try:
+        with open(path, "rb", buffering=0) as f:
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                digest.update(view[:n])
+    except OSError:
+        return None
+    return digest.digest()
+
+
+def find_duplicates_in_groups(groups: List[tuple]) -> List[tuple]:
+    """Úloha pracovního procesu: porovná skupiny stejně velkých souborů
+
+    groups jsou dvojice (velikost, [cesty]). Každá skupina se nejdřív rozdělí
+    podle otisku okrajů, celý obsah se čte jen u souborů se shodnými okraji.
+    Vrací skupiny shodného obsahu jako [(velikost, [cesty])].
+    """
+    found = []
+    for size, paths in groups:
+        by_edges = {}
+        for path in paths:
+            digest = hash_file_edges(path, size)
+            if digest is not None:
+                by_edges.setdefault(digest, []).append(path)
+        for candidates in by_edges.values():
+            if len(candidates) < 2:
+                continue
+            if size <= 2 * DUPLICATE_EDGE_BLOCK:
+                found.append((size, candidates))  # Otisk okrajů pokryl celý soubor
+                continue
+            by_contents = {}
+            for path in candidates:
+                digest = hash_file_contents(path)
+                if digest is not None:
+                    by_contents.setdefault(digest, []).append(path)
+            found.extend((size, same) for same in by_contents.values() if len(same) > 1)
+    return found
+
+
+class DuplicateFinder(QObject):
+    """Hledání duplicitních souborů ve stromu složky na pozadí
+
+    Porovnává se ve stupních, každý dostane jen kandidáty předchozího:
+    procházení stromu zapisuje velikosti souborů do dočasné SQLite databáze
+    na disku (ani miliony souborů nezůstanou v paměti), soubory se stejnou
+    velikostí dostanou otisk prvního a posledního bloku a jen shodné okraje
+    se porovnají otiskem celého obsahu. Otisky vznikají v poolu procesů po
+    dávkách skupin stejné velikosti a žijí jen po dobu jedné dávky.
+    Pevné odkazy na stejný soubor se počítají jako jeden soubor. Skupiny
+    shodného obsahu se posílají signálem groups_found od největších souborů.
+    """
+
+    groups_found = pyqtSignal(int, object)             # job_id, [(velikost, [cesty])]
+    progress = pyqtSignal(int, str)                    # job_id, popis stavu
+    search_finished = pyqtSignal(int, int, bool, str)  # job_id, počet skupin, zrušeno, poznámka
+
+    INSERT_BATCH = 10000                   # Řádků databáze zapsaných najednou
+    HASH_BATCH_FILES = 256                 # Souborů v jedné úloze procesu
+    HASH_BATCH_BYTES = 256 * 1024 * 1024   # Objem souborů v jedné úloze (rychlejší zrušení)
+    PROGRESS_INTERVAL = 0.2
+
+    def __init__(self, pool_factory, max_in_flight: int = 8, parent=None):
+        super().__init__(parent)
+        self._pool_factory = pool_factory  # Vrací sdílený ProcessPoolExecutor
+        self._max_in_flight = max_in_flight
+        self._lock = threading.Lock()
+        self._next_job_id = 1
+        self._cancel_events = {}
+
+    def find(self, root: str, min_size: int = 1) -> int:
+        """Spustí hledání duplicit (souborů aspoň min_size bajtů) a vrátí identifikátor úlohy"""
+        with self._lock:
+            job_id = self._next_job_id
+            self._next_job_id += 1
+            cancelled = threading.Event()
+            self._cancel_events[job_id] = cancelled
+        threading.Thread(
+            target=self._run, args=(job_id, root, min_size, cancelled), name="duplicates", daemon=True
+        ).start()
+        return job_id
+
+    def cancel(self, job_id: int) -> None:
+        """Zruší hledání"""
+        with self._lock:
+            cancelled = self._cancel_events.get(job_id)
+        if cancelled:
+            cancelled.set()
+
+    def shutdown(self) -> None:
+        """Zruší všechna běžící hledání (pool procesů patří tomu, kdo ho půjčil)"""
+        with self._lock:
+            events = list(self._cancel_events.values())
+        for cancelled in events:
+            cancelled.set()
+
+    def _run(self, job_id: int, root: str, min_size: int, cancelled: threading.Event) -> None:
+        import sqlite3
+        groups = 0
+        note = ""
+        try:
+            with tempfile.TemporaryDirectory(prefix="flexifiles-duplicates-") as temp_dir:
+                db = sqlite3.connect(os.path.join(temp_dir, "sizes.sqlite"))
+                try:
+                    scanned = self._collect_sizes(db, job_id, root, min_size, cancelled)
+                    if not cancelled.is_set():
+                        groups, reclaimable = self._compare(db, job_id, cancelled)
+                        note = f"prohledáno souborů: {scanned}, uvolnitelné místo: {format_size(reclaimable)}"
+                finally:
+                    db.close()
+        except (OSError, sqlite3.Error, RuntimeError) as e:  # RuntimeError: rozbitý nebo ukončený pool
+            note = f"chyba: {e}"
+        with self._lock:
+            self._cancel_events.pop(job_id, None)
+        self.search_finished.emit(job_id, groups, cancelled.is_set(), note)
+
+    def _collect_sizes(self, db, job_id: int, root: str, min_size: int, cancelled: threading.Event) -> int:
+        """1. stupeň: zapíše velikost, zařízení a inode každého souboru stromu"""
+        db.execute("PRAGMA journal_mode=OFF")
+        db.execute("PRAGMA synchronous=OFF")
+        db.execute("CREATE TABLE files (size INTEGER, dev INTEGER, ino INTEGER, path TEXT)")
+        rows = []
+        scanned = 0
+        last_report = time.monotonic()
+        for _, entry, is_dir in FolderSearcher._walk(root, cancelled):
+            if is_dir:
+                continue
+            try:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                info = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            scanned += 1
+            if info.st_size < min_size:
+                continue
+            rows.append((info.st_size, info.st_dev, entry.inode(), entry.path))
+            if len(rows) >= self.INSERT_BATCH:
+                db.executemany("INSERT INTO files VALUES (?, ?, ?, ?)", rows)
+                rows = []
+            now = time.monotonic()
+            if now - last_report >= self.PROGRESS_INTERVAL:
+                last_report = now
+                self.progress.emit(job_id, f"Procházím strom: {scanned} souborů")
+        if rows:
+            db.executemany("INSERT INTO files VALUES (?, ?, ?, ?)", rows)
+        db.execute("CREATE INDEX files_size ON files (size)")
+        return scanned
+
+    def _candidate_groups(self, db):
+        """Skupiny (velikost, [cesty]) aspoň dvou různých souborů stejné velikosti, od největších"""
+        query = ("SELECT size, dev, ino, path FROM files WHERE size IN "
+                 "(SELECT size FROM files GROUP BY size HAVING COUNT(*) > 1) ORDER BY size DESC")
+        size = None
+        paths = []
+        seen = set()
+        for row_size, dev, ino, path in db.execute(query):
+            if row_size != size:
+                if len(paths) > 1:
+                    yield size, paths
+                size, paths, seen = row_size, [], set()
+            key = (dev, ino) if ino else path  # Bez čísla inode (některé FS) se odkazy nepoznají
+            if key not in seen:
+                seen.add(key)
+                paths.append(path)
+        if len(paths) > 1:
+            yield size, paths
+
+    def _compare(self, db, job_id: int, cancelled: threading.Event) -> tuple:
+        """2. a 3. stupeň: otisky okrajů a celého obsahu v poolu procesů"""
+        from concurrent.futures import wait, FIRST_COMPLETED, ALL_COMPLETED
+        total = db.execute("SELECT COUNT(*) FROM files WHERE size IN "
+                           "(SELECT size FROM files GROUP BY size HAVING COUNT(*) > 1)").fetchone()[0]
+        pool = self._pool_factory()
+        in_flight = {}  # future -> počet souborů dávky
+        compared = 0
+        groups = 0
+        reclaimable = 0
+        last_report = 0.0
+
+        def collect(wait_for_all: bool) -> None:
+            nonlocal compared, groups, reclaimable, last_report
+            done, _ = wait(in_flight, return_when=ALL_COMPLETED if wait_for_all else FIRST_COMPLETED)
+            for future in done:
+                compared += in_flight.pop(future)
+                try:
+                    found = future.result()
+                except Exception:  # Spadlý pracovní proces - dávka se přeskočí
+                    continue
+                if found and not cancelled.is_set():
+                    groups += len(found)
+                    reclaimable += sum(size * (len(paths) - 1) for size, paths in found)
+                    self.groups_found.emit(job_id, found)
+            now = time.monotonic()
+            if now - last_report >= self.PROGRESS_INTERVAL:
+                last_report = now
+                self.progress.emit(job_id, f"Porovnávám obsah: {compared} z {total} souborů stejné velikosti")
+
+        batch = []
+        batch_files = 0
+        batch_bytes = 0
+        for size, paths in self._candidate_groups(db):
+            if cancelled.is_set():
+                break
+            batch.append((size, paths))
+            batch_files += len(paths)
+            batch_bytes += size * len(paths)
+            if batch_files >= self.HASH_BATCH_FILES or batch_bytes >= self.HASH_BATCH_BYTES:
+                in_flight[pool.submit(find_duplicates_in_groups, batch)] = batch_files
+                batch, batch_files, batch_bytes = [], 0, 0
+                # Omezení rozpracovaných dávek drží čtení databáze v tempu s procesy
+                while len(in_flight) >= self._max_in_flight and not cancelled.is_set():
+                    collect(wait_for_all=False)
+        if batch and not cancelled.is_set():
+            in_flight[pool.submit(find_duplicates_in_groups, batch)] = batch_files
+        if cancelled.is_set():
+            for future in in_flight:
+                future.cancel()
+        elif in_flight:
+            collect(wait_for_all=True)
+        return groups, reclaimable
+
+
+class SearchResultsModel(QAbstractTableModel):
+    """Tabulkový model výsledků hledání, do kterého se řádky přidávají po dávkách
+
+    Sloupce jsou trojice (záhlaví, funkce řádek -> text, funkce řádek ->
+    klíč řazení); první prvek řádku je vždy cesta k položce a poslední
+    příznak složky.
+    """
+
+    PathRole = Qt.ItemDataRole.UserRole
+
+    def __init__(self, columns: List[tuple], parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.rows = []
+        self._sort = None
+        style = QApplication.style()
+        self._folder_icon = style.standardIcon(QStyle.StandardPixmap.SP_DirIcon)
+        self._file_icon = style.standardIcon(QStyle.StandardPixmap.SP_FileIcon)
+
+    @staticmethod
+    def name_columns() -> List[tuple]:
+        """Sloupce výsledků hledání podle názvu"""
+        return [
+            ("Název", lambda row: row[1], lambda row: row[1].casefold()),
+            ("Složka", lambda row: row[2], lambda row: row[2].casefold()),
+            ("Velikost", lambda row: "" if row[3] is None else format_size(row[3]),
+             lambda row: -1 if row[3] is None else row[3]),
+            ("Datum změny", lambda row: "" if row[4] is None
+             else datetime.fromtimestamp(row[4]).strftime("%d.%m.%Y %H:%M"),
+             lambda row: row[4] or 0),
+        ]
+    
+    @staticmethod
+    def content_columns() -> List[tuple]:
+        """Sloupce výsledků hledání v obsahu souborů"""
+        return [
+            ("Soubor", lambda row: row[1], lambda row: row[1].casefold()),
+            ("Řádek", lambda row: str(row[3]), lambda row: row[3]),
+            ("Text", lambda row: row[4], lambda row: row[4].casefold()),
+            ("Složka", lambda row: row[2], lambda row: row[2].casefold()),
+        ]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.columns[section][0]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.columns[index.column()][1](row)
+        if role == Qt.ItemDataRole.DecorationRole and index.column() == 0:
+            return self._folder_icon if row[-1] else self._file_icon
+        if role == self.PathRole:
+            return row[0]
+        return None
+
+    def path(self, index: QModelIndex) -> Optional[str]:
+        """Cesta k položce na daném indexu"""
+        return self.rows[index.row()][0] if index.isValid() else None
+
+    def append_rows(self, rows: list) -> None:
+        """Přidá dávku řádků na konec (řazení se při hledání neudržuje)"""
+        if not rows:
+            return
+        start = len(self.rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        self.rows.extend(rows)
+        self.endInsertRows()
+
+    def clear(self, columns: Optional[List[tuple]] = None) -> None:
+        """Odstraní všechny výsledky, případně změní sloupce"""
+        self.beginResetModel()
+        self.rows = []
+        if columns is not None:
+            self.columns = columns
+        self.endResetModel()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """Seřadí výsledky podle sloupce (výběr zůstane na stejných položkách)"""
+        if not 0 <= column < len(self.columns):
+            return
+        self.layoutAboutToBeChanged.emit()
+        key = self.columns[column][2]
+        order_rows = sorted(range(len(self.rows)), key=lambda i: key(self.rows[i]),
+                            reverse=order == Qt.SortOrder.DescendingOrder)
+        new_position = {old: new for new, old in enumerate(order_rows)}
+        self.rows = [self.rows[i] for i in order_rows]
+        old_indexes = self.persistentIndexList()
+        self.changePersistentIndexList(old_indexes, [
+            self.index(new_position[index.row()], index.column()) for index in old_indexes
+        ])
+        self.layoutChanged.emit()
+
+
+class TransferProgressWidget(QWidget):
+    """Průběh úloh se soubory ve stavovém řádku (pauza a zrušení)"""
+    
+    def __init__(self, engine: TransferEngine, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self._job_id = None
+        
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        
+        self.label = QLabel("")
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMaximumWidth(200)
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setTextVisible(False)
+        
+        self.pause_button = QPushButton("⏸")
+        self.pause_button.setToolTip("Pozastavit / pokračovat")
+        self.pause_button.setFixedWidth(30)
+        self.pause_button.clicked.connect(self.toggle_pause)
+        
+        self.cancel_button = QPushButton("✖")
+        self.cancel_button.setToolTip("Zrušit úlohu")
+        self.cancel_button.setFixedWidth(30)
+        self.cancel_button.clicked.connect(self.cancel_job)
+        
+        layout.addWidget(self.label)
+        layout.addWidget(self.progress_bar)
+        layout.addWidget(self.pause_button)
+        layout.addWidget(self.cancel_button)
+        self.hide()
+        
+        engine.job_queued.connect(self._on_job_queued)
+        engine.job_progress.connect(self._on_job_progress)
+        engine.job_finished.connect(self._on_job_done)
+        engine.job_failed.connect(self._on_job_done)
+    
+    def toggle_pause(self):
+        """Pozastaví nebo obnoví zobrazenou úlohu"""
+        job = self.engine.job(self._job_id) if self._job_id else None
+        if not job:
+            return
+        if job.paused:
+            job.resume()
+            self.pause_button.setText("⏸")
+        else:
+            job.pause()
+            self.pause_button.setText("▶")
+    
+    def cancel_job(self):
+        """Zruší zobrazenou úlohu"""
+        if self._job_id:
+            self.engine.cancel(self._job_id)
+    
+    def _on_job_queued(self, job_id: int, title: str):
+        """Zobrazí widget pro novou úlohu"""
+        if self._job_id is None:
+            self._job_id = job_id
+            self.label.setText(f"{title}: připravuji…")
+            self.progress_bar.setRange(0, 1000)
+            self.progress_bar.setValue(0)
+        self.show()
+    
+    def _on_job_progress(self, job_id: int, progress: TransferProgress):
+        """Aktualizuje průběh"""
+        self._job_id = job_id
+        job = self.engine.job(job_id)
+        title = job.title if job else ""
+        
+        if progress.bytes_total:
+            self.progress_bar.setRange(0, 1000)
+            self.progress_bar.setValue(int(progress.bytes_done * 1000 / progress.bytes_total))
+            text = (f"{title}: {progress.files_done}/{progress.files_total} souborů, "
+                    f"{format_size(progress.bytes_done)} / {format_size(progress.bytes_total)}")
+        else:
+            # Celkový rozsah není předem známý (např. mazání)
+            self.progress_bar.setRange(0, 0)
+            text = f"{title}: {progress.files_done} položek"
+        
+        if progress.paused:
+            text += " – pozastaveno"
+        elif progress.throughput:
+            text += f", {format_size(int(progress.throughput))}/s"
+            if progress.eta is not None:
+                text += f", zbývá {format_duration(progress.eta)}"
+        pending = len(self.engine.active_jobs()) - 1
+        if pending > 0:
+            text += f" (+{pending} ve frontě)"
+        self.label.setText(text)
+    
+    def _on_job_done(self, job_id: int, message: str):
+        """Skryje widget, pokud už nic neběží"""
+        if job_id == self._job_id:
+            self._job_id = None
+            self.pause_button.setText("⏸")
+        if not self.engine.active_jobs():
+            self.hide()
+
+
+class BatchRenameDialog(QDialog):
+    """Dialog hromadného přejmenování s živým náhledem počítaným na pozadí"""
+    
+    plan_ready = pyqtSignal(int, object)  # generace, BatchRenamePlan nebo text chyby
+    
+    CASE_LABELS = {"none": "Beze změny", "lower": "malá písmena", "upper": "VELKÁ PÍSMENA", "title": "První Velká"}
+    
+    def __init__(self, paths: List[str], parent=None):
+        from concurrent.futures import ThreadPoolExecutor
+        super().__init__(parent)
+        self.paths = sorted(paths, key=lambda path: os.path.basename(path).casefold())
+        self.plan = None
+        self._generation = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rename-preview")
+        
+        self.setWindowTitle(f"Hromadné přejmenování ({len(self.paths)} položek)")
+        self.resize(700, 500)
+        layout = QVBoxLayout(self)
+        
+        form = QFormLayout()
+        self.template_edit = QLineEdit("{name}")
+        self.template_edit.setToolTip("{name} název, {ext} přípona, {n} počítadlo, {date} datum změny")
+        self.find_edit = QLineEdit()
+        self.replace_edit = QLineEdit()
+        self.regex_check = QCheckBox("Regulární výraz")
+        self.case_combo = QComboBox()
+        for case in RenameRule.CASES:
+            self.case_combo.addItem(self.CASE_LABELS[case], case)
+        self.start_spin = QSpinBox()
+        self.start_spin.setRange(0, 1_000_000)
+        self.start_spin.setValue(1)
+        self.step_spin = QSpinBox()
+        self.step_spin.setRange(1, 1000)
+        self.digits_spin = QSpinBox()
+        self.digits_spin.setRange(1, 10)
+        self.date_edit = QLineEdit("%Y-%m-%d")
+        self.keep_ext_check = QCheckBox("Zachovat příponu")
+        self.keep_ext_check.setChecked(True)
+        
+        form.addRow("Šablona:", self.template_edit)
+        form.addRow("Najít:", self.find_edit)
+        form.addRow("Nahradit:", self.replace_edit)
+        form.addRow("", self.regex_check)
+        form.addRow("Velikost písmen:", self.case_combo)
+        form.addRow("Počítadlo od:", self.start_spin)
+        form.addRow("Krok:", self.step_spin)
+        form.addRow("Počet číslic:", self.digits_spin)
+        form.addRow("Formát data:", self.date_edit)
+        form.addRow("", self.keep_ext_check)
+        layout.addLayout(form)
+        
+        self.preview_table = QTableWidget(0, 3)
+        self.preview_table.setHorizontalHeaderLabels(["Původní název", "Nový název", "Stav"])
+        self.preview_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.preview_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.preview_table.verticalHeader().setDefaultSectionSize(20)
+        layout.addWidget(self.preview_table)
+        
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+        
+        self.buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        self.buttons.accepted.connect(self.accept)
+        self.buttons.rejected.connect(self.reject)
+        layout.addWidget(self.buttons)
+        
+        # Náhled se přepočítává s malým zpožděním po poslední změně
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(150)
+        self._preview_timer.timeout.connect(self.update_preview)
+        
+        for edit in (self.template_edit, self.find_edit, self.replace_edit, self.date_edit):
+            edit.textChanged.connect(self._preview_timer.start)
+        for check in (self.regex_check, self.keep_ext_check):
+            check.toggled.connect(self._preview_timer.start)
+        self.case_combo.currentIndexChanged.connect(self._preview_timer.start)
+        for spin in (self.start_spin, self.step_spin, self.digits_spin):
+            spin.valueChanged.connect(self._preview_timer.start)
+        self.plan_ready.connect(self._on_plan_ready)
+        
+        self.update_preview()
+    
+    def rule(self) -> RenameRule:
+        """Sestaví pravidlo z hodnot formuláře (neplatný regex vyvolá re.error)"""
+        return RenameRule(
+            template=self.template_edit.text(),
+            find=self.find_edit.text(),
+            replace=self.replace_edit.text(),
+            use_regex=self.regex_check.isChecked(),
+            case=self.case_combo.currentData(),
+            counter_start=self.start_spin.value(),
+            counter_step=self.step_spin.value(),
+            counter_digits=self.digits_spin.value(),
+            date_format=self.date_edit.text(),
+            keep_extension=self.keep_ext_check.isChecked(),
+        )
+    
+    def update_preview(self):
+        """Spustí výpočet náhledu na pozadí (starší výpočty se zahodí)"""
+        self._generation += 1
+        generation = self._generation
+        self.buttons.button(QDialogButtonBox.StandardButton.Ok).setEnabled(False)
+        self.status_label.setText("Počítám náhled…")
+        try:
+            rule = self.rule()
+        except re.error as e:
+            self.status_label.setText(f"Neplatný regulární výraz: {e}")
+            return
+        
+        def build():
+            try:
+                plan = BatchRenamePlan.build(self.paths, rule, lambda: generation != self._generation)
+            except (ValueError, re.error) as e:
+                plan = str(e)
+            self.plan_ready.emit(generation, plan)
+        
+        self._executor.submit(build)
+    
+    def _on_plan_ready(self, generation: int, plan):
+        """Zobrazí hotový náhled"""
+        if generation != self._generation:
+            return
+        if isinstance(plan, str):
+            self.plan = None
+            self.status_label.setText(f"Chyba: {plan}")
+            return
+        
+        self.plan = plan
+        self.preview_table.setUpdatesEnabled(False)
+        self.preview_table.setRowCount(len(plan.rows))
+        for row, (path, new_name, problem) in enumerate(plan.rows):
+            self.preview_table.setItem(row, 0, QTableWidgetItem(os.path.basename(path)))
+            self.preview_table.setItem(row, 1, QTableWidgetItem(new_name))
+            status_item = QTableWidgetItem(problem or ("" if new_name == os.path.basename(path) else "OK"))
+            if problem:
+                status_item.setForeground(Qt.GlobalColor.red)
+            self.preview_table.setItem(row, 2, status_item)
+        self.preview_table.setUpdatesEnabled(True)
+        
+        if plan.problems:
+            self.status_label.setText(f"Kolize nebo neplatné názvy: {plan.problems} – opravte je před přejmenováním")
+        else:
+            self.status_label.setText(f"Změní se {len(plan.pairs)} položek")
+        self.buttons.button(QDialogButtonBox.StandardButton.Ok).setEnabled(bool(plan.pairs) and not plan.problems)
+    
+    def done(self, result: int):
+        """Ukončí výpočet náhledu při zavření dialogu"""
+        self._generation += 1
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        super().done(result)
+
+
+class IndexSearchDialog(QDialog):
+    """Okamžité hledání názvů souborů v indexu indexovaných složek"""
+    
+    path_activated = pyqtSignal(str)  # Vybraný výsledek k otevření
+    
+    def __init__(self, index: FileNameIndex, parent=None):
+        super().__init__(parent)
+        self.index = index
         
-        # Seznam podporovaných obrazových formátů
-        image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.ico'}
+        self.setWindowTitle("Hledat v indexu")
+        self.resize(700, 450)
+        layout = QVBoxLayout(self)
         
-        if ext in image_extensions:
-            try:
-                # Zkus načíst obrázek
-                pixmap = QPixmap(file_path)
-                if not pixmap.isNull():
-                    # Změň velikost pro náhled
-                    scaled_pixmap = pixmap.scaled(200, 150, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                    self.preview_label.setPixmap(scaled_pixmap)
-                    self.preview_label.setText("")
-                    self.preview_frame.show()
-                    return
-            except Exception:
-                pass
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText("Část názvu nebo maska (*.pdf, foto_??.jpg)...")
+        self.query_edit.setClearButtonEnabled(True)
+        layout.addWidget(self.query_edit)
         
-        # Skryj náhled pro nepodporované formáty
-        self.preview_frame.hide()
+        self.results_list = QListWidget()
+        self.results_list.setUniformItemSizes(True)
+        self.results_list.itemActivated.connect(self._on_item_activated)
+        layout.addWidget(self.results_list)
+        
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+        
+        # Dotaz se spouští s malým zpožděním po posledním stisku klávesy
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(80)
+        self._search_timer.timeout.connect(self.run_search)
+        self.query_edit.textChanged.connect(self._search_timer.start)
+        self.query_edit.returnPressed.connect(self._activate_first)
     
-    def format_size(self, size: int) -> str:
-        """Formátuje velikost souboru do čitelné podoby"""
-        if size < 1024:
-            return f"{size} B"
-        elif size < 1024 * 1024:
-            return f"{size / 1024:.1f} KB"
-        elif size < 1024 * 1024 * 1024:
-            return f"{size / (1024 * 1024):.1f} MB"
-        elif size < 1024 * 1024 * 1024 * 1024:
-            return f"{size / (1024 * 1024 * 1024):.1f} GB"
+    def run_search(self):
+        """Vyhledá dotaz v indexu a zobrazí výsledky"""
+        query = self.query_edit.text()
+        started = time.perf_counter()
+        results = self.index.search(query)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        
+        self.results_list.setUpdatesEnabled(False)
+        self.results_list.clear()
+        folder_icon = self.style().standardIcon(QStyle.StandardPixmap.SP_DirIcon)
+        file_icon = self.style().standardIcon(QStyle.StandardPixmap.SP_FileIcon)
+        for path, name, is_dir in results:
+            item = QListWidgetItem(folder_icon if is_dir else file_icon, path)
+            item.setData(Qt.ItemDataRole.UserRole, path)
+            self.results_list.addItem(item)
+        self.results_list.setUpdatesEnabled(True)
+        
+        if not query.strip():
+            self.status_label.setText(f"Indexováno položek: {self.index.count()}")
+        elif len(results) >= FileNameIndex.DEFAULT_LIMIT:
+            self.status_label.setText(f"Prvních {len(results)} výsledků ({elapsed_ms:.0f} ms) – upřesněte dotaz")
         else:
-            return f"{size / (1024 * 1024 * 1024 * 1024):.1f} TB"
+            self.status_label.setText(f"Nalezeno: {len(results)} ({elapsed_ms:.0f} ms)")
     
-    def clear_info(self):
-        """Vymaže všechny informace"""
-        self.name_label.setText("Žádný soubor nevybrán")
-        self.type_label.setText("")
-        self.size_label.setText("")
-        self.modified_label.setText("")
-        self.created_label.setText("")
-        self.path_label.setText("")
-        self.folder_stats_frame.hide()
-        self.preview_frame.hide()
+    def showEvent(self, event):
+        """Po otevření vybere dotaz a obnoví výsledky (index se mezitím mohl změnit)"""
+        super().showEvent(event)
+        self.query_edit.setFocus()
+        self.query_edit.selectAll()
+        self.run_search()
     
-    def update_selection(self, selected_paths: List[str]):
-        """Aktualizuje panel na základě výběru více položek"""
-        if not selected_paths:
-            self.clear_info()
-            return
-        
-        if len(selected_paths) == 1:
-            # Jedna vybraná položka
-            self.update_info(selected_paths[0])
-        else:
-            # Více vybraných položek
-            self.show_multiple_selection_info(selected_paths)
+    def _activate_first(self):
+        item = self.results_list.currentItem() or self.results_list.item(0)
+        if item:
+            self._on_item_activated(item)
+    
+    def _on_item_activated(self, item: QListWidgetItem):
+        self.path_activated.emit(item.data(Qt.ItemDataRole.UserRole))
+
+
+class DuplicatesDialog(QDialog):
+    """Skupiny duplicitních souborů ve složce, přibývají během hledání
+
+    Označené soubory jde smazat nebo nahradit pevným odkazem či reflinkem
+    na neoznačený soubor skupiny. V každé skupině musí aspoň jeden soubor
+    zůstat neoznačený. Soubory rozpracované úlohy jsou zašedlé a ze
+    seznamu zmizí, až je úloha opravdu zpracuje.
+    """
+    
+    path_activated = pyqtSignal(str)            # Soubor k zobrazení v záložce
     
-    def show_multiple_selection_info(self, paths: List[str]):
-        """Zobrazí informace o více vybraných položkách"""
-        files_count = 0
-        folders_count = 0
-        total_size = 0
+    PathRole = Qt.ItemDataRole.UserRole
+    SizeRole = Qt.ItemDataRole.UserRole + 1
+    
+    def __init__(self, finder: DuplicateFinder, file_operations: FileOperations, root: str, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.finder = finder
+        self.file_operations = file_operations
+        self.root = root
+        self._jobs = {}  # job_id -> DeduplicateJob zařazený z dialogu
         
-        for path in paths:
-            if os.path.isfile(path):
-                files_count += 1
-                try:
-                    total_size += os.path.getsize(path)
-                except (OSError, PermissionError):
-                    pass
-            elif os.path.isdir(path):
-                folders_count += 1
+        self.setWindowTitle(f"Duplicity – {root}")
+        self.resize(850, 500)
+        layout = QVBoxLayout(self)
         
-        self.name_label.setText(f"Vybráno {len(paths)} položek")
-        self.type_label.setText("Více položek")
-        self.size_label.setText(self.format_size(total_size))
-        self.modified_label.setText("")
-        self.created_label.setText("")
-        self.path_label.setText(f"Soubory: {files_count}, Složky: {folders_count}")
+        self.status_label = QLabel("Hledám…")
+        layout.addWidget(self.status_label)
         
-        self.folder_stats_frame.hide()
-        self.preview_frame.hide()
+        self.model = QStandardItemModel(0, 2, self)
+        self.model.setHorizontalHeaderLabels(["Soubor", "Složka"])
+        self.tree = QTreeView()
+        self.tree.setModel(self.model)
+        self.tree.setUniformRowHeights(True)
+        self.tree.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Interactive)
+        self.tree.header().resizeSection(0, 320)
+        self.tree.doubleClicked.connect(self._on_double_clicked)
+        layout.addWidget(self.tree)
+        
+        buttons = QHBoxLayout()
+        mark_button = QPushButton("Označit kopie")
+        mark_button.setToolTip("V každé skupině označí všechny soubory kromě prvního")
+        mark_button.clicked.connect(self.mark_copies)
+        buttons.addWidget(mark_button)
+        unmark_button = QPushButton("Zrušit označení")
+        unmark_button.clicked.connect(lambda: self._set_all_checked(False))
+        buttons.addWidget(unmark_button)
+        buttons.addStretch()
+        delete_button = QPushButton("Smazat označené")
+        delete_button.clicked.connect(self.delete_checked)
+        buttons.addWidget(delete_button)
+        hardlink_button = QPushButton("Nahradit pevným odkazem")
+        hardlink_button.clicked.connect(lambda: self.link_checked(DeduplicateJob.HARDLINK))
+        buttons.addWidget(hardlink_button)
+        reflink_button = QPushButton("Nahradit reflinkem")
+        reflink_button.setToolTip("Sdílení bloků na Btrfs/XFS - soubory zůstanou nezávislé")
+        reflink_button.setEnabled(fcntl is not None and sys.platform.startswith('linux'))
+        reflink_button.clicked.connect(lambda: self.link_checked(DeduplicateJob.REFLINK))
+        buttons.addWidget(reflink_button)
+        self.stop_button = QPushButton("Zastavit")
+        self.stop_button.clicked.connect(lambda: self.finder.cancel(self.job_id))
+        buttons.addWidget(self.stop_button)
+        layout.addLayout(buttons)
+        
+        finder.groups_found.connect(self._on_groups_found)
+        finder.progress.connect(self._on_progress)
+        finder.search_finished.connect(self._on_finished)
+        file_operations.transfer_engine.job_finished.connect(self._on_job_done)
+        file_operations.transfer_engine.job_failed.connect(self._on_job_done)
+        self.job_id = finder.find(root)
+    
+    def done(self, result):
+        """Zavření dialogu zruší běžící hledání"""
+        self.finder.cancel(self.job_id)
+        super().done(result)
+    
+    def _on_groups_found(self, job_id: int, groups: list):
+        if job_id != self.job_id:
+            return
+        folder_icon = self.style().standardIcon(QStyle.StandardPixmap.SP_DirIcon)
+        file_icon = self.style().standardIcon(QStyle.StandardPixmap.SP_FileIcon)
+        for size, paths in groups:
+            group = QStandardItem(folder_icon, "")
+            group.setData(size, self.SizeRole)
+            for path in sorted(paths):
+                item = QStandardItem(file_icon, os.path.basename(path))
+                item.setData(path, self.PathRole)
+                item.setCheckable(True)
+                group.appendRow([item, QStandardItem(os.path.dirname(path))])
+            self._update_group_title(group)
+            self.model.appendRow([group, QStandardItem()])
+        self.tree.expandAll()
+    
+    def _on_progress(self, job_id: int, text: str):
+        if job_id == self.job_id:
+            self.status_label.setText(f"{text} – nalezeno skupin: {self.model.rowCount()}")
+    
+    def _on_finished(self, job_id: int, groups: int, cancelled: bool, note: str):
+        if job_id != self.job_id:
+            return
+        self.stop_button.setEnabled(False)
+        state = "Hledání zastaveno" if cancelled else "Hotovo"
+        self.status_label.setText(f"{state}: skupin duplicit {groups}" + (f" ({note})" if note else ""))
+    
+    def _update_group_title(self, group: QStandardItem):
+        size = group.data(self.SizeRole)
+        count = group.rowCount()
+        group.setText(f"{count} × {format_size(size)} (uvolnitelné {format_size(size * (count - 1))})")
+    
+    def _on_double_clicked(self, index: QModelIndex):
+        path = index.siblingAtColumn(0).data(self.PathRole)
+        if path:
+            self.path_activated.emit(path)
+    
+    def _groups(self):
+        for row in range(self.model.rowCount()):
+            yield self.model.item(row)
+    
+    def _set_all_checked(self, checked: bool):
+        state = Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked
+        for group in self._groups():
+            for row in range(group.rowCount()):
+                group.child(row).setCheckState(state)
+    
+    def mark_copies(self):
+        """Označí v každé skupině všechny soubory kromě prvního"""
+        for group in self._groups():
+            for row in range(group.rowCount()):
+                group.child(row).setCheckState(Qt.CheckState.Checked if row else Qt.CheckState.Unchecked)
+    
+    def _checked_pairs(self) -> Optional[tuple]:
+        """Dvojice (označený soubor, první neoznačený soubor skupiny) a jejich velikost
+
+        Vrací None, pokud je některá skupina označená celá.
+        """
+        pairs = []
+        size = 0
+        for group in self._groups():
+            # Soubory rozpracovaných úloh se nepoužijí ani jako ponechané
+            children = [group.child(row) for row in range(group.rowCount()) if group.child(row).isEnabled()]
+            checked = [item for item in children if item.checkState() == Qt.CheckState.Checked]
+            if not checked:
+                continue
+            if len(checked) == len(children):
+                QMessageBox.warning(self, "Duplicity", "V každé skupině musí aspoň jeden soubor zůstat neoznačený.")
+                self.tree.scrollTo(group.index())
+                return None
+            keep = next(item for item in children if item.checkState() != Qt.CheckState.Checked)
+            pairs.extend((item.data(self.PathRole), keep.data(self.PathRole)) for item in checked)
+            size += group.data(self.SizeRole) * len(checked)
+        return pairs, size
+    
+    def _submit(self, job: DeduplicateJob):
+        """Zařadí úlohu a zašedí její soubory do jejího dokončení"""
+        paths = {duplicate for duplicate, _ in job.pairs}
+        for group in self._groups():
+            for row in range(group.rowCount()):
+                item = group.child(row)
+                if item.data(self.PathRole) in paths:
+                    item.setEnabled(False)
+        self._jobs[self.file_operations.deduplicate(job)] = job
+    
+    def _on_job_done(self, job_id: int, message: str):
+        """Odebere zpracované soubory, neúspěšné zase zpřístupní; skupiny s jediným souborem zmizí"""
+        job = self._jobs.pop(job_id, None)
+        if job is None:
+            return
+        processed = set(job.processed)
+        pending = {duplicate for other in self._jobs.values() for duplicate, _ in other.pairs}
+        for row in reversed(range(self.model.rowCount())):
+            group = self.model.item(row)
+            for child_row in reversed(range(group.rowCount())):
+                item = group.child(child_row)
+                path = item.data(self.PathRole)
+                if path in processed:
+                    group.removeRow(child_row)
+                elif path not in pending:
+                    item.setEnabled(True)
+            if group.rowCount() < 2:
+                self.model.removeRow(row)
+            else:
+                self._update_group_title(group)
+    
+    def delete_checked(self):
+        """Po potvrzení smaže označené soubory"""
+        checked = self._checked_pairs()
+        if not checked or not checked[0]:
+            return
+        pairs, size = checked
+        reply = QMessageBox.question(
+            self, "Potvrdit smazání",
+            f"Opravdu chcete smazat {len(pairs)} duplicitních souborů ({format_size(size)})?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            self._submit(DeduplicateJob(pairs, DeduplicateJob.DELETE))
+    
+    def link_checked(self, mode: str):
+        """Nahradí označené soubory odkazem na neoznačený soubor své skupiny"""
+        checked = self._checked_pairs()
+        if not checked or not checked[0]:
+            return
+        pairs, size = checked
+        kind = "pevným odkazem" if mode == DeduplicateJob.HARDLINK else "reflinkem"
+        reply = QMessageBox.question(
+            self, "Nahradit duplicity",
+            f"Nahradit {len(pairs)} označených souborů ({format_size(size)}) {kind} na ponechaný soubor skupiny?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            self._submit(DeduplicateJob(pairs, mode))
 
 
-class NavigationHistory:
-    """Třída pro správu historie navigace"""
+def squarify(values: list, x: float, y: float, width: float, height: float) -> List[QRectF]:
+    """Rozloží sestupně seřazené kladné hodnoty do obdélníků (squarified treemap)
+
+    Položky se skládají do řad podél kratší strany, dokud se poměr stran
+    nejhoršího obdélníku řady nezhorší. Vrací obdélníky ve stejném pořadí.
+    """
+    total = sum(values)
+    if total <= 0 or width <= 0 or height <= 0:
+        return []
+    scale = width * height / total
+    rects = []
+    start = 0
+    count = len(values)
+    while start < count:
+        side = min(width, height)
+        row_sum = row_max = row_min = values[start] * scale
+        worst = max(side * side * row_max / (row_sum * row_sum), row_sum * row_sum / (side * side * row_min))
+        end = start + 1
+        while end < count:
+            area = values[end] * scale
+            new_sum = row_sum + area
+            new_worst = max(side * side * max(row_max, area) / (new_sum * new_sum),
+                            new_sum * new_sum / (side * side * min(row_min, area)))
+            if new_worst > worst:
+                break
+            row_sum, worst = new_sum, new_worst
+            row_max, row_min = max(row_max, area), min(row_min, area)
+            end += 1
+        
+        # Řada podél kratší strany zabere pruh šířky row_sum / side
+        thickness = row_sum / side
+        offset = 0.0
+        for value in values[start:end]:
+            length = value * scale / thickness
+            if width >= height:
+                rects.append(QRectF(x, y + offset, thickness, length))
+            else:
+                rects.append(QRectF(x + offset, y, length, thickness))
+            offset += length
+        if width >= height:
+            x += thickness
+            width -= thickness
+        else:
+            y += thickness
+            height -= thickness
+        start = end
+    return rects
+
+
+class DiskUsageTreemap(QWidget):
+    """Treemap využití disku - plocha obdélníku odpovídá obsazenému místu
+
+    Kreslí se podsložky a největší soubory aktuální složky, velké složky
+    obsahují vnořeně i svůj obsah (do hloubky MAX_DEPTH). Klepnutí na
+    složku do ní vstoupí, pravé tlačítko nebo Backspace vrátí o úroveň
+    výš, dvojklik na soubor ho zobrazí v záložce.
+    """
     
-    def __init__(self):
-        self.history: List[str] = []
-        self.current_index: int = -1
+    node_changed = pyqtSignal(object)   # DiskUsageNode zobrazené složky
+    path_activated = pyqtSignal(str)    # Soubor k zobrazení v záložce
     
-    def add_path(self, path: str) -> None:
-        """Přidá cestu do historie"""
-        # Odstraní všechny cesty za aktuální pozicí
-        self.history = self.history[:self.current_index + 1]
-        self.history.append(path)
-        self.current_index = len(self.history) - 1
+    MAX_DEPTH = 3           # Počet vnořených úrovní
+    MAX_ITEMS = 300         # Položek na úroveň, zbytek tvoří jeden obdélník
+    MIN_NESTED = 40         # Minimální strana složky s vnořeným obsahem
+    HEADER_HEIGHT = 16      # Pruh s názvem vnořené složky
     
-    def can_go_back(self) -> bool:
-        """Kontroluje, zda je možné jít zpět"""
-        return self.current_index > 0
+    DIRECTORY, FILE, REST = range(3)
     
-    def can_go_forward(self) -> bool:
-        """Kontroluje, zda je možné jít vpřed"""
-        return self.current_index < len(self.history) - 1
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMouseTracking(True)
+        self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self.setMinimumSize(200, 150)
+        self._root = None
+        self._node = None
+        self._items = []        # (QRectF, hloubka, druh, data, složka, barva) v pořadí kreslení
+        self._layout_dirty = True
+        self._hovered = None
     
-    def go_back(self) -> Optional[str]:
-        """Vrací předchozí cestu"""
-        if self.can_go_back():
-            self.current_index -= 1
-            return self.history[self.current_index]
-        return None
+    def root_node(self) -> Optional[DiskUsageNode]:
+        return self._root
     
-    def go_forward(self) -> Optional[str]:
-        """Vrací následující cestu"""
-        if self.can_go_forward():
-            self.current_index += 1
-            return self.history[self.current_index]
+    def current_node(self) -> Optional[DiskUsageNode]:
+        return self._node
+    
+    def set_root(self, root: Optional[DiskUsageNode]) -> None:
+        """Nastaví strom; zobrazená podsložka se zachová, pokud v novém stromu existuje"""
+        if root is not self._root:
+            current = self._node.path if self._node is not None else None
+            self._root = root
+            node = root.find(current) if root is not None and current else None
+            self._set_node(node or root)
+        else:
+            self.refresh()
+    
+    def refresh(self) -> None:
+        """Překreslí mapu s aktuálními součty stromu"""
+        self._layout_dirty = True
+        self.update()
+    
+    def drill_into(self, node: DiskUsageNode) -> None:
+        self._set_node(node)
+    
+    def go_up(self) -> None:
+        """Vrátí se o úroveň výš (nejvýš na kořen skenu)"""
+        if self._node is not None and self._node is not self._root and self._node.parent is not None:
+            self._set_node(self._node.parent)
+    
+    def _set_node(self, node: Optional[DiskUsageNode]) -> None:
+        self._node = node
+        self._hovered = None
+        self.node_changed.emit(node)
+        self.refresh()
+    
+    def _entries(self, node: DiskUsageNode) -> list:
+        """Položky složky (obsazeno, druh, data) sestupně podle obsazeného místa"""
+        entries = [(child.allocated, self.DIRECTORY, child) for child in list(node.children.values())
+                   if child.allocated > 0]
+        shown_files = 0
+        for allocated, name, size in node.files:
+            if allocated > 0:
+                entries.append((allocated, self.FILE, (name, size, allocated)))
+                shown_files += allocated
+        rest = node.direct_allocated - shown_files
+        entries.sort(key=lambda entry: entry[0], reverse=True)
+        if len(entries) > self.MAX_ITEMS:
+            rest += sum(entry[0] for entry in entries[self.MAX_ITEMS:])
+            del entries[self.MAX_ITEMS:]
+        if rest > 0:
+            entries.append((rest, self.REST, None))
+            entries.sort(key=lambda entry: entry[0], reverse=True)
+        return entries
+    
+    def _layout(self) -> None:
+        self._items = []
+        self._layout_dirty = False
+        if self._node is None:
+            return
+        self._layout_node(self._node, QRectF(self.rect()).adjusted(1, 1, -1, -1), 0, None)
+    
+    def _layout_node(self, node: DiskUsageNode, rect: QRectF, depth: int, hue: Optional[int]) -> None:
+        entries = self._entries(node)
+        rects = squarify([entry[0] for entry in entries], rect.x(), rect.y(), rect.width(), rect.height())
+        for index, ((allocated, kind, data), item_rect) in enumerate(zip(entries, rects)):
+            if item_rect.width() < 2 or item_rect.height() < 2:
+                continue
+            # Každá složka nejvyšší úrovně má vlastní odstín, obsah ho dědí
+            item_hue = int(index * 137.5) % 360 if hue is None else hue
+            if kind == self.REST:
+                color = QColor(170, 170, 170)
+            elif kind == self.FILE:
+                color = QColor.fromHsv(item_hue, 60, 235 - min(depth, 3) * 10)
+            else:
+                color = QColor.fromHsv(item_hue, 150, 220 - min(depth, 3) * 25)
+            self._items.append((item_rect, depth, kind, data, node, color))
+            if (kind == self.DIRECTORY and depth + 1 < self.MAX_DEPTH
+                    and item_rect.width() >= self.MIN_NESTED and item_rect.height() >= self.MIN_NESTED):
+                inner = item_rect.adjusted(2, self.HEADER_HEIGHT, -2, -2)
+                self._layout_node(data, inner, depth + 1, item_hue)
+    
+    def _item_at(self, pos):
+        """Nejhlubší položka pod kurzorem"""
+        for item in reversed(self._items):
+            if item[0].contains(QPointF(pos)):
+                return item
         return None
+    
+    def _item_text(self, item) -> tuple:
+        """Název a popis položky pro popisek a tooltip"""
+        rect, depth, kind, data, folder, color = item
+        if kind == self.DIRECTORY:
+            detail = (f"Obsazeno: {format_size(data.allocated)}\nVelikost: {format_size(data.size)}\n"
+                      f"Souborů: {data.total_files}, složek: {data.total_folders}")
+            return data.name, data.path, detail
+        if kind == self.FILE:
+            name, size, allocated = data
+            return name, os.path.join(folder.path, name), f"Obsazeno: {format_size(allocated)}\nVelikost: {format_size(size)}"
+        shown = len(folder.files)
+        hidden = max(0, folder.file_count - shown)
+        return "Ostatní", folder.path, f"Další položky ({hidden} souborů)"
+    
+    def paintEvent(self, event):
+        if self._layout_dirty:
+            self._layout()
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.palette().color(self.backgroundRole()))
+        if not self._items:
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter,
+                             "Skenuji…" if self._node is not None else "Žádná data")
+            return
+        metrics = painter.fontMetrics()
+        border = QPen(QColor(60, 60, 60))
+        for item in self._items:
+            rect, depth, kind, data, folder, color = item
+            painter.fillRect(rect, color.lighter(115) if item is self._hovered else color)
+            painter.setPen(border)
+            painter.drawRect(rect)
+            if rect.width() < 30 or rect.height() < metrics.height():
+                continue
+            name, path, detail = self._item_text(item)
+            label = name
+            if kind == self.DIRECTORY:
+                label = f"{name}  {format_size(data.allocated)}"
+            elif kind == self.FILE:
+                label = f"{name}  {format_size(data[2])}"
+            painter.setPen(QColor(20, 20, 20))
+            text_rect = rect.adjusted(3, 1, -3, -1)
+            painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop,
+                             metrics.elidedText(label, Qt.TextElideMode.ElideRight, int(text_rect.width())))
+    
+    def resizeEvent(self, event):
+        self._layout_dirty = True
+        super().resizeEvent(event)
+    
+    def mouseMoveEvent(self, event):
+        item = self._item_at(event.position())
+        if item is not self._hovered:
+            self._hovered = item
+            self.update()
+            if item is None:
+                QToolTip.hideText()
+            else:
+                name, path, detail = self._item_text(item)
+                QToolTip.showText(event.globalPosition().toPoint(), f"{path}\n{detail}", self)
+        super().mouseMoveEvent(event)
+    
+    def leaveEvent(self, event):
+        self._hovered = None
+        self.update()
+        super().leaveEvent(event)
+    
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.RightButton:
+            self.go_up()
+            return
+        if event.button() == Qt.MouseButton.LeftButton:
+            item = self._item_at(event.position())
+            # Vstoupí se do nejhlubší složky pod kurzorem, u souboru do jeho složky
+            if item is not None:
+                target = item[3] if item[2] == self.DIRECTORY else item[4]
+                if target is not self._node:
+                    self.drill_into(target)
+            return
+        super().mousePressEvent(event)
+    
+    def mouseDoubleClickEvent(self, event):
+        item = self._item_at(event.position())
+        if item is not None and item[2] == self.FILE:
+            self.path_activated.emit(os.path.join(item[4].path, item[3][0]))
+            return
+        super().mouseDoubleClickEvent(event)
+    
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key.Key_Backspace:
+            self.go_up()
+            return
+        super().keyPressEvent(event)
 
 
-class FileOperations(QObject):
-    """Třída pro operace se soubory a složkami"""
+class DiskUsageView(QWidget):
+    """Režim záložky s využitím disku - souhrn, drobečková cesta a treemap"""
     
-    operation_completed = pyqtSignal(str)  # Signál po dokončení operace
-    operation_failed = pyqtSignal(str)     # Signál při chybě
+    close_requested = pyqtSignal()
+    rescan_requested = pyqtSignal()
+    path_activated = pyqtSignal(str)    # Soubor k zobrazení v záložce
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        
+        top = QHBoxLayout()
+        self.up_button = QPushButton("⬆ O úroveň výš")
+        top.addWidget(self.up_button)
+        self.path_label = QLabel()
+        self.path_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        top.addWidget(self.path_label, 1)
+        rescan_button = QPushButton("🔄 Znovu")
+        rescan_button.clicked.connect(self.rescan_requested)
+        top.addWidget(rescan_button)
+        close_button = QPushButton("✕ Zavřít")
+        close_button.clicked.connect(self.close_requested)
+        top.addWidget(close_button)
+        layout.addLayout(top)
+        
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+        
+        self.treemap = DiskUsageTreemap()
+        self.treemap.node_changed.connect(self._on_node_changed)
+        self.up_button.clicked.connect(self.treemap.go_up)
+        self.treemap.path_activated.connect(self.path_activated)
+        layout.addWidget(self.treemap, 1)
+        self._state = ""
     
-    def create_folder(self, parent_path: str, folder_name: str) -> bool:
-        """Vytvoří novou složku"""
-        try:
-            new_path = os.path.join(parent_path, folder_name)
-            os.makedirs(new_path, exist_ok=False)
-            self.operation_completed.emit(f"Složka '{folder_name}' byla vytvořena")
-            return True
-        except FileExistsError:
-            self.operation_failed.emit(f"Složka '{folder_name}' již existuje")
-        except Exception as e:
-            self.operation_failed.emit(f"Chyba při vytváření složky: {str(e)}")
-        return False
+    def set_result(self, root: Optional[DiskUsageNode], state: str) -> None:
+        """Zobrazí (průběžný) strom skenu; state popisuje stav skenu"""
+        self._state = state
+        self.treemap.set_root(root)
+        self._update_summary()
     
-    def delete_item(self, path: str) -> bool:
-        """Smaže soubor nebo složku"""
-        try:
-            if os.path.isfile(path):
-                os.remove(path)
-                self.operation_completed.emit(f"Soubor byl smazán")
-            elif os.path.isdir(path):
-                shutil.rmtree(path)
-                self.operation_completed.emit(f"Složka byla smazána")
-            return True
-        except Exception as e:
-            self.operation_failed.emit(f"Chyba při mazání: {str(e)}")
-        return False
+    def _on_node_changed(self, node):
+        self.path_label.setText(node.path if node is not None else "")
+        self.up_button.setEnabled(node is not None and node is not self.treemap.root_node())
+        self._update_summary()
     
-    def rename_item(self, old_path: str, new_name: str) -> bool:
-        """Přejmenuje soubor nebo složku"""
+    def _update_summary(self):
+        node = self.treemap.current_node()
+        if node is None:
+            self.summary_label.setText(self._state)
+            return
+        text = (f"Obsazeno na disku: {format_size(node.allocated)} · velikost: {format_size(node.size)} · "
+                f"souborů: {node.total_files} · složek: {node.total_folders}")
+        if node.errors:
+            text += f" · nepřístupné: {node.errors}"
+        if self._state:
+            text += f" – {self._state}"
+        self.summary_label.setText(text)
+
+
+class FolderSearchBar(QWidget):
+    """Panel hledání ve složce záložky (zobrazuje se nad výsledky)"""
+    
+    search_requested = pyqtSignal(object)  # SearchCriteria
+    stop_requested = pyqtSignal()
+    close_requested = pyqtSignal()
+    
+    KIND_LABELS = {"all": "Vše", "files": "Soubory", "dirs": "Složky"}
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        layout.setSpacing(2)
+        
+        first_row = QHBoxLayout()
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItem("Názvy", "names")
+        self.mode_combo.addItem("Obsah souborů", "content")
+        self.pattern_edit = QLineEdit()
+        self.pattern_edit.setClearButtonEnabled(True)
+        self.pattern_edit.returnPressed.connect(self.request_search)
+        self.regex_check = QCheckBox("Regulární výraz")
+        self.case_check = QCheckBox("Rozlišovat velikost")
+        self.kind_combo = QComboBox()
+        for kind in SearchCriteria.KINDS:
+            self.kind_combo.addItem(self.KIND_LABELS[kind], kind)
+        self.search_button = QPushButton("🔍 Hledat")
+        self.search_button.clicked.connect(self.request_search)
+        self.stop_button = QPushButton("⏹ Zastavit")
+        self.stop_button.setEnabled(False)
+        self.stop_button.clicked.connect(self.stop_requested)
+        close_button = QPushButton("✖")
+        close_button.setToolTip("Zavřít hledání a vrátit se do složky")
+        close_button.setFixedWidth(28)
+        close_button.clicked.connect(self.close_requested)
+        first_row.addWidget(QLabel("Hledat:"))
+        first_row.addWidget(self.mode_combo)
+        first_row.addWidget(self.pattern_edit, 1)
+        first_row.addWidget(self.regex_check)
+        first_row.addWidget(self.case_check)
+        first_row.addWidget(self.kind_combo)
+        first_row.addWidget(self.search_button)
+        first_row.addWidget(self.stop_button)
+        first_row.addWidget(close_button)
+        layout.addLayout(first_row)
+        
+        second_row = QHBoxLayout()
+        self.min_size_spin = QSpinBox()
+        self.max_size_spin = QSpinBox()
+        for spin in (self.min_size_spin, self.max_size_spin):
+            spin.setRange(0, 2_000_000_000)
+            spin.setSuffix(" KB")
+            spin.setSpecialValueText("libovolná")
+        self.after_check = QCheckBox("Změněno od")
+        self.after_edit = QDateEdit(QDate.currentDate().addMonths(-1))
+        self.before_check = QCheckBox("do")
+        self.before_edit = QDateEdit(QDate.currentDate())
+        for edit in (self.after_edit, self.before_edit):
+            edit.setCalendarPopup(True)
+            edit.setDisplayFormat("dd.MM.yyyy")
+        self.after_check.toggled.connect(self.after_edit.setEnabled)
+        self.before_check.toggled.connect(self.before_edit.setEnabled)
+        self.after_edit.setEnabled(False)
+        self.before_edit.setEnabled(False)
+        self.mask_edit = QLineEdit()
+        self.mask_edit.setPlaceholderText("všechny soubory (např. *.log;*.conf)")
+        self.max_file_spin = QSpinBox()
+        self.max_file_spin.setRange(1, 100_000)
+        self.max_file_spin.setValue(ContentQuery.DEFAULT_MAX_FILE_SIZE // (1024 * 1024))
+        self.max_file_spin.setSuffix(" MB")
+        self.status_label = QLabel("")
+        
+        # Prvky řádku podle režimu: (popisek, widget) pro názvy a pro obsah
+        self._name_widgets = [self.kind_combo, self.min_size_spin, self.max_size_spin, self.after_check,
+                              self.after_edit, self.before_check, self.before_edit]
+        self._content_widgets = [self.case_check, self.mask_edit, self.max_file_spin]
+        for label, widget in (("Velikost od:", self.min_size_spin), ("do:", self.max_size_spin),
+                              (None, self.after_check), (None, self.after_edit),
+                              (None, self.before_check), (None, self.before_edit),
+                              ("Soubory:", self.mask_edit), ("Nejvýše:", self.max_file_spin)):
+            if label:
+                label_widget = QLabel(label)
+                second_row.addWidget(label_widget)
+                (self._content_widgets if widget in self._content_widgets else self._name_widgets).append(label_widget)
+            second_row.addWidget(widget, 1 if widget is self.mask_edit else 0)
+        second_row.addWidget(self.status_label, 1)
+        layout.addLayout(second_row)
+        
+        self.mode_combo.currentIndexChanged.connect(self._update_mode)
+        self._update_mode()
+    
+    def content_mode(self) -> bool:
+        """Zda se hledá v obsahu souborů místo v názvech"""
+        return self.mode_combo.currentData() == "content"
+    
+    def _update_mode(self):
+        """Zobrazí jen prvky platné pro zvolený režim hledání"""
+        content = self.content_mode()
+        for widget in self._name_widgets:
+            widget.setVisible(not content)
+        for widget in self._content_widgets:
+            widget.setVisible(content)
+        self.pattern_edit.setPlaceholderText(
+            "Hledaný text nebo regulární výraz..." if content
+            else "Část názvu nebo maska (*.log, foto_??.jpg)..."
+        )
+    
+    def criteria(self):
+        """Sestaví SearchCriteria nebo ContentQuery z formuláře (neplatný regex vyvolá re.error)"""
+        if self.content_mode():
+            return ContentQuery(
+                text=self.pattern_edit.text(),
+                use_regex=self.regex_check.isChecked(),
+                case_sensitive=self.case_check.isChecked(),
+                file_mask=self.mask_edit.text(),
+                max_file_size=self.max_file_spin.value() * 1024 * 1024,
+            )
+        return SearchCriteria(
+            pattern=self.pattern_edit.text().strip(),
+            use_regex=self.regex_check.isChecked(),
+            kind=self.kind_combo.currentData(),
+            min_size=self.min_size_spin.value() * 1024 or None,
+            max_size=self.max_size_spin.value() * 1024 or None,
+            modified_after=self.after_edit.date().startOfDay().toSecsSinceEpoch()
+            if self.after_check.isChecked() else None,
+            modified_before=self.before_edit.date().endOfDay().toSecsSinceEpoch()
+            if self.before_check.isChecked() else None,
+        )
+    
+    def request_search(self):
+        """Ověří formulář a požádá o spuštění hledání"""
         try:
-            parent_dir = os.path.dirname(old_path)
-            new_path = os.path.join(parent_dir, new_name)
-            os.rename(old_path, new_path)
-            self.operation_completed.emit(f"Položka byla přejmenována na '{new_name}'")
-            return True
-        except Exception as e:
-            self.operation_failed.emit(f"Chyba při přejmenování: {str(e)}")
-        return False
+            criteria = self.criteria()
+        except re.error as e:
+            self.status_label.setText(f"Neplatný regulární výraz: {e}")
+            return
+        except ValueError as e:
+            self.status_label.setText(str(e))
+            return
+        self.search_requested.emit(criteria)
+    
+    def set_running(self, running: bool):
+        """Přepne tlačítka podle toho, zda hledání běží"""
+        self.search_button.setEnabled(not running)
+        self.stop_button.setEnabled(running)
+    
+    def set_status(self, text: str):
+        self.status_label.setText(text)
+    
+    def focus_pattern(self):
+        self.pattern_edit.setFocus()
+        self.pattern_edit.selectAll()
 
 
 class FileBrowserMainWindow(QMainWindow):
     """Hlavní okno file browseru"""
     
-    def __init__(self):
+    TAB_HIBERNATE_AFTER = 120  # Sekundy na pozadí, po kterých se záložka uspí
+    # Widgety záložky, které se při uspání uvolní (zbytek tab_data je trvalý stav)
+    TAB_WIDGET_KEYS = (
+        'tree_view', 'table_view', 'list_view', 'icon_view', 'view_container', 'view_layout',
+        'splitter', 'info_panel', 'right_panel', 'middle_toolbar', 'back_action', 'forward_action',
+        'up_action', 'middle_widget', 'search_bar', 'results_view', 'results_model',
+        'filter_edit', 'filter_model', 'large_model', 'directory_snapshot', 'disk_usage_view'
+    )
+    
+    def __init__(self, startup_profile: Optional[StartupProfile] = None):
         super().__init__()
+        self.startup_profile = startup_profile
+        self._startup_pending = True  # První záložka se staví až po prvním vykreslení okna
         self.current_path = QDir.homePath()
         self.navigation_history = NavigationHistory()
         self.file_operations = FileOperations(self)
+        self.folder_size_cache = self.open_folder_size_cache()
+        self.folder_scanner = FolderSizeScanner(self, cache=self.folder_size_cache)  # Sdílený výpočet velikostí složek
+        self.preview_service = PreviewService(self, thumbnail_store=ThumbnailStore())  # Sdílené dekódování náhledů
+        self.preview_service.thumbnails_pruned.connect(
+            lambda count: self.status_bar.showMessage(f"Smazáno zastaralých náhledů: {count}", 5000)
+        )
+        self.name_index = self.open_name_index()
+        self.file_indexer = FileIndexer(self.name_index, self.index_roots(), self) if self.name_index else None
+        self.index_search_dialog = None
+        self.folder_searcher = FolderSearcher(self)  # Hledání ve složkách mimo index
+        self.folder_searcher.results_found.connect(self._on_search_results)
+        self.folder_searcher.search_finished.connect(self._on_search_finished)
+        self.duplicate_finder = DuplicateFinder(self.folder_searcher.process_pool, parent=self)
+        self.disk_usage_scanner = DiskUsageScanner(self)  # Režim záložky s využitím disku
+        self.disk_usage_scanner.scan_progress.connect(self._on_disk_usage_progress)
+        self.disk_usage_scanner.scan_finished.connect(self._on_disk_usage_finished)
+        # Souhrn výběru se přepočítává z přírůstků, panel a stavový řádek nejvýš jednou za snímek
+        self.selection_stat_service = SelectionStatService(self)
+        self.selection_stat_service.stats_ready.connect(self._on_selection_stats)
+        self.selection_update_timer = QTimer(self)
+        self.selection_update_timer.setSingleShot(True)
+        self.selection_update_timer.setInterval(16)
+        self.selection_update_timer.timeout.connect(self.flush_selection_updates)
+        self._selection_dirty_pages = set()
+        # Změny v otevřených složkách se hned promítají do indexu názvů
+        self.directory_watcher = QFileSystemWatcher(self)
         self.current_view_mode = ViewMode.DETAILS  # Výchozí režim zobrazení
         self.tab_data = {}  # Slovník pro ukládání dat záložek
+        self._active_tab_page = None  # Stránka naposledy aktivní záložky
+        self._cut_paths = set()  # Položky ve schránce označené k přesunu
         self._version_info_cache = None  # Cache pro informace o verzi
         
         # Nastavení oken
         self.setWindowTitle("FlexiFiles - Profesionální správce souborů")
         self.setGeometry(100, 100, 1200, 800)
         
-        # Nastavení ikony aplikace
-        self.set_application_icon()
-        
-        # Vytvoření file system modelu
-        self.file_model = QFileSystemModel()
-        self.file_model.setRootPath(QDir.rootPath())
+        # Vytvoření file system modelu - správce ho obnovuje, když mezipaměť přeroste limit
+        settings = QSettings("FlexiFiles", "FlexiFiles")
+        self.model_manager = FileSystemModelManager(
+            int(settings.value("model/max_directories", FileSystemModelManager.DEFAULT_MAX_DIRECTORIES)),
+            int(settings.value("model/max_nodes", FileSystemModelManager.DEFAULT_MAX_NODES)),
+            self
+        )
+        self.model_manager.model_replaced.connect(self._on_file_model_replaced)
+        self.file_model = self.model_manager.model
+        # Složky pod kurzorem, označené a sousední v historii se načítají předem
+        self.prefetcher = DirectoryPrefetcher(
+            int(settings.value("prefetch/max_workers", DirectoryPrefetcher.DEFAULT_MAX_WORKERS)),
+            self
+        )
+        self.prefetcher.listing_ready.connect(self._on_listing_prefetched)
+        self.prefetcher.listing_failed.connect(self._on_listing_failed)
+        self.directory_watcher.directoryChanged.connect(self.prefetcher.invalidate)
+        # Obří složky nečte QFileSystemModel, změny se do nich načtou znovu s odstupem
+        self._changed_large_folders = set()
+        self.large_folder_reload_timer = QTimer(self)
+        self.large_folder_reload_timer.setSingleShot(True)
+        self.large_folder_reload_timer.setInterval(500)
+        self.large_folder_reload_timer.timeout.connect(self.reload_changed_large_folders)
+        self.directory_watcher.directoryChanged.connect(self._on_watched_directory_changed)
+        self.mark_startup("model")
         
         # Vytvoření GUI komponent
         self.setup_ui()
+        self.mark_startup("hlavní okno")
+        
+        # Po načtení složky aktuální záložky se obnoví počet položek ve stavovém řádku
+        self.model_manager.directory_loaded.connect(self._on_directory_loaded)
+        
+        # Indexování názvů startuje až po zobrazení okna, běžná aktualizace jednou za čtvrt hodiny
+        if self.file_indexer:
+            self.model_manager.directory_loaded.connect(self.file_indexer.invalidate)
+            self.directory_watcher.directoryChanged.connect(self.file_indexer.invalidate)
+            QTimer.singleShot(3000, self.file_indexer.start)
+            self.index_sweep_timer = QTimer(self)
+            self.index_sweep_timer.setInterval(15 * 60 * 1000)
+            self.index_sweep_timer.timeout.connect(self.file_indexer.sweep)
+            self.index_sweep_timer.start()
+        
+        # Záložky dlouho na pozadí se uspávají, aby nedržely widgety a modely
+        self.hibernate_timer = QTimer(self)
+        self.hibernate_timer.setInterval(30 * 1000)
+        self.hibernate_timer.timeout.connect(self.hibernate_background_tabs)
+        self.hibernate_timer.start()
         
         # Předběžné načtení informací o verzi v pozadí (pro rychlé zobrazení "O aplikaci")
         self.preload_version_info()
         
         # Načtení výchozí cesty už se děje v create_new_tab
         # self.navigate_to_path(self.current_path)
+        
+        # Pojistka, kdyby se okno nevykreslilo (např. bez zobrazení)
+        QTimer.singleShot(500, self.finish_startup)
+    
+    def mark_startup(self, phase: str):
+        """Zaznamená konec fáze startu (jen s --profile-startup)"""
+        if self.startup_profile:
+            self.startup_profile.mark(phase)
+    
+    def paintEvent(self, event):
+        """Po prvním vykreslení okna dokončí odložený start"""
+        super().paintEvent(event)
+        if self._startup_pending:
+            self.mark_startup("první vykreslení")
+            QTimer.singleShot(0, self.finish_startup)
+    
+    def finish_startup(self):
+        """Odložená část startu: první záložka, kořen modelu a ikona aplikace"""
+        if not self._startup_pending:
+            return
+        self._startup_pending = False
+        
+        # Záložky minulé relace, jinak první záložka
+        if not self.restore_session():
+            self.create_new_tab(QDir.homePath(), "Domů")
+        self.mark_startup("první záložka")
+        
+        # Sledování kořene spouští procházení disku modelem, proto až po zobrazení okna
+        self.model_manager.set_root_path(QDir.rootPath())
+        self.set_application_icon()
+        self.mark_startup("kořen modelu a ikona")
+    
+    @traced("navigace")
+    def _on_directory_loaded(self, path: str):
+        """Dokončí obnovení stavu záložek načtené složky a aktualizuje stavový řádek"""
+        path = os.path.normpath(path)
+        for tab_data in self.tab_data.values():
+            if tab_data['saved_state'] and os.path.normpath(tab_data['path']) == path:
+                self.restore_tab_view_state(tab_data)
+        tab_data = self.get_current_tab_data()
+        if tab_data and os.path.normpath(tab_data['path']) == path:
+            self.update_status_bar()
+            if self.startup_profile and not self.startup_profile.reported:
+                self.mark_startup("načtení první složky")
+                print(self.startup_profile.report(), flush=True)
+                self.startup_profile.reported = True
+    
+    def closeEvent(self, event):
+        """Uloží relaci a ukončí úlohy na pozadí při zavření okna"""
+        if not self._startup_pending:
+            self.save_session()
+        self.folder_scanner.shutdown()
+        self.preview_service.shutdown()
+        self.file_operations.transfer_engine.shutdown()
+        self.duplicate_finder.shutdown()
+        self.disk_usage_scanner.shutdown()
+        self.folder_searcher.shutdown()
+        self.selection_stat_service.shutdown()
+        self.prefetcher.shutdown()
+        if TRACER.export_path:
+            try:
+                TRACER.export(TRACER.export_path)
+            except OSError as e:
+                print(f"Trasu výkonu se nepodařilo uložit: {e}")
+        if self.file_indexer:
+            self.file_indexer.shutdown()
+            self.name_index.close()
+        super().closeEvent(event)
+    
+    def open_folder_size_cache(self) -> Optional[FolderSizeCache]:
+        """Otevře perzistentní mezipaměť velikostí složek (bez ní se skenuje vždy celý strom)"""
+        import sqlite3
+        try:
+            return FolderSizeCache(os.path.join(get_cache_dir(), "folder_sizes.sqlite"))
+        except (OSError, sqlite3.Error) as e:
+            print(f"Mezipaměť velikostí složek není dostupná: {e}")
+            return None
+    
+    def open_name_index(self) -> Optional[FileNameIndex]:
+        """Otevře perzistentní index názvů souborů (bez něj není hledání v indexu dostupné)"""
+        import sqlite3
+        try:
+            return FileNameIndex(os.path.join(get_cache_dir(), "name_index.sqlite"))
+        except (OSError, sqlite3.Error) as e:
+            print(f"Index názvů souborů není dostupný: {e}")
+            return None
+    
+    def index_roots(self) -> List[str]:
+        """Vrací indexované složky z nastavení (výchozí je domovská složka)"""
+        roots = QSettings("FlexiFiles", "FlexiFiles").value("index/roots", [QDir.homePath()])
+        if isinstance(roots, str):  # QSettings vrací jednoprvkový seznam jako řetězec
+            roots = [roots]
+        return list(roots or [])
     
     def get_version_info(self):
         """Získá informace o verzi z Git repozitáře (s předem načtenou cache)"""
@@ -593,9 +6593,7 @@ class FileBrowserMainWindow(QMainWindow):
         self.tab_widget.tabCloseRequested.connect(self.close_tab)
         self.tab_widget.currentChanged.connect(self.tab_changed)
         
-        # Vytvoření první záložky
-        self.create_new_tab(QDir.homePath(), "Domů")
-        
+        # První záložka vzniká až po prvním vykreslení okna (finish_startup)
         main_layout.addWidget(self.tab_widget)
         
         # Propojení signálů pro adresní řádek
@@ -603,6 +6601,7 @@ class FileBrowserMainWindow(QMainWindow):
         
         # Propojení file operations
         self.file_operations.operation_completed.connect(self.show_status_message)
+        self.file_operations.job_completed.connect(lambda message: self.status_bar.showMessage(message, 3000))
         self.file_operations.operation_failed.connect(self.show_error_message)
         
         # Stavový řádek
@@ -610,15 +6609,126 @@ class FileBrowserMainWindow(QMainWindow):
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("Připraven")
         
-    def create_new_tab(self, path: str, title: Optional[str] = None) -> int:
-        """Vytvoří novou záložku s file browserem"""
-        if not title:
-            title = os.path.basename(path) or path
+        # Průběh kopírování/přesunu na pozadí
+        self.transfer_progress = TransferProgressWidget(self.file_operations.transfer_engine)
+        self.status_bar.addPermanentWidget(self.transfer_progress)
+        
+    @traced("navigace")
+    def create_new_tab(self, path: str, title: Optional[str] = None) -> int:
+        """Vytvoří novou záložku s file browserem"""
+        if not title:
+            title = os.path.basename(path) or path
+        
+        tab_data = self.create_tab_data(path)
+        self.build_tab_widgets(tab_data)
+        
+        # Přidání záložky
+        tab_index = self.tab_widget.addTab(tab_data['page'], title)
+        self.tab_data[tab_index] = tab_data
+        
+        # Nastavení aktuální záložky
+        self.tab_widget.setCurrentIndex(tab_index)
+        
+        # Navigace na cestu
+        self.navigate_to_path_in_tab(path, tab_index)
+        
+        return tab_index
+    
+    def create_tab_data(self, path: str) -> dict:
+        """Založí stránku a trvalý stav záložky (bez widgetů)"""
+        # Stránka záložky přežívá uspání, obsah se do ní staví znovu
+        page = QWidget()
+        page_layout = QVBoxLayout(page)
+        page_layout.setContentsMargins(0, 0, 0, 0)
+        
+        # Trvalý stav záložky - widgety doplňuje build_tab_widgets
+        return {
+            'page': page,
+            'path': path,
+            'current_view_mode': ViewMode.DETAILS,
+            'navigation_history': NavigationHistory(),  # Každá záložka má svou historii
+            'results_visible': False,  # Zda výsledky nahrazují zobrazení složky
+            'disk_usage_job': None,  # Identifikátor běžícího skenu využití disku
+            'disk_usage_visible': False,  # Zda treemap využití disku nahrazuje zobrazení složky
+            'disk_usage_started': 0.0,
+            'search_job': None,  # Identifikátor běžícího hledání
+            'selection_stats': SelectionStats(),  # Souhrn výběru pro panel a stavový řádek
+            'selection_shown': None,  # Položka jednoprvkového výběru zobrazená v panelu
+            'hibernated': False,  # Widgety záložky jsou uvolněné
+            'size_probe': None,  # Složka zobrazená prázdná, dokud prefetcher nezjistí počet položek
+            'saved_state': None,  # Stav zobrazení uložený při uspání
+            'last_active': time.monotonic()  # Kdy byla záložka naposledy aktivní
+        }
+    
+    def save_session(self):
+        """Uloží otevřené záložky (cesty, režimy zobrazení a historie) pro příští start"""
+        tabs = []
+        for tab_index in range(self.tab_widget.count()):
+            tab_data = self.tab_data.get(tab_index)
+            if not tab_data:
+                continue
+            history = tab_data['navigation_history']
+            tabs.append({
+                'path': tab_data['path'],
+                'view_mode': tab_data['current_view_mode'].value,
+                'history': history.paths(),
+                'history_index': history.current_index
+            })
+        session = {'current': self.tab_widget.currentIndex(), 'tabs': tabs}
+        QSettings("FlexiFiles", "FlexiFiles").setValue("session/tabs", json.dumps(session))
+    
+    def restore_session(self) -> bool:
+        """Obnoví záložky minulé relace, vrací False, pokud žádné nejsou
+        
+        Hned se postaví jen aktivní záložka, ostatní vzniknou jako uspané
+        a widgety dostanou až při první aktivaci (wake_tab). Cesty se
+        nekontrolují, aby start nečekal na odpojené nebo síťové disky.
+        """
+        settings = QSettings("FlexiFiles", "FlexiFiles")
+        if not settings.value("session/restore", True, type=bool):
+            return False
+        try:
+            session = json.loads(settings.value("session/tabs", "") or "{}")
+            tabs = [tab for tab in session.get('tabs', []) if tab.get('path')]
+        except (ValueError, TypeError, AttributeError):
+            return False
+        if not tabs:
+            return False
+        
+        for tab in tabs:
+            path = tab['path']
+            tab_data = self.create_tab_data(path)
+            tab_data['hibernated'] = True
+            try:
+                tab_data['current_view_mode'] = ViewMode(tab.get('view_mode'))
+            except ValueError:
+                pass
+            history = tab_data['navigation_history']
+            history.restore(tab.get('history') or [], int(tab.get('history_index', -1)))
+            current = history.current()
+            if current is None or current.path != path:
+                history.add_path(path)
+            tab_index = self.tab_widget.addTab(tab_data['page'], os.path.basename(path) or path)
+            self.tab_data[tab_index] = tab_data
+        
+        current = min(max(int(session.get('current', 0)), 0), self.tab_widget.count() - 1)
+        if self.tab_widget.currentIndex() == current:
+            self.tab_changed(current)  # Při přidání první záložky ještě neměla data
+        else:
+            self.tab_widget.setCurrentIndex(current)
+        return True
+    
+    def tab_slot(self, page: QWidget, slot, arg_count: int = 1):
+        """Slot pro signál widgetu záložky - index záložky se zjistí až při volání
         
-        # Widget pro záložku
-        tab_widget = QWidget()
-        tab_layout = QVBoxLayout(tab_widget)
-        tab_layout.setContentsMargins(0, 0, 0, 0)
+        Indexy se po zavření záložky přečíslují, stránka záložky ale zůstává stejná.
+        """
+        return lambda *args: slot(*args[:arg_count], self.tab_widget.indexOf(page))
+    
+    @traced("zobrazení")
+    def build_tab_widgets(self, tab_data):
+        """Postaví obsah záložky (strom, toolbar, zobrazení složky, informační panel)"""
+        page = tab_data['page']
         
         # Splitter pro rozdělení zobrazení
         splitter = QSplitter(Qt.Orientation.Horizontal)
@@ -640,35 +6750,36 @@ class FileBrowserMainWindow(QMainWindow):
         middle_toolbar.setFloatable(False)
         middle_toolbar.setMovable(False)
         
+        # Akce patří toolbaru, aby se při uspání záložky uvolnily s ním
         # Navigační tlačítka v toolbaru
-        back_action = QAction("◀ Zpět", self)
+        back_action = QAction("◀ Zpět", middle_toolbar)
         back_action.setEnabled(False)
         back_action.triggered.connect(self.go_back)
         middle_toolbar.addAction(back_action)
         
-        forward_action = QAction("Vpřed ▶", self)
+        forward_action = QAction("Vpřed ▶", middle_toolbar)
         forward_action.setEnabled(False)
         forward_action.triggered.connect(self.go_forward)
         middle_toolbar.addAction(forward_action)
         
-        up_action = QAction("↑ Nahoru", self)
+        up_action = QAction("↑ Nahoru", middle_toolbar)
         up_action.triggered.connect(self.go_up)
         middle_toolbar.addAction(up_action)
         
-        refresh_action = QAction("🔄 Obnovit", self)
+        refresh_action = QAction("🔄 Obnovit", middle_toolbar)
         refresh_action.triggered.connect(self.refresh_current_view)
         middle_toolbar.addAction(refresh_action)
         
         middle_toolbar.addSeparator()
         
         # Akce pro novou složku
-        new_folder_action = QAction("📁 Nová složka", self)
+        new_folder_action = QAction("📁 Nová složka", middle_toolbar)
         new_folder_action.setShortcut(QKeySequence("Ctrl+Shift+N"))
         new_folder_action.triggered.connect(self.create_new_folder)
         middle_toolbar.addAction(new_folder_action)
         
         # Akce pro novou záložku
-        new_tab_action = QAction("🔖 Nová záložka", self)
+        new_tab_action = QAction("🔖 Nová záložka", middle_toolbar)
         new_tab_action.setShortcut(QKeySequence("Ctrl+T"))
         new_tab_action.triggered.connect(self.create_new_tab_current_path)
         middle_toolbar.addAction(new_tab_action)
@@ -676,55 +6787,69 @@ class FileBrowserMainWindow(QMainWindow):
         middle_toolbar.addSeparator()
         
         # Přepínání zobrazení
-        view_action = QAction("🔄 Přepnout zobrazení", self)
+        view_action = QAction("🔄 Přepnout zobrazení", middle_toolbar)
         view_action.triggered.connect(self.toggle_view_mode)
         middle_toolbar.addAction(view_action)
         
         # Přepínání informačního panelu
-        info_panel_action = QAction("ℹ️ Informační panel", self)
+        info_panel_action = QAction("ℹ️ Informační panel", middle_toolbar)
         info_panel_action.setShortcut(QKeySequence("Ctrl+I"))
         info_panel_action.triggered.connect(self.toggle_info_panel)
         middle_toolbar.addAction(info_panel_action)
         
+        # Hledání ve složce
+        search_action = QAction("🔍 Hledat", middle_toolbar)
+        search_action.setShortcut(QKeySequence("F3"))
+        search_action.triggered.connect(self.show_folder_search)
+        middle_toolbar.addAction(search_action)
+        
+        # Využití disku (treemap místo zobrazení složky)
+        disk_usage_action = QAction("📊 Využití disku", middle_toolbar)
+        disk_usage_action.triggered.connect(self.show_disk_usage)
+        middle_toolbar.addAction(disk_usage_action)
+        
+        # Filtr položek aktuální složky
+        filter_edit = QLineEdit()
+        filter_edit.setPlaceholderText("Filtrovat (Ctrl+F)...")
+        filter_edit.setClearButtonEnabled(True)
+        filter_edit.setMaximumWidth(220)
+        middle_toolbar.addSeparator()
+        middle_toolbar.addWidget(filter_edit)
+        
+        focus_filter_action = QAction(splitter)
+        focus_filter_action.setShortcut(QKeySequence("Ctrl+F"))
+        focus_filter_action.triggered.connect(lambda: (filter_edit.setFocus(), filter_edit.selectAll()))
+        splitter.addAction(focus_filter_action)
+        
         # Přidání toolbaru do středního panelu
         middle_layout.addWidget(middle_toolbar)
         
-        # Tabulkové zobrazení s upravenými řádky
-        table_view = QTableView()
-        table_view.setSortingEnabled(True)
-        table_view.setAlternatingRowColors(True)
-        table_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        
-        # Úprava tloušťky řádků
-        table_view.verticalHeader().setDefaultSectionSize(20)  # Tenčí řádky
-        table_view.verticalHeader().setMinimumSectionSize(18)
-        table_view.setShowGrid(False)  # Skrytí mřížky pro čistší vzhled
-        
-        # Seznamové zobrazení
-        list_view = QListView()
-        list_view.setViewMode(QListView.ViewMode.ListMode)
-        list_view.setResizeMode(QListView.ResizeMode.Adjust)
-        list_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        
-        # Ikonové zobrazení
-        icon_view = QListView()
-        icon_view.setViewMode(QListView.ViewMode.IconMode)
-        icon_view.setResizeMode(QListView.ResizeMode.Adjust)
-        icon_view.setGridSize(QSize(100, 100))
-        icon_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        # Panel hledání (skrytý, dokud se hledání neotevře)
+        search_bar = FolderSearchBar()
+        search_bar.hide()
+        middle_layout.addWidget(search_bar)
         
         # Kontejner pro různé režimy zobrazení
         view_container = QWidget()
         view_layout = QVBoxLayout(view_container)
         view_layout.setContentsMargins(0, 0, 0, 0)
         
-        # Přidám pouze table_view na začátku
-        view_layout.addWidget(table_view)
-        list_view.hide()
-        icon_view.hide()
-        
         middle_layout.addWidget(view_container)
         
+        # Výsledky hledání se zobrazují místo aktuálního zobrazení složky
+        results_view = QTableView()
+        results_view.setSortingEnabled(True)
+        results_view.setAlternatingRowColors(True)
+        results_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        results_view.verticalHeader().setDefaultSectionSize(20)
+        results_view.verticalHeader().setMinimumSectionSize(18)
+        results_view.verticalHeader().hide()
+        results_view.setShowGrid(False)
+        results_model = SearchResultsModel(SearchResultsModel.name_columns(), results_view)
+        results_view.setModel(results_model)
+        results_view.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        results_view.hide()
+        
         # Pravý panel pouze s informačním panelem
         right_panel = QWidget()
         right_layout = QVBoxLayout(right_panel)
@@ -734,6 +6859,8 @@ class FileBrowserMainWindow(QMainWindow):
         # Informační panel (pravý panel)
         info_panel = FileInfoPanel()
         info_panel.set_file_model(self.file_model)
+        info_panel.set_folder_scanner(self.folder_scanner)
+        info_panel.set_preview_service(self.preview_service)
         right_layout.addWidget(info_panel)
         
         splitter.addWidget(tree_view)
@@ -743,90 +6870,282 @@ class FileBrowserMainWindow(QMainWindow):
         splitter.setStretchFactor(1, 1)  # Rozšiřitelná šířka pro view
         splitter.setStretchFactor(2, 0)  # Pevná šířka pro pravý panel
         
-        tab_layout.addWidget(splitter)
+        page.layout().addWidget(splitter)
         
-        # Přidání záložky
-        tab_index = self.tab_widget.addTab(tab_widget, title)
+        # Proxy model obsahu složky s filtrem podle názvu
+        filter_model = DirectoryFilterModel(splitter)
+        filter_model.setSourceModel(self.file_model)
         
         # Uložení referencí na view komponenty pro tuto záložku
-        tab_data = {
-            'path': path,
+        tab_data.update({
             'tree_view': tree_view,
-            'table_view': table_view,
-            'list_view': list_view,
-            'icon_view': icon_view,
+            'table_view': None,  # Zobrazení složky vznikají až při prvním použití
+            'list_view': None,
+            'icon_view': None,
             'view_container': view_container,
             'view_layout': view_layout,
-            'current_view_mode': ViewMode.DETAILS,
             'splitter': splitter,
-            'navigation_history': NavigationHistory(),  # Každá záložka má svou historii
             'info_panel': info_panel,  # Informační panel
             'right_panel': right_panel,  # Pravý panel
             'middle_toolbar': middle_toolbar,  # Toolbar ve středním panelu
             'back_action': back_action,  # Akce Zpět
             'forward_action': forward_action,  # Akce Vpřed
             'up_action': up_action,  # Akce Nahoru
-            'middle_widget': middle_widget
-        }
+            'middle_widget': middle_widget,
+            'search_bar': search_bar,  # Panel hledání ve složce
+            'results_view': results_view,  # Zobrazení výsledků hledání
+            'results_model': results_model,
+            'filter_edit': filter_edit,  # Filtr položek složky
+            'filter_model': filter_model,  # Proxy model složky sdílený zobrazeními záložky
+            'large_model': None,  # Model obří složky místo QFileSystemModel
+            'disk_usage_view': None,  # Treemap využití disku vzniká až při prvním použití
+            'directory_snapshot': DirectorySnapshot(filter_model)  # Souhrn složky pro stavový řádek
+        })
         
         # Nastavení modelu pro tuto záložku
         tree_view.setModel(self.file_model)
         for i in range(1, self.file_model.columnCount()):
             tree_view.hideColumn(i)
         
-        table_view.setModel(self.file_model)
-        list_view.setModel(self.file_model)
-        icon_view.setModel(self.file_model)
-        
-        # Nastavení hlaviček tabulky
-        header = table_view.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
+        # Zobrazí se jen zobrazení aktuálního režimu
+        current_view = self.ensure_view(tab_data, tab_data['current_view_mode'])
+        view_layout.addWidget(current_view)
+        current_view.show()
         
         # Propojení signálů
-        tree_view.clicked.connect(lambda index, tab_idx=tab_index: self.tree_item_clicked(index, tab_idx))
-        table_view.doubleClicked.connect(lambda index, tab_idx=tab_index: self.table_item_double_clicked(index, tab_idx))
-        list_view.doubleClicked.connect(lambda index, tab_idx=tab_index: self.table_item_double_clicked(index, tab_idx))
-        icon_view.doubleClicked.connect(lambda index, tab_idx=tab_index: self.table_item_double_clicked(index, tab_idx))
-        
-        # Signály pro aktualizaci informačního panelu při výběru
-        table_view.clicked.connect(lambda index, tab_idx=tab_index: self.update_info_panel(index, tab_idx))
-        list_view.clicked.connect(lambda index, tab_idx=tab_index: self.update_info_panel(index, tab_idx))
-        icon_view.clicked.connect(lambda index, tab_idx=tab_index: self.update_info_panel(index, tab_idx))
-        
-        # Signály pro výběr více položek
-        table_view.selectionModel().selectionChanged.connect(lambda selected, deselected, tab_idx=tab_index: self.update_info_panel_selection(tab_idx))
-        list_view.selectionModel().selectionChanged.connect(lambda selected, deselected, tab_idx=tab_index: self.update_info_panel_selection(tab_idx))
-        icon_view.selectionModel().selectionChanged.connect(lambda selected, deselected, tab_idx=tab_index: self.update_info_panel_selection(tab_idx))
-        
-        # Kontextová menu
-        table_view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        table_view.customContextMenuRequested.connect(lambda pos, tab_idx=tab_index: self.show_context_menu(pos, tab_idx))
-        list_view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        list_view.customContextMenuRequested.connect(lambda pos, tab_idx=tab_index: self.show_context_menu(pos, tab_idx))
-        icon_view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        icon_view.customContextMenuRequested.connect(lambda pos, tab_idx=tab_index: self.show_context_menu(pos, tab_idx))
+        tree_view.clicked.connect(self.tab_slot(page, self.tree_item_clicked))
+        tree_view.setMouseTracking(True)
+        tree_view.entered.connect(self.prefetch_index)
         tree_view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        tree_view.customContextMenuRequested.connect(lambda pos, tab_idx=tab_index: self.show_tree_context_menu(pos, tab_idx))
+        tree_view.customContextMenuRequested.connect(self.tab_slot(page, self.show_tree_context_menu))
         
-        # Uložení dat záložky
-        self.tab_data[tab_index] = tab_data
+        filter_edit.textChanged.connect(self.tab_slot(page, self.apply_filter))
         
-        # Nastavení aktuální záložky
-        self.tab_widget.setCurrentIndex(tab_index)
+        # Hledání ve složce
+        search_bar.search_requested.connect(self.tab_slot(page, self.start_folder_search))
+        search_bar.stop_requested.connect(self.tab_slot(page, self.stop_folder_search, 0))
+        search_bar.close_requested.connect(self.tab_slot(page, self.close_folder_search, 0))
+        results_view.doubleClicked.connect(self.tab_slot(page, self.search_result_activated))
+        results_view.clicked.connect(lambda index: info_panel.update_info(results_model.path(index)))
+        results_view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        results_view.customContextMenuRequested.connect(self.tab_slot(page, self.show_results_context_menu))
+    
+    @traced("zobrazení")
+    def ensure_view(self, tab_data, mode: ViewMode):
+        """Vrací zobrazení složky pro režim, při prvním použití ho vytvoří"""
+        key = {ViewMode.DETAILS: 'table_view', ViewMode.LIST: 'list_view'}.get(mode, 'icon_view')
+        view = tab_data.get(key)
+        if view is not None:
+            return view
         
-        # Navigace na cestu
-        self.navigate_to_path_in_tab(path, tab_index)
+        if mode == ViewMode.DETAILS:
+            # Tabulkové zobrazení s upravenými řádky
+            view = QTableView()
+            view.setSortingEnabled(True)
+            view.setAlternatingRowColors(True)
+            view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+            
+            # Úprava tloušťky řádků
+            view.verticalHeader().setDefaultSectionSize(20)  # Tenčí řádky
+            view.verticalHeader().setMinimumSectionSize(18)
+            view.setShowGrid(False)  # Skrytí mřížky pro čistší vzhled
+        elif mode == ViewMode.LIST:
+            # Seznamové zobrazení
+            view = QListView()
+            view.setViewMode(QListView.ViewMode.ListMode)
+            view.setResizeMode(QListView.ResizeMode.Adjust)
+            view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        else:
+            # Ikonové zobrazení
+            view = QListView()
+            view.setViewMode(QListView.ViewMode.IconMode)
+            view.setResizeMode(QListView.ResizeMode.Adjust)
+            view.setGridSize(QSize(100, 100))
+            view.setIconSize(QSize(64, 64))
+            view.setUniformItemSizes(True)
+            view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+            view.setItemDelegate(ThumbnailDelegate(view, self.preview_service))
         
-        return tab_index
+        # Zobrazení složky čtou přes filtrovací proxy záložky
+        view.setParent(tab_data['view_container'])
+        view.hide()
+        view.setModel(tab_data['filter_model'])
+        
+        if mode == ViewMode.DETAILS:
+            # Nastavení hlaviček tabulky
+            header = view.horizontalHeader()
+            header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+            header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+            header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
+            header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
+            # Šířka sloupců se měří jen z okolí viditelných řádků - jinak každá změna filtru
+            # ve velké složce čte data tisíce řádků
+            header.setResizeContentsPrecision(100)
+        
+        # Propojení signálů
+        page = tab_data['page']
+        view.doubleClicked.connect(self.tab_slot(page, self.table_item_double_clicked))
+        view.clicked.connect(self.tab_slot(page, self.update_info_panel))
+        view.selectionModel().selectionChanged.connect(self.tab_slot(page, self.on_selection_changed, 2))
+        view.selectionModel().currentChanged.connect(self.prefetch_index)
+        view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        view.customContextMenuRequested.connect(self.tab_slot(page, self.show_context_menu))
+        
+        tab_data[key] = view
+        return view
+    
+    @traced("navigace")
+    def hibernate_tab(self, tab_index: int) -> bool:
+        """Uspí záložku na pozadí - uvolní její widgety a ponechá jen malý záznam stavu"""
+        tab_data = self.tab_data.get(tab_index)
+        if (not tab_data or tab_data['hibernated'] or tab_index == self.tab_widget.currentIndex()
+                or tab_data['search_job'] is not None or tab_data['results_visible']
+                or tab_data['disk_usage_visible']):
+            return False
+        
+        tab_data['saved_state'] = self.capture_tab_view_state(tab_data)
+        
+        # Zastaví výpočty a náhledy panelu, pak uvolní celý obsah záložky
+        tab_data['info_panel'].clear_info()
+        if tab_data['icon_view'] is not None:
+            tab_data['icon_view'].itemDelegate().clear()
+        if tab_data['large_model'] is not None:
+            tab_data['large_model'].cancel()
+        tab_data['selection_stats'].clear()
+        tab_data['selection_shown'] = None
+        splitter = tab_data['splitter']
+        tab_data['page'].layout().removeWidget(splitter)
+        splitter.hide()
+        splitter.deleteLater()
+        for key in self.TAB_WIDGET_KEYS:
+            tab_data.pop(key, None)
+        tab_data['hibernated'] = True
+        return True
+    
+    @traced("navigace")
+    def wake_tab(self, tab_index: int):
+        """Znovu postaví widgety uspané záložky a obnoví uložený stav zobrazení"""
+        tab_data = self.tab_data.get(tab_index)
+        if not tab_data or not tab_data['hibernated']:
+            return
+        
+        tab_data['hibernated'] = False
+        self.build_tab_widgets(tab_data)
+        state = tab_data['saved_state'] or {}
+        if state.get('splitter_sizes'):
+            tab_data['splitter'].setSizes(state['splitter_sizes'])
+        tab_data['info_panel'].setVisible(state.get('info_panel_visible', True))
+        
+        # Složka obnovené relace mezitím mohla zmizet - ukáže se nejbližší existující nadřazená
+        path = tab_data['path']
+        while not self.prefetcher.is_directory(path) and os.path.dirname(path) != path:
+            path = os.path.dirname(path)
+        if path != tab_data['path']:
+            tab_data['navigation_history'].add_path(path)
+            tab_data['path'] = path
+            state = {}
+        self._navigate_to_path_in_tab_without_history(path, tab_index)
+        self.apply_tab_view_state(tab_data, state)
+    
+    def capture_tab_view_state(self, tab_data) -> dict:
+        """Uloží výběr, posun a rozvržení zobrazení živé záložky"""
+        view = self.get_current_view_for_tab(tab_data)
+        return {
+            'selection': self.get_selected_paths(tab_data),
+            'current': self.path_for_index(view.currentIndex()),
+            'scroll': (view.horizontalScrollBar().value(), view.verticalScrollBar().value()),
+            'filter': tab_data['filter_edit'].text(),
+            'sort': tab_data['filter_model'].sort_order(),
+            'splitter_sizes': tab_data['splitter'].sizes(),
+            'info_panel_visible': not tab_data['info_panel'].isHidden()
+        }
+    
+    def apply_tab_view_state(self, tab_data, state: dict):
+        """Obnoví filtr a řazení záložky a naplánuje obnovení výběru a posunu"""
+        if state.get('filter'):
+            tab_data['filter_edit'].setText(state['filter'])
+        sort = state.get('sort')
+        if sort and sort != tab_data['filter_model'].sort_order():
+            if tab_data['table_view'] is not None:
+                tab_data['table_view'].sortByColumn(*sort)  # Aktualizuje i ukazatel v hlavičce
+            else:
+                tab_data['filter_model'].sort(*sort)
+        tab_data['saved_state'] = state or None
+        # Výběr a posun se obnoví, jakmile jsou položky složky načtené
+        self.restore_tab_view_state(tab_data)
+    
+    def _on_file_model_replaced(self, model):
+        """Přepojí živé záložky na nový model správce (uspané si ho vezmou při probuzení)"""
+        self.file_model = model
+        for tab_data in self.tab_data.values():
+            if tab_data['hibernated']:
+                continue
+            state = self.capture_tab_view_state(tab_data)
+            tree_view = tab_data['tree_view']
+            tree_view.setModel(model)
+            for i in range(1, model.columnCount()):
+                tree_view.hideColumn(i)
+            tab_data['info_panel'].set_file_model(model)
+            index = model.index(tab_data['path'])
+            tree_view.setCurrentIndex(index)
+            tree_view.scrollTo(index)
+            self.set_tab_folder(tab_data, index)
+            self.apply_tab_view_state(tab_data, state)
+    
+    @traced("navigace")
+    def restore_tab_view_state(self, tab_data):
+        """Obnoví výběr a posun zobrazení uložené při uspání záložky nebo v historii"""
+        state = tab_data.get('saved_state')
+        if not state or tab_data['hibernated']:
+            return
+        filter_model = tab_data['filter_model']
+        if filter_model.canFetchMore(QModelIndex()) or (filter_model.rowCount() == 0
+                                                         and filter_model.source_row_count() == 0):
+            # Složka se ještě načítá - dokončí se v _on_directory_loaded
+            return
+        tab_data['saved_state'] = None
+        
+        view = self.get_current_view_for_tab(tab_data)
+        selection_model = view.selectionModel()
+        selection = QItemSelection()
+        for path in state['selection']:
+            index = self.index_for_path(tab_data, path)
+            if index.isValid():
+                selection.select(index, index)
+        if not selection.isEmpty():
+            selection_model.select(selection, QItemSelectionModel.SelectionFlag.ClearAndSelect
+                                   | QItemSelectionModel.SelectionFlag.Rows)
+        if state['current']:
+            current = self.index_for_path(tab_data, state['current'])
+            if current.isValid():
+                selection_model.setCurrentIndex(current, QItemSelectionModel.SelectionFlag.NoUpdate)
+        
+        # Rozsah posuvníků je známý až po rozvržení zobrazení (zobrazení ho jinak odkládá)
+        h_value, v_value = state['scroll']
+        QTimer.singleShot(0, lambda: (view.doItemsLayout(),
+                                      view.horizontalScrollBar().setValue(h_value),
+                                      view.verticalScrollBar().setValue(v_value)))
+    
+    def hibernate_background_tabs(self):
+        """Uspí záložky, které jsou delší dobu na pozadí"""
+        now = time.monotonic()
+        for tab_index, tab_data in list(self.tab_data.items()):
+            if not tab_data['hibernated'] and now - tab_data['last_active'] >= self.TAB_HIBERNATE_AFTER:
+                self.hibernate_tab(tab_index)
     
     def close_tab(self, index: int):
         """Zavře záložku"""
         if self.tab_widget.count() > 1:  # Nechá alespoň jednu záložku
             # Odstraň data záložky
             if index in self.tab_data:
+                if not self.tab_data[index]['hibernated']:
+                    self.tab_data[index]['info_panel'].clear_info()
+                    if self.tab_data[index]['large_model'] is not None:
+                        self.tab_data[index]['large_model'].cancel()
+                if self.tab_data[index]['search_job'] is not None:
+                    self.folder_searcher.cancel(self.tab_data[index]['search_job'])
+                if self.tab_data[index]['disk_usage_job'] is not None:
+                    self.disk_usage_scanner.cancel(self.tab_data[index]['disk_usage_job'])
                 del self.tab_data[index]
             # Přenumeruj zbývající záložky
             new_tab_data = {}
@@ -836,13 +7155,27 @@ class FileBrowserMainWindow(QMainWindow):
                 elif i < index:
                     new_tab_data[i] = data
             self.tab_data = new_tab_data
+            page = self.tab_widget.widget(index)
             self.tab_widget.removeTab(index)
+            # removeTab widget nemaže - uvolni ho i s běžícími výpočty panelu
+            if page:
+                page.deleteLater()
+            self.update_watched_directories()
         
+    @traced("navigace")
     def tab_changed(self, index: int):
         """Zpracuje změnu aktivní záložky"""
+        # Opouštěná záložka začíná odpočet do uspání
+        for tab_data in self.tab_data.values():
+            if tab_data['page'] is self._active_tab_page:
+                tab_data['last_active'] = time.monotonic()
+        self._active_tab_page = self.tab_widget.widget(index)
+        
         if index >= 0:
+            self.wake_tab(index)
             tab_data = self.get_current_tab_data()
             if tab_data:
+                tab_data['last_active'] = time.monotonic()
                 self.current_path = tab_data['path']
                 self.address_bar.setText(self.current_path)
                 self.update_navigation_buttons()
@@ -858,12 +7191,21 @@ class FileBrowserMainWindow(QMainWindow):
         """Vytvoří novou záložku s aktuální cestou"""
         self.create_new_tab(self.current_path)
     
+    @traced("navigace")
     def navigate_to_path_in_tab(self, path: str, tab_index: int):
         """Naviguje na cestu v konkrétní záložce"""
-        if tab_index not in self.tab_data or not os.path.exists(path) or not os.path.isdir(path):
+        if tab_index not in self.tab_data or not self.prefetcher.is_directory(path):
             return
             
+        # Uspaná záložka se probudí, uložený výběr ale patří původní složce
+        self.wake_tab(tab_index)
         tab_data = self.tab_data[tab_index]
+        self.remember_history_state(tab_data)
+        tab_data['saved_state'] = None
+        if tab_data['results_visible']:
+            self.close_folder_search(tab_index)
+        if tab_data['disk_usage_visible']:
+            self.close_disk_usage(tab_index)
         
         # Přidej cestu do historie této záložky
         tab_data['navigation_history'].add_path(path)
@@ -874,9 +7216,8 @@ class FileBrowserMainWindow(QMainWindow):
         tab_data['tree_view'].setCurrentIndex(index)
         tab_data['tree_view'].scrollTo(index)
         
-        # Nastavení root indexu pro aktuální zobrazení v záložce
-        current_view = self.get_current_view_for_tab(tab_data)
-        current_view.setRootIndex(index)
+        # Zobrazení záložky sdílejí proxy model, stačí přepnout jeho složku
+        self.set_tab_folder(tab_data, index)
         
         # Aktualizace UI pouze pokud je to aktuální záložka
         if tab_index == self.tab_widget.currentIndex():
@@ -887,13 +7228,29 @@ class FileBrowserMainWindow(QMainWindow):
         # Aktualizace názvu záložky
         folder_name = os.path.basename(path) or path
         self.tab_widget.setTabText(tab_index, folder_name)
+        self.update_watched_directories()
+        for neighbour in tab_data['navigation_history'].neighbours():
+            self.prefetcher.request(neighbour)
     
-    def _navigate_to_path_in_tab_without_history(self, path: str, tab_index: int):
-        """Naviguje na cestu v konkrétní záložce bez přidání do historie (pro zpět/vpřed)"""
-        if tab_index not in self.tab_data or not os.path.exists(path) or not os.path.isdir(path):
+    @traced("navigace")
+    def _navigate_to_path_in_tab_without_history(self, path: str, tab_index: int,
+                                                 entry: Optional[HistoryEntry] = None):
+        """Naviguje na cestu v konkrétní záložce bez přidání do historie (pro zpět/vpřed)
+        
+        Stav zobrazení z položky historie se obnoví; nezměněná složka se
+        přitom znovu nečte (obří složka se zobrazí z uloženého obsahu).
+        """
+        if tab_index not in self.tab_data:
+            return
+        unchanged = entry is not None and self.folder_unchanged(entry)
+        if not unchanged and not self.prefetcher.is_directory(path):
             return
             
         tab_data = self.tab_data[tab_index]
+        if tab_data['results_visible']:
+            self.close_folder_search(tab_index)
+        if tab_data['disk_usage_visible']:
+            self.close_disk_usage(tab_index)
         tab_data['path'] = path
         
         # Aktualizace zobrazení v záložce
@@ -901,9 +7258,13 @@ class FileBrowserMainWindow(QMainWindow):
         tab_data['tree_view'].setCurrentIndex(index)
         tab_data['tree_view'].scrollTo(index)
         
-        # Nastavení root indexu pro aktuální zobrazení v záložce
-        current_view = self.get_current_view_for_tab(tab_data)
-        current_view.setRootIndex(index)
+        # Zobrazení záložky sdílejí proxy model, stačí přepnout jeho složku
+        self.set_tab_folder(tab_data, index, entry if unchanged else None)
+        if entry is not None:
+            if entry.state:
+                self.apply_tab_view_state(tab_data, entry.state)
+            entry.state = None
+            tab_data['navigation_history'].store_listing(entry, None)
         
         # Aktualizace UI pouze pokud je to aktuální záložka
         if tab_index == self.tab_widget.currentIndex():
@@ -914,20 +7275,94 @@ class FileBrowserMainWindow(QMainWindow):
         # Aktualizace názvu záložky
         folder_name = os.path.basename(path) or path
         self.tab_widget.setTabText(tab_index, folder_name)
+        self.update_watched_directories()
+        for neighbour in tab_data['navigation_history'].neighbours():
+            self.prefetcher.request(neighbour)
+    
+    def remember_history_state(self, tab_data):
+        """Uloží do aktuální položky historie stav zobrazení opouštěné složky"""
+        history = tab_data['navigation_history']
+        entry = history.current()
+        if entry is None or tab_data['hibernated'] or entry.path != tab_data['path']:
+            return
+        # Stav, který se po probuzení záložky ještě neobnovil, platí dál
+        entry.state = tab_data['saved_state'] or self.capture_tab_view_state(tab_data)
+        try:
+            entry.mtime_ns = os.stat(entry.path).st_mtime_ns
+        except OSError:
+            entry.mtime_ns = None
+        large_model = tab_data['large_model']
+        entry.large = large_model is not None and tab_data['filter_model'].sourceModel() is large_model
+        history.store_listing(entry, large_model.snapshot() if entry.large else None)
+    
+    @staticmethod
+    def folder_unchanged(entry: HistoryEntry) -> bool:
+        """Zda se složka položky historie od odchodu nezměnila (jedno stat místo výpisu)"""
+        if entry.mtime_ns is None:
+            return False
+        try:
+            info = os.stat(entry.path)
+        except OSError:
+            return False
+        return stat.S_ISDIR(info.st_mode) and info.st_mtime_ns == entry.mtime_ns
     
     def get_current_view_for_tab(self, tab_data):
         """Vrací aktuální aktivní zobrazení pro záložku"""
+        # Uspaná záložka žádné zobrazení nemá
         if tab_data['current_view_mode'] == ViewMode.DETAILS:
-            return tab_data['table_view']
+            return tab_data.get('table_view')
         elif tab_data['current_view_mode'] == ViewMode.LIST:
-            return tab_data['list_view']
+            return tab_data.get('list_view')
         else:
-            return tab_data['icon_view']
+            return tab_data.get('icon_view')
     
     def create_menu_bar(self):
         """Vytvoří menu bar s nápovědou"""
         menubar = self.menuBar()
         
+        # Menu Nástroje
+        tools_menu = menubar.addMenu('&Nástroje')
+        
+        prune_thumbnails_action = QAction('Vyčistit mezipaměť &náhledů', self)
+        prune_thumbnails_action.setStatusTip('Smaže uložené náhledy souborů, které už neexistují')
+        prune_thumbnails_action.triggered.connect(self.prune_thumbnails)
+        tools_menu.addAction(prune_thumbnails_action)
+        
+        tools_menu.addSeparator()
+        
+        index_search_action = QAction('&Hledat v indexu...', self)
+        index_search_action.setShortcut(QKeySequence('Ctrl+Shift+F'))
+        index_search_action.setStatusTip('Okamžitě najde soubory podle názvu v indexovaných složkách')
+        index_search_action.triggered.connect(self.show_index_search)
+        index_search_action.setEnabled(self.file_indexer is not None)
+        tools_menu.addAction(index_search_action)
+        
+        index_roots_action = QAction('&Indexované složky...', self)
+        index_roots_action.setStatusTip('Nastaví složky, jejichž obsah se indexuje pro hledání')
+        index_roots_action.triggered.connect(self.configure_index_roots)
+        index_roots_action.setEnabled(self.file_indexer is not None)
+        tools_menu.addAction(index_roots_action)
+        
+        reindex_action = QAction('&Aktualizovat index', self)
+        reindex_action.setStatusTip('Projde indexované složky a zapíše změny od poslední kontroly')
+        reindex_action.triggered.connect(self.refresh_name_index)
+        reindex_action.setEnabled(self.file_indexer is not None)
+        tools_menu.addAction(reindex_action)
+        
+        tools_menu.addSeparator()
+        
+        self.trace_action = QAction('&Trasovat výkon', self)
+        self.trace_action.setCheckable(True)
+        self.trace_action.setChecked(TRACER.enabled)
+        self.trace_action.setStatusTip('Zaznamenává doby volání a zaseknutí rozhraní pro analýzu v Chrome/Perfetto')
+        self.trace_action.toggled.connect(self.toggle_tracing)
+        tools_menu.addAction(self.trace_action)
+        
+        export_trace_action = QAction('&Uložit trasu výkonu...', self)
+        export_trace_action.setStatusTip('Uloží zaznamenanou trasu jako JSON pro chrome://tracing nebo ui.perfetto.dev')
+        export_trace_action.triggered.connect(self.export_trace)
+        tools_menu.addAction(export_trace_action)
+        
         # Menu Nápověda
         help_menu = menubar.addMenu('&Nápověda')
         
@@ -946,6 +7381,314 @@ class FileBrowserMainWindow(QMainWindow):
         about_action.triggered.connect(self.show_about)
         help_menu.addAction(about_action)
     
+    def prune_thumbnails(self):
+        """Spustí úklid mezipaměti náhledů na pozadí"""
+        self.status_bar.showMessage("Čistím mezipaměť náhledů...")
+        self.preview_service.prune_thumbnails()
+    
+    def toggle_tracing(self, enabled: bool):
+        """Zapne nebo vypne trasování výkonu (nový záznam začíná s prázdnou trasou)"""
+        if enabled:
+            TRACER.clear()
+            TRACER.start()
+            self.status_bar.showMessage("Trasování výkonu zapnuto")
+        else:
+            TRACER.stop()
+            self.status_bar.showMessage(f"Trasování výkonu vypnuto, zaznamenáno událostí: {TRACER.event_count()}")
+    
+    def export_trace(self):
+        """Uloží zaznamenanou trasu výkonu do zvoleného souboru"""
+        if not TRACER.event_count():
+            self.status_bar.showMessage("Trasa výkonu je prázdná, nejdřív zapněte trasování")
+            return
+        default = os.path.join(QDir.homePath(), f"flexifiles-trace-{datetime.now():%Y%m%d-%H%M%S}.json")
+        path, _ = QFileDialog.getSaveFileName(self, "Uložit trasu výkonu", default, "Trasa výkonu (*.json)")
+        if not path:
+            return
+        try:
+            count = TRACER.export(path)
+        except OSError as e:
+            self.show_error_message(f"Trasu se nepodařilo uložit: {e}")
+            return
+        self.status_bar.showMessage(f"Trasa výkonu uložena ({count} událostí): {path}")
+    
+    def show_index_search(self):
+        """Zobrazí (nemodální) dialog hledání v indexu názvů"""
+        if self.index_search_dialog is None:
+            self.index_search_dialog = IndexSearchDialog(self.name_index, self)
+            self.index_search_dialog.path_activated.connect(self.open_search_result)
+        self.index_search_dialog.show()
+        self.index_search_dialog.raise_()
+        self.index_search_dialog.activateWindow()
+    
+    def open_search_result(self, path: str):
+        """Otevře nalezenou složku, u souboru jeho složku s označeným souborem"""
+        if not os.path.exists(path):
+            self.show_error_message(f"Položka už neexistuje: {path}")
+            self.file_indexer.invalidate(os.path.dirname(path))
+            return
+        if os.path.isdir(path):
+            self.navigate_to_path(path)
+            return
+        self.reveal_in_tab(path, self.tab_widget.currentIndex())
+    
+    def reveal_in_tab(self, path: str, tab_index: int):
+        """Otevře v záložce složku položky a položku označí"""
+        if tab_index not in self.tab_data:
+            return
+        self.navigate_to_path_in_tab(os.path.dirname(path), tab_index)
+        tab_data = self.tab_data[tab_index]
+        view = self.get_current_view_for_tab(tab_data)
+        index = self.index_for_path(tab_data, path)
+        view.setCurrentIndex(index)
+        view.scrollTo(index)
+    
+    def show_folder_search(self):
+        """Otevře panel hledání v aktuální složce záložky"""
+        tab_data = self.get_current_tab_data()
+        if not tab_data:
+            return
+        tab_data['search_bar'].show()
+        tab_data['search_bar'].focus_pattern()
+        if tab_data['search_job'] is None:
+            tab_data['search_bar'].set_status(f"Hledá se v: {tab_data['path']}")
+    
+    def start_folder_search(self, criteria, tab_index: int):
+        """Spustí hledání ve složce záložky, výsledky nahradí zobrazení složky"""
+        tab_data = self.tab_data.get(tab_index)
+        if not tab_data:
+            return
+        if tab_data['search_job'] is not None:
+            self.folder_searcher.cancel(tab_data['search_job'])
+        if tab_data['disk_usage_visible']:
+            self.close_disk_usage(tab_index)
+        tab_data['results_model'].clear(
+            SearchResultsModel.content_columns() if isinstance(criteria, ContentQuery)
+            else SearchResultsModel.name_columns()
+        )
+        self.set_results_visible(tab_data, True)
+        tab_data['search_started'] = time.monotonic()
+        tab_data['search_job'] = self.folder_searcher.search(tab_data['path'], criteria)
+        tab_data['search_bar'].set_running(True)
+        tab_data['search_bar'].set_status("Hledám…")
+    
+    def stop_folder_search(self, tab_index: int):
+        """Zastaví běžící hledání (nalezené výsledky zůstanou)"""
+        tab_data = self.tab_data.get(tab_index)
+        if tab_data and tab_data['search_job'] is not None:
+            self.folder_searcher.cancel(tab_data['search_job'])
+    
+    def close_folder_search(self, tab_index: int):
+        """Zavře hledání a vrátí zobrazení složky"""
+        tab_data = self.tab_data.get(tab_index)
+        if not tab_data:
+            return
+        if tab_data['search_job'] is not None:
+            self.folder_searcher.cancel(tab_data['search_job'])
+            tab_data['search_job'] = None
+        tab_data['search_bar'].set_running(False)
+        tab_data['search_bar'].hide()
+        self.set_results_visible(tab_data, False)
+        tab_data['results_model'].clear()
+    
+    def set_results_visible(self, tab_data, visible: bool):
+        """Vymění zobrazení složky za výsledky hledání a zpět"""
+        if tab_data['results_visible'] == visible:
+            return
+        view_layout = tab_data['view_layout']
+        folder_view = self.get_current_view_for_tab(tab_data)
+        results_view = tab_data['results_view']
+        shown, hidden = (results_view, folder_view) if visible else (folder_view, results_view)
+        hidden.hide()
+        view_layout.removeWidget(hidden)
+        view_layout.addWidget(shown)
+        shown.show()
+        tab_data['results_visible'] = visible
+    
+    def show_disk_usage(self):
+        """Přepne aktuální záložku do režimu využití disku a spustí sken její složky"""
+        tab_index = self.tab_widget.currentIndex()
+        tab_data = self.tab_data.get(tab_index)
+        if not tab_data or tab_data['hibernated']:
+            return
+        if tab_data['results_visible']:
+            self.close_folder_search(tab_index)
+        if tab_data['disk_usage_view'] is None:
+            view = DiskUsageView()
+            page = tab_data['page']
+            view.close_requested.connect(self.tab_slot(page, self.close_disk_usage, 0))
+            view.rescan_requested.connect(lambda: self.start_disk_usage_scan(self.tab_widget.indexOf(page), reuse=False))
+            view.path_activated.connect(self.tab_slot(page, self.reveal_in_tab))
+            view.hide()
+            tab_data['disk_usage_view'] = view
+        self.set_disk_usage_visible(tab_data, True)
+        self.start_disk_usage_scan(tab_index)
+        tab_data['disk_usage_view'].treemap.setFocus()
+    
+    def start_disk_usage_scan(self, tab_index: int, reuse: bool = True):
+        """Spustí sken využití disku pro složku záložky
+        
+        Výsledek minulého skenu se zobrazí hned. S reuse ho sken ověří a znovu
+        čte jen složky se změněným mtime, jinak (tlačítko Znovu) čte vše.
+        """
+        tab_data = self.tab_data.get(tab_index)
+        if not tab_data or tab_data['disk_usage_view'] is None:
+            return
+        if tab_data['disk_usage_job'] is not None:
+            self.disk_usage_scanner.cancel(tab_data['disk_usage_job'])
+        previous = self.disk_usage_scanner.result(tab_data['path'])
+        tab_data['disk_usage_view'].set_result(previous, "ověřuji změny…" if previous and reuse else "skenuji…")
+        tab_data['disk_usage_started'] = time.monotonic()
+        tab_data['disk_usage_job'] = self.disk_usage_scanner.scan(tab_data['path'], reuse)
+    
+    def close_disk_usage(self, tab_index: int):
+        """Ukončí režim využití disku a vrátí zobrazení složky"""
+        tab_data = self.tab_data.get(tab_index)
+        if not tab_data:
+            return
+        if tab_data['disk_usage_job'] is not None:
+            self.disk_usage_scanner.cancel(tab_data['disk_usage_job'])
+            tab_data['disk_usage_job'] = None
+        self.set_disk_usage_visible(tab_data, False)
+    
+    def set_disk_usage_visible(self, tab_data, visible: bool):
+        """Vymění zobrazení složky za treemap využití disku a zpět"""
+        if tab_data['disk_usage_visible'] == visible:
+            return
+        view_layout = tab_data['view_layout']
+        folder_view = self.get_current_view_for_tab(tab_data)
+        disk_usage_view = tab_data['disk_usage_view']
+        shown, hidden = (disk_usage_view, folder_view) if visible else (folder_view, disk_usage_view)
+        hidden.hide()
+        view_layout.removeWidget(hidden)
+        view_layout.addWidget(shown)
+        shown.show()
+        tab_data['disk_usage_visible'] = visible
+    
+    def _tab_data_for_disk_usage(self, job_id: int):
+        """Najde záložku, které patří běžící sken využití disku"""
+        for tab_data in self.tab_data.values():
+            if tab_data['disk_usage_job'] == job_id:
+                return tab_data
+        return None
+    
+    def _on_disk_usage_progress(self, job_id: int, root: DiskUsageNode):
+        """Překreslí treemap s upřesněnými součty"""
+        tab_data = self._tab_data_for_disk_usage(job_id)
+        if tab_data:
+            tab_data['disk_usage_view'].set_result(root, "skenuji…")
+    
+    def _on_disk_usage_finished(self, job_id: int, root: DiskUsageNode):
+        """Zobrazí konečný strom skenu"""
+        tab_data = self._tab_data_for_disk_usage(job_id)
+        if not tab_data:
+            return
+        tab_data['disk_usage_job'] = None
+        elapsed = format_duration(time.monotonic() - tab_data['disk_usage_started'])
+        tab_data['disk_usage_view'].set_result(root, f"hotovo ({elapsed})")
+    
+    def _tab_data_for_search(self, job_id: int):
+        """Najde záložku, které patří běžící hledání"""
+        for tab_data in self.tab_data.values():
+            if tab_data['search_job'] == job_id:
+                return tab_data
+        return None
+    
+    def _on_search_results(self, job_id: int, rows: list):
+        """Přidá dávku nálezů do výsledků záložky"""
+        tab_data = self._tab_data_for_search(job_id)
+        if tab_data:
+            tab_data['results_model'].append_rows(rows)
+            tab_data['search_bar'].set_status(f"Hledám… nalezeno: {tab_data['results_model'].rowCount()}")
+    
+    def _on_search_finished(self, job_id: int, count: int, cancelled: bool, note: str):
+        """Zobrazí souhrn dokončeného hledání"""
+        tab_data = self._tab_data_for_search(job_id)
+        if not tab_data:
+            return
+        tab_data['search_job'] = None
+        tab_data['search_bar'].set_running(False)
+        elapsed = format_duration(time.monotonic() - tab_data['search_started'])
+        if cancelled:
+            message = f"Zastaveno, nalezeno: {count} ({elapsed})"
+        elif count >= FolderSearcher.MAX_RESULTS:
+            message = f"Zobrazeno prvních {count} výsledků ({elapsed}) – upřesněte dotaz"
+        else:
+            message = f"Nalezeno: {count} ({elapsed})"
+        if note:
+            message += f"; {note}"
+        tab_data['search_bar'].set_status(message)
+    
+    def search_result_activated(self, index: QModelIndex, tab_index: int):
+        """Složku z výsledků otevře v záložce, soubor ve výchozí aplikaci"""
+        tab_data = self.tab_data.get(tab_index)
+        path = tab_data['results_model'].path(index) if tab_data else None
+        if not path:
+            return
+        if os.path.isdir(path):
+            self.navigate_to_path_in_tab(path, tab_index)
+        elif os.path.isfile(path):
+            self.open_file(path)
+    
+    def show_results_context_menu(self, position, tab_index: int):
+        """Kontextové menu výsledků hledání"""
+        tab_data = self.tab_data.get(tab_index)
+        if not tab_data:
+            return
+        results_view = tab_data['results_view']
+        path = tab_data['results_model'].path(results_view.indexAt(position))
+        if not path:
+            return
+        menu = QMenu(self)
+        
+        open_action = QAction("📂 Otevřít", self)
+        open_action.triggered.connect(lambda: self.search_result_activated(results_view.indexAt(position), tab_index))
+        menu.addAction(open_action)
+        
+        location_action = QAction("📍 Otevřít umístění", self)
+        location_action.triggered.connect(lambda: self.reveal_in_tab(path, tab_index))
+        menu.addAction(location_action)
+        
+        copy_path_action = QAction("📋 Kopírovat cestu", self)
+        copy_path_action.triggered.connect(lambda: self.copy_path_to_clipboard(path))
+        menu.addAction(copy_path_action)
+        
+        menu.exec(results_view.viewport().mapToGlobal(position))
+    
+    def configure_index_roots(self):
+        """Upraví seznam indexovaných složek (jedna cesta na řádek)"""
+        text, ok = QInputDialog.getMultiLineText(
+            self, "Indexované složky", "Složky, jejichž obsah se indexuje (jedna na řádek):",
+            "\n".join(self.file_indexer.roots)
+        )
+        if not ok:
+            return
+        roots = [line.strip() for line in text.splitlines() if line.strip()]
+        missing = [root for root in roots if not os.path.isdir(root)]
+        if missing:
+            self.show_error_message("Neexistující složky: " + ", ".join(missing))
+            return
+        QSettings("FlexiFiles", "FlexiFiles").setValue("index/roots", roots)
+        self.file_indexer.set_roots(roots)
+        self.status_bar.showMessage("Indexování změněných složek běží na pozadí", 5000)
+    
+    def refresh_name_index(self):
+        """Spustí kontrolu indexovaných složek na pozadí"""
+        self.file_indexer.sweep()
+        self.status_bar.showMessage("Indexování změněných složek běží na pozadí", 5000)
+    
+    def update_watched_directories(self):
+        """Sleduje změny právě otevřených složek živých záložek"""
+        # Uspané záložky (i nenačtené záložky obnovené relace) se při probuzení načtou znovu
+        wanted = {data['path'] for data in self.tab_data.values() if data.get('path') and not data['hibernated']}
+        watched = set(self.directory_watcher.directories())
+        if watched - wanted:
+            self.directory_watcher.removePaths(list(watched - wanted))
+        if wanted - watched:
+            self.directory_watcher.addPaths(list(wanted - watched))
+        # Mezipaměť modelu se zahazuje jen mimo právě zobrazené složky
+        self.model_manager.trim(wanted)
+    
     def create_toolbar(self):
         """Toolbar je nyní přesunut do pravého panelu každé záložky"""
         # Toolbar je nyní v pravém panelu každé záložky, takže zde není potřeba žádný globální toolbar
@@ -966,6 +7709,7 @@ class FileBrowserMainWindow(QMainWindow):
             tab_data['forward_action'].setEnabled(nav_history.can_go_forward())
             tab_data['up_action'].setEnabled(os.path.dirname(self.current_path) != self.current_path)
     
+    @traced("navigace")
     def go_back(self):
         """Jde na předchozí cestu v historii aktuální záložky"""
         tab_data = self.get_current_tab_data()
@@ -973,12 +7717,14 @@ class FileBrowserMainWindow(QMainWindow):
             return
             
         nav_history = tab_data['navigation_history']
+        self.remember_history_state(tab_data)
         path = nav_history.go_back()
         if path:
             current_tab = self.tab_widget.currentIndex()
-            # Navigace bez přidání do historie (protože už tam je)
-            self._navigate_to_path_in_tab_without_history(path, current_tab)
+            # Navigace bez přidání do historie (protože už tam je), se stavem zobrazení z historie
+            self._navigate_to_path_in_tab_without_history(path, current_tab, nav_history.current())
     
+    @traced("navigace")
     def go_forward(self):
         """Jde na následující cestu v historii aktuální záložky"""
         tab_data = self.get_current_tab_data()
@@ -986,28 +7732,31 @@ class FileBrowserMainWindow(QMainWindow):
             return
             
         nav_history = tab_data['navigation_history']
+        self.remember_history_state(tab_data)
         path = nav_history.go_forward()
         if path:
             current_tab = self.tab_widget.currentIndex()
-            # Navigace bez přidání do historie (protože už tam je)
-            self._navigate_to_path_in_tab_without_history(path, current_tab)
+            # Navigace bez přidání do historie (protože už tam je), se stavem zobrazení z historie
+            self._navigate_to_path_in_tab_without_history(path, current_tab, nav_history.current())
     
+    @traced("navigace")
     def go_up(self):
         """Jde do nadřazeného adresáře"""
         parent_path = os.path.dirname(self.current_path)
         if parent_path != self.current_path:
             self.navigate_to_path(parent_path)
     
+    @traced("navigace")
     def refresh_current_view(self):
         """Obnoví aktuální zobrazení"""
         tab_data = self.get_current_tab_data()
         if tab_data:
             path = tab_data['path']
             index = self.file_model.index(path)
-            current_view = self.get_current_view_for_tab(tab_data)
-            if current_view:
-                current_view.setRootIndex(index)
+            self.set_tab_folder(tab_data, index)
             tab_data['tree_view'].setCurrentIndex(index)
+            if tab_data['icon_view'] is not None:
+                tab_data['icon_view'].itemDelegate().clear()
             self.status_bar.showMessage("Zobrazení obnoveno", 2000)
     
     def navigate_from_address_bar(self):
@@ -1018,6 +7767,7 @@ class FileBrowserMainWindow(QMainWindow):
         else:
             self.address_bar.setText(self.current_path)
     
+    @traced("navigace")
     def tree_item_clicked(self, index: QModelIndex, tab_index: Optional[int] = None):
         """Zpracuje kliknutí na položku ve stromovém zobrazení"""
         path = self.file_model.filePath(index)
@@ -1029,11 +7779,12 @@ class FileBrowserMainWindow(QMainWindow):
                 current_tab = self.tab_widget.currentIndex()
                 self.navigate_to_path_in_tab(path, current_tab)
     
+    @traced("navigace")
     def table_item_double_clicked(self, index: QModelIndex, tab_index: Optional[int] = None):
         """Zpracuje dvojité kliknutí na položku v tabulce"""
-        path = self.file_model.filePath(index)
+        path = self.path_for_index(index)
         
-        if os.path.isdir(path):
+        if self.prefetcher.is_directory(path):
             # Navigace do složky
             if tab_index is not None:
                 self.navigate_to_path_in_tab(path, tab_index)
@@ -1082,7 +7833,7 @@ class FileBrowserMainWindow(QMainWindow):
         menu = QMenu()
         if index.isValid():
             # Menu pro vybranou položku
-            file_path = self.file_model.filePath(index)
+            file_path = self.path_for_index(index)
             file_name = os.path.basename(file_path)
             
             open_action = menu.addAction(f"🔓 Otevřít '{file_name}'")
@@ -1094,6 +7845,11 @@ class FileBrowserMainWindow(QMainWindow):
             
             menu.addSeparator()
             
+            # Akce pro celý výběr, pokud na něj uživatel klikl
+            selected_paths = self.get_selected_paths(tab_data)
+            if file_path not in selected_paths:
+                selected_paths = [file_path]
+            
             rename_action = menu.addAction(f"✏️ Přejmenovat '{file_name}'")
             rename_action.triggered.connect(lambda: self.rename_item(file_path))
             
@@ -1102,9 +7858,23 @@ class FileBrowserMainWindow(QMainWindow):
             
             menu.addSeparator()
             
+            if len(selected_paths) > 1:
+                batch_rename_action = menu.addAction(f"🔤 Hromadně přejmenovat ({len(selected_paths)})")
+                batch_rename_action.triggered.connect(lambda: self.batch_rename_items(selected_paths))
+            
+            copy_action = menu.addAction("📑 Kopírovat")
+            copy_action.triggered.connect(lambda: self.copy_items_to_clipboard(selected_paths))
+            
+            cut_action = menu.addAction("✂️ Vyjmout")
+            cut_action.triggered.connect(lambda: self.copy_items_to_clipboard(selected_paths, cut=True))
+            
             copy_path_action = menu.addAction("📋 Zkopírovat cestu")
             copy_path_action.triggered.connect(lambda: self.copy_path_to_clipboard(file_path))
             
+            if os.path.isdir(file_path):
+                duplicates_action = menu.addAction(f"🧬 Najít duplicity v '{file_name}'")
+                duplicates_action.triggered.connect(lambda: self.find_duplicates(file_path))
+            
             properties_action = menu.addAction(f"ℹ️ Vlastnosti '{file_name}'")
             properties_action.triggered.connect(lambda: self.show_properties(file_path))
         else:
@@ -1115,10 +7885,15 @@ class FileBrowserMainWindow(QMainWindow):
             menu.addSeparator()
             
             paste_action = menu.addAction("📄 Vložit")
-            paste_action.setEnabled(False)  # Funkce vložení není implementována
+            paste_action.setEnabled(bool(self.clipboard_paths()[0]))
+            paste_action.triggered.connect(lambda: self.paste_items(tab_index))
             
             refresh_action = menu.addAction("🔄 Obnovit")
             refresh_action.triggered.connect(self.refresh_current_view)
+            
+            folder_path = tab_data['path']
+            duplicates_action = menu.addAction("🧬 Najít duplicity v této složce")
+            duplicates_action.triggered.connect(lambda: self.find_duplicates(folder_path))
         
         menu.exec(current_view.mapToGlobal(position))
     
@@ -1141,8 +7916,235 @@ class FileBrowserMainWindow(QMainWindow):
             navigate_action = menu.addAction(f"📂 Přejít do '{file_name}'")
             navigate_action.triggered.connect(lambda: self.navigate_to_path_in_tab(file_path, tab_index))
             
+            duplicates_action = menu.addAction(f"🧬 Najít duplicity v '{file_name}'")
+            duplicates_action.triggered.connect(lambda: self.find_duplicates(file_path))
+            
             menu.exec(tree_view.mapToGlobal(position))
     
+    @staticmethod
+    def path_for_index(index: QModelIndex) -> str:
+        """Cesta k položce pro index zobrazení (zdrojového i proxy modelu)"""
+        return index.data(QFileSystemModel.Roles.FilePathRole) or ""
+    
+    def prefetch_index(self, index: QModelIndex):
+        """Předem načte složku pod kurzorem ve stromu nebo označenou v zobrazení"""
+        model = index.model()
+        if isinstance(model, QAbstractProxyModel):
+            index = model.mapToSource(index)
+            model = index.model()
+        if index.isValid() and model.isDir(index):
+            self.prefetcher.request(self.path_for_index(index))
+    
+    def _on_listing_prefetched(self, listing: DirectoryListing):
+        """Zobrazí složky záložek, které čekaly na zjištění počtu položek, správným modelem"""
+        path = os.path.normpath(listing.path)
+        for tab_data in self.tab_data.values():
+            if not tab_data['hibernated'] and tab_data['size_probe'] == path:
+                self.set_tab_folder(tab_data, self.file_model.index(tab_data['path']))
+    
+    def _on_listing_failed(self, path: str):
+        """Nečitelnou složku čekající záložky zobrazí QFileSystemModel (ukáže ji prázdnou)"""
+        path = os.path.normpath(path)
+        for tab_data in self.tab_data.values():
+            if not tab_data['hibernated'] and tab_data['size_probe'] == path:
+                tab_data['size_probe'] = None
+                self._show_in_file_model(tab_data, self.file_model.index(tab_data['path']))
+    
+    def _on_watched_directory_changed(self, path: str):
+        """Naplánuje nové načtení změněné složky, kterou záložka zobrazuje obřím modelem"""
+        path = os.path.normpath(path)
+        for tab_data in self.tab_data.values():
+            if (not tab_data['hibernated'] and tab_data['large_model'] is not None
+                    and os.path.normpath(tab_data['path']) == path):
+                self._changed_large_folders.add(path)
+                # Dávka změn (kopírování, mazání) se načte jednou až po jejím konci
+                self.large_folder_reload_timer.start()
+                return
+    
+    def reload_changed_large_folders(self):
+        """Načte znovu změněné obří složky, výběr a posun se po načtení obnoví"""
+        changed = self._changed_large_folders
+        self._changed_large_folders = set()
+        for tab_data in self.tab_data.values():
+            large_model = tab_data['large_model']
+            if (tab_data['hibernated'] or large_model is None
+                    or os.path.normpath(tab_data['path']) not in changed):
+                continue
+            if large_model.is_loading():
+                # Načítání ještě běží, změna se projeví při dalším pokusu
+                self._changed_large_folders.add(os.path.normpath(tab_data['path']))
+                self.large_folder_reload_timer.start()
+                continue
+            if not tab_data['saved_state']:
+                tab_data['saved_state'] = self.capture_tab_view_state(tab_data)
+            large_model.load(large_model.path)
+    
+    def index_for_path(self, tab_data, path: str) -> QModelIndex:
+        """Index položky v zobrazeních záložky (neplatný, pokud není vidět)"""
+        filter_model = tab_data['filter_model']
+        source = filter_model.sourceModel()
+        if source is self.file_model:
+            return filter_model.mapFromSource(self.file_model.index(path))
+        return filter_model.mapFromSource(source.index_for_path(path))
+    
+    @traced("navigace")
+    def set_tab_folder(self, tab_data, source_index: QModelIndex, cached: Optional[HistoryEntry] = None):
+        """Přepne proxy model záložky na složku a zruší filtr
+        
+        Složky nad LargeDirectoryModel.SWITCH_THRESHOLD položek čte místo
+        QFileSystemModel vlastní model záložky. Počet položek zjišťuje
+        prefetcher ve vlákně; dokud ho nezná, je složka prázdná (načítá se)
+        a model podle počtu vybere _on_listing_prefetched. S nezměněnou položkou
+        historie (cached) se velikost složky nezjišťuje a obří složka se
+        nečte znovu.
+        """
+        filter_edit = tab_data['filter_edit']
+        filter_edit.blockSignals(True)
+        filter_edit.clear()
+        filter_edit.blockSignals(False)
+        # Reset proxy modelu zruší výběr bez signálu selectionChanged
+        tab_data['selection_stats'].clear()
+        self.schedule_selection_update(tab_data)
+        filter_model = tab_data['filter_model']
+        path = self.file_model.filePath(source_index)
+        large = cached.large if cached is not None else (self.prefetcher.is_large(path) if path else False)
+        tab_data['size_probe'] = None
+        if path and large is not False:
+            large_model = tab_data['large_model']
+            if large_model is None:
+                large_model = LargeDirectoryModel(filter_model)
+                large_model.sort(*filter_model.sort_order())
+                large_model.loading_finished.connect(self._on_directory_loaded)
+                tab_data['large_model'] = large_model
+            if filter_model.sourceModel() is not large_model:
+                filter_model.setSourceModel(large_model)
+            listing = cached.listing if cached is not None else None
+            if large is None:
+                # Počet položek zatím neznámý - QFileSystemModel se složkou nezatěžuje,
+                # do zjištění je prázdná a správný model ji převezme v _on_listing_prefetched
+                tab_data['size_probe'] = os.path.normpath(path)
+                large_model.show_pending(path)
+            elif listing is None:
+                large_model.load(path)
+            filter_model.set_root_index(QModelIndex())
+            tab_data['directory_snapshot'].attach(large_model, QModelIndex())
+            if listing is not None:
+                large_model.restore(listing)  # Hotový obsah, loading_finished přijde hned
+            return
+        self._show_in_file_model(tab_data, source_index)
+    
+    def _show_in_file_model(self, tab_data, source_index: QModelIndex):
+        """Zobrazí složku záložky sdíleným QFileSystemModel a uvolní obří model"""
+        filter_model = tab_data['filter_model']
+        large_model = tab_data['large_model']
+        if large_model is not None:
+            large_model.cancel()
+            large_model.deleteLater()
+            tab_data['large_model'] = None
+        if filter_model.sourceModel() is not self.file_model:
+            filter_model.setSourceModel(self.file_model)
+        filter_model.set_root_index(source_index)
+        tab_data['directory_snapshot'].attach(self.file_model, source_index)
+    
+    @traced("navigace")
+    def apply_filter(self, text: str, tab_index: int):
+        """Zúží zobrazení složky záložky na položky obsahující text"""
+        tab_data = self.tab_data.get(tab_index)
+        if not tab_data:
+            return
+        tab_data['filter_model'].set_filter_text(text)
+        if tab_index == self.tab_widget.currentIndex():
+            self.update_status_bar()
+    
+    def get_selected_paths(self, tab_data) -> List[str]:
+        """Vrací cesty vybraných položek v aktuálním zobrazení záložky"""
+        current_view = self.get_current_view_for_tab(tab_data)
+        if not current_view or not current_view.selectionModel():
+            return []
+        return [self.path_for_index(index) for index in current_view.selectionModel().selectedRows()
+                if index.isValid()]
+    
+    @traced("soubory")
+    def copy_items_to_clipboard(self, paths: List[str], cut: bool = False):
+        """Vloží položky do schránky ke kopírování nebo přesunu"""
+        mime_data = QMimeData()
+        mime_data.setUrls([QUrl.fromLocalFile(path) for path in paths])
+        if cut:
+            # Příznak vyjmutí, kterému rozumí Průzkumník Windows i linuxové správce souborů
+            mime_data.setData('application/x-kde-cutselection', b'1')
+            mime_data.setData('Preferred DropEffect', struct.pack('<I', 2))
+        QApplication.clipboard().setMimeData(mime_data)
+        self._cut_paths = set(paths) if cut else set()
+        
+        action = "vyjmuto" if cut else "zkopírováno"
+        self.status_bar.showMessage(f"Do schránky {action}: {len(paths)} položek", 2000)
+    
+    def clipboard_paths(self):
+        """Vrací (cesty ve schránce, zda jde o vyjmutí)"""
+        mime_data = QApplication.clipboard().mimeData()
+        if mime_data is None or not mime_data.hasUrls():
+            return [], False
+        paths = [url.toLocalFile() for url in mime_data.urls() if url.isLocalFile()]
+        cut = (set(paths) == self._cut_paths
+               or mime_data.data('application/x-kde-cutselection') == b'1')
+        return paths, cut
+    
+    @traced("soubory")
+    def paste_items(self, tab_index: Optional[int] = None):
+        """Vloží položky ze schránky do složky záložky (na pozadí)"""
+        if tab_index is None:
+            tab_index = self.tab_widget.currentIndex()
+        tab_data = self.tab_data.get(tab_index)
+        paths, cut = self.clipboard_paths()
+        if not tab_data or not paths:
+            return
+        
+        destination = tab_data['path']
+        policy = ConflictPolicy.RENAME
+        conflicts = [path for path in paths
+                     if os.path.lexists(os.path.join(destination, os.path.basename(path)))]
+        # Při přesunu do stejné složky nejde o kolizi
+        if cut:
+            conflicts = [path for path in conflicts
+                         if os.path.normcase(os.path.dirname(os.path.abspath(path))) != os.path.normcase(destination)]
+        if conflicts:
+            policy = self.ask_conflict_policy(conflicts)
+            if policy is None:
+                return
+        
+        self.file_operations.copy_items(paths, destination, move=cut, policy=policy)
+        if cut:
+            # Vyjmuté položky se přesouvají, druhé vložení by nemělo co přesunout
+            self._cut_paths = set()
+            QApplication.clipboard().clear()
+    
+    def ask_conflict_policy(self, conflicts: List[str]) -> Optional[ConflictPolicy]:
+        """Jedním dotazem zjistí, jak řešit kolize názvů pro celou úlohu"""
+        names = "\n".join(os.path.basename(path) for path in conflicts[:5])
+        if len(conflicts) > 5:
+            names += f"\n… a dalších {len(conflicts) - 5}"
+        
+        dialog = QMessageBox(self)
+        dialog.setWindowTitle("Položky již existují")
+        dialog.setIcon(QMessageBox.Icon.Question)
+        dialog.setText(f"V cílové složce už existuje {len(conflicts)} položek se stejným názvem:\n\n{names}")
+        overwrite_button = dialog.addButton("Přepsat", QMessageBox.ButtonRole.AcceptRole)
+        skip_button = dialog.addButton("Přeskočit", QMessageBox.ButtonRole.AcceptRole)
+        rename_button = dialog.addButton("Ponechat obě", QMessageBox.ButtonRole.AcceptRole)
+        dialog.addButton("Zrušit", QMessageBox.ButtonRole.RejectRole)
+        dialog.setDefaultButton(rename_button)
+        dialog.exec()
+        
+        clicked = dialog.clickedButton()
+        if clicked == overwrite_button:
+            return ConflictPolicy.OVERWRITE
+        if clicked == skip_button:
+            return ConflictPolicy.SKIP
+        if clicked == rename_button:
+            return ConflictPolicy.RENAME
+        return None
+    
+    @traced("soubory")
     def create_new_folder(self):
         """Vytvoří novou složku v aktuálním adresáři"""
         tab_data = self.get_current_tab_data()
@@ -1157,6 +8159,7 @@ class FileBrowserMainWindow(QMainWindow):
         if ok and folder_name.strip():
             self.file_operations.create_folder(current_path, folder_name.strip())
     
+    @traced("soubory")
     def rename_item(self, file_path: str):
         """Přejmenuje vybranou položku"""
         old_name = os.path.basename(file_path)
@@ -1167,6 +8170,14 @@ class FileBrowserMainWindow(QMainWindow):
         if ok and new_name.strip() and new_name != old_name:
             self.file_operations.rename_item(file_path, new_name.strip())
     
+    @traced("soubory")
+    def batch_rename_items(self, paths: List[str]):
+        """Otevře dialog hromadného přejmenování a provede ho na pozadí"""
+        dialog = BatchRenameDialog(paths, self)
+        if dialog.exec() == QDialog.DialogCode.Accepted and dialog.plan and dialog.plan.pairs:
+            self.file_operations.batch_rename(dialog.plan.pairs)
+    
+    @traced("soubory")
     def delete_item(self, file_path: str):
         """Smaže vybranou položku s potvrzením"""
         file_name = os.path.basename(file_path)
@@ -1182,6 +8193,12 @@ class FileBrowserMainWindow(QMainWindow):
         if reply == QMessageBox.StandardButton.Yes:
             self.file_operations.delete_item(file_path)
     
+    def find_duplicates(self, folder_path: str):
+        """Otevře (nemodální) dialog hledání duplicitních souborů ve složce"""
+        dialog = DuplicatesDialog(self.duplicate_finder, self.file_operations, folder_path, self)
+        dialog.path_activated.connect(self.open_search_result)
+        dialog.show()
+    
     def run_file(self, file_path: str):
         """Spustí spustitelný soubor"""
         try:
@@ -1208,12 +8225,19 @@ class FileBrowserMainWindow(QMainWindow):
             modified = datetime.fromtimestamp(stat.st_mtime).strftime("%d.%m.%Y %H:%M:%S")
             
             if os.path.isdir(file_path):
-                # Počet položek ve složce
-                try:
-                    items_count = len(os.listdir(file_path))
-                    size_text = f"{items_count} položek"
-                except PermissionError:
-                    size_text = "Nedostupné (oprávnění)"
+                # Celková velikost z mezipaměti, jinak alespoň počet položek ve složce. Uložené
+                # součty ověřuje jen mtime samotné složky, změny hlouběji ve stromu se neprojeví
+                totals = self.folder_size_cache.lookup_totals(file_path, stat) if self.folder_size_cache else None
+                if totals is not None:
+                    size_text = (f"přibližně {FileInfoPanel.format_size(totals.size)} "
+                                 f"({totals.files} souborů, {totals.folders} složek; podle posledního "
+                                 f"výpočtu, přesnou velikost ukáže informační panel)")
+                else:
+                    try:
+                        items_count = len(os.listdir(file_path))
+                        size_text = f"{items_count} položek"
+                    except PermissionError:
+                        size_text = "Nedostupné (oprávnění)"
             else:
                 # Velikost souboru
                 if size < 1024:
@@ -1236,6 +8260,7 @@ Změněno: {modified}"""
         except Exception as e:
             self.show_error_message(f"Nepodařilo se načíst vlastnosti: {str(e)}")
     
+    @traced("stavový řádek")
     def update_status_bar(self):
         """Aktualizuje stavový řádek"""
         try:
@@ -1245,57 +8270,29 @@ Změněno: {modified}"""
                 self.status_bar.showMessage("Připraven")
                 return
                 
-            # Počet vybraných položek z aktuálního zobrazení
-            current_view = self.get_current_view_for_tab(tab_data)
-            if not current_view:
-                self.status_bar.showMessage("Připraven")
-                return
-                
-            selection_model = current_view.selectionModel()
-            if not selection_model:
-                self.status_bar.showMessage("Připraven")
-                return
-                
-            selection = selection_model.selectedRows()
-            selected_count = len(selection)
-            
-            if selected_count > 0:
-                # Výpočet celkové velikosti vybraných položek
-                total_size = 0
-                for index in selection:
-                    file_path = self.file_model.filePath(index)
-                    if os.path.isfile(file_path):
-                        total_size += os.path.getsize(file_path)
-                
-                if total_size > 0:
-                    if total_size < 1024:
-                        size_text = f"{total_size} B"
-                    elif total_size < 1024 * 1024:
-                        size_text = f"{total_size / 1024:.1f} KB"
-                    elif total_size < 1024 * 1024 * 1024:
-                        size_text = f"{total_size / (1024 * 1024):.1f} MB"
-                    else:
-                        size_text = f"{total_size / (1024 * 1024 * 1024):.1f} GB"
-                    
-                    message = f"Vybráno: {selected_count} položek ({size_text})"
-                else:
-                    message = f"Vybráno: {selected_count} položek"
+            # Vybrané položky ze souhrnu výběru (velikosti zjišťuje vlákno)
+            stats = tab_data['selection_stats']
+            if stats.count:
+                message = f"Vybráno: {stats.count} položek"
+                if stats.total_size > 0:
+                    message += f" ({format_size(stats.total_size)})"
             else:
-                # Počet všech položek v aktuálním adresáři
-                try:
-                    current_path = tab_data['path']
-                    items_count = len(os.listdir(current_path))
-                    message = f"Položek celkem: {items_count}"
-                except PermissionError:
-                    message = "Nedostatečná oprávnění"
-                except Exception:
-                    message = "Připraven"
+                # Souhrn složky udržovaný ze signálů modelu (bez čtení složky z disku)
+                snapshot = tab_data['directory_snapshot']
+                folders, files, total_size = snapshot.summary()
+                filter_model = tab_data['filter_model']
+                if filter_model.filter_text():
+                    message = f"Zobrazeno: {filter_model.rowCount()} z {folders + files} položek"
+                else:
+                    message = (f"Položek celkem: {folders + files} "
+                               f"(složky: {folders}, soubory: {files}, {format_size(total_size)})")
             
             self.status_bar.showMessage(message)
             
         except Exception:
             self.status_bar.showMessage("Připraven")
     
+    @traced("zobrazení")
     def toggle_view_mode(self):
         """Přepne mezi různými režimy zobrazení pro aktuální záložku"""
         tab_data = self.get_current_tab_data()
@@ -1312,6 +8309,7 @@ Změněno: {modified}"""
         else:
             self.set_view_mode_for_tab(ViewMode.DETAILS)
     
+    @traced("zobrazení")
     def set_view_mode_for_tab(self, mode: ViewMode, tab_index: Optional[int] = None):
         """Nastaví konkrétní režim zobrazení pro záložku"""
         if tab_index is None:
@@ -1321,44 +8319,31 @@ Změněno: {modified}"""
         if not tab_data or mode == tab_data['current_view_mode']:
             return
         
-        # Skryj všechna zobrazení
-        tab_data['table_view'].hide()
-        tab_data['list_view'].hide()
-        tab_data['icon_view'].hide()
+        # Přepnutí zobrazení ukončí zobrazení výsledků hledání i využití disku
+        if tab_data['results_visible']:
+            self.close_folder_search(tab_index)
+        if tab_data['disk_usage_visible']:
+            self.close_disk_usage(tab_index)
         
-        # Odstraň všechna zobrazení z layoutu
+        # Odstraň aktuální zobrazení z layoutu (zůstává skryté v kontejneru pro další přepnutí)
         view_layout = tab_data['view_layout']
         for i in reversed(range(view_layout.count())):
             item = view_layout.itemAt(i)
             if item and item.widget():
-                item.widget().setParent(None)
-        
-        # Získej aktuální root index
-        current_view = self.get_current_view_for_tab(tab_data)
-        current_index = current_view.rootIndex() if current_view else None
+                item.widget().hide()
+                view_layout.removeWidget(item.widget())
         
-        # Nastav nový režim
+        # Nastav nový režim - zobrazení seznamu a ikon vznikají až při prvním použití
         tab_data['current_view_mode'] = mode
+        view = self.ensure_view(tab_data, mode)
+        view_layout.addWidget(view)
+        view.show()
         
         if mode == ViewMode.DETAILS:
-            view_layout.addWidget(tab_data['table_view'])
-            tab_data['table_view'].show()
-            if current_index and current_index.isValid():
-                tab_data['table_view'].setRootIndex(current_index)
             self.status_bar.showMessage("Režim zobrazení: Podrobnosti", 2000)
-            
         elif mode == ViewMode.LIST:
-            view_layout.addWidget(tab_data['list_view'])
-            tab_data['list_view'].show()
-            if current_index and current_index.isValid():
-                tab_data['list_view'].setRootIndex(current_index)
             self.status_bar.showMessage("Režim zobrazení: Seznam", 2000)
-            
         elif mode == ViewMode.LARGE_ICONS:
-            view_layout.addWidget(tab_data['icon_view'])
-            tab_data['icon_view'].show()
-            if current_index and current_index.isValid():
-                tab_data['icon_view'].setRootIndex(current_index)
             self.status_bar.showMessage("Režim zobrazení: Velké ikony", 2000)
     
     def get_current_view(self):
@@ -1377,6 +8362,7 @@ Změněno: {modified}"""
         """Zobrazí chybovou zprávu"""
         QMessageBox.warning(self, "Chyba", message)
     
+    @traced("panel")
     def update_info_panel(self, index: QModelIndex, tab_index: int):
         """Aktualizuje informační panel při kliknutí na soubor"""
         if tab_index not in self.tab_data:
@@ -1386,32 +8372,90 @@ Změněno: {modified}"""
         info_panel = tab_data['info_panel']
         
         if index.isValid():
-            file_path = self.file_model.filePath(index)
+            file_path = self.path_for_index(index)
             info_panel.update_info(file_path)
         else:
             info_panel.clear_info()
     
+    @staticmethod
+    def selection_paths(selection: QItemSelection) -> List[str]:
+        """Cesty řádků ve výběru zobrazení složky (vybírají se celé řádky)"""
+        paths = []
+        for selection_range in selection:
+            paths.extend(selection_range.model().row_paths(selection_range.top(), selection_range.bottom()))
+        return paths
+    
+    @traced("panel")
+    def on_selection_changed(self, selected: QItemSelection, deselected: QItemSelection, tab_index: int):
+        """Promítne přírůstek výběru do souhrnu záložky, panel se obnoví až s dalším snímkem"""
+        tab_data = self.tab_data.get(tab_index)
+        if not tab_data or tab_data['hibernated']:
+            return
+        stats = tab_data['selection_stats']
+        stats.remove(self.selection_paths(deselected))
+        added = stats.add(self.selection_paths(selected))
+        if added:
+            self.selection_stat_service.request(stats, added)
+        self.schedule_selection_update(tab_data)
+    
+    def schedule_selection_update(self, tab_data):
+        self._selection_dirty_pages.add(tab_data['page'])
+        if not self.selection_update_timer.isActive():
+            self.selection_update_timer.start()
+    
+    @traced("panel")
+    def _on_selection_stats(self, stats: SelectionStats, results: list):
+        """Doplní zjištěné velikosti do souhrnu výběru a naplánuje překreslení"""
+        stats.apply(results)
+        for tab_data in self.tab_data.values():
+            if tab_data['selection_stats'] is stats:
+                self.schedule_selection_update(tab_data)
+                break
+    
+    @traced("panel")
+    def flush_selection_updates(self):
+        """Obnoví informační panel a stavový řádek záložek se změněným výběrem"""
+        pages, self._selection_dirty_pages = self._selection_dirty_pages, set()
+        for page in pages:
+            tab_index = self.tab_widget.indexOf(page)
+            tab_data = self.tab_data.get(tab_index)
+            if tab_data and not tab_data['hibernated']:
+                self.update_info_panel_selection(tab_index)
+        if self.tab_widget.currentWidget() in pages:
+            self.update_status_bar()
+    
+    @traced("panel")
     def update_info_panel_selection(self, tab_index: int):
-        """Aktualizuje informační panel při změně výběru"""
+        """Aktualizuje informační panel podle souhrnu výběru záložky"""
         if tab_index not in self.tab_data:
             return
             
         tab_data = self.tab_data[tab_index]
         info_panel = tab_data['info_panel']
         current_view = self.get_current_view_for_tab(tab_data)
+        if not current_view or not current_view.selectionModel():
+            info_panel.clear_info()
+            return
         
-        if current_view and current_view.selectionModel():
-            selected_indexes = current_view.selectionModel().selectedRows()
-            selected_paths = []
-            
-            for index in selected_indexes:
-                if index.isValid():
-                    file_path = self.file_model.filePath(index)
-                    selected_paths.append(file_path)
-            
-            info_panel.update_selection(selected_paths)
+        stats = tab_data['selection_stats']
+        selection = current_view.selectionModel().selection()
+        if sum(selection_range.height() for selection_range in selection if selection_range.left() == 0) != stats.count:
+            # Výběr se změnil bez signálu (reset modelu při přechodu do složky) - souhrn se sestaví znovu
+            stats.clear()
+            added = stats.add(self.selection_paths(selection))
+            if added:
+                self.selection_stat_service.request(stats, added)
+        
+        single_path = stats.single_path()
+        if single_path:
+            # Dokončené zjišťování jedné položky už panel znovu nenačítá
+            if tab_data['selection_shown'] != single_path:
+                info_panel.update_info(single_path)
+        elif stats.count:
+            info_panel.show_selection_stats(stats)
         else:
             info_panel.clear_info()
+        tab_data['selection_shown'] = single_path
     
     def toggle_info_panel(self):
         """Přepne viditelnost informačního panelu"""
@@ -1442,11 +8486,24 @@ Změněno: {modified}"""
 <ul>
 <li><b>Otevřít:</b> Dvojité kliknutí na soubor</li>
 <li><b>Přejmenovat:</b> Pravé tlačítko → Přejmenovat</li>
+<li><b>Hromadné přejmenování:</b> Vyberte více položek → Pravé tlačítko → Hromadně přejmenovat</li>
 <li><b>Smazat:</b> Pravé tlačítko → Smazat nebo klávesa Delete</li>
+<li><b>Kopírovat/Vyjmout:</b> Pravé tlačítko → Kopírovat nebo Vyjmout</li>
+<li><b>Vložit:</b> Pravé tlačítko na prázdné ploše → Vložit (běží na pozadí)</li>
 <li><b>Nová složka:</b> Ctrl+Shift+N</li>
 <li><b>Vlastnosti:</b> Pravé tlačítko → Vlastnosti</li>
 </ul>
 
+<h3>🔍 Hledání</h3>
+<ul>
+<li><b>Filtrovat složku:</b> Ctrl+F – zobrazí jen položky, jejichž název obsahuje text</li>
+<li><b>Hledat ve složce:</b> F3 – název, maska nebo regulární výraz, velikost a datum změny</li>
+<li><b>Hledat v obsahu:</b> F3 → režim Obsah souborů – text uvnitř souborů, binární soubory se přeskakují</li>
+<li><b>Hledat v indexu:</b> Ctrl+Shift+F – část názvu nebo maska (*.pdf, foto_??.jpg)</li>
+<li><b>Indexované složky:</b> Nástroje → Indexované složky (výchozí je domovská složka)</li>
+<li><b>Otevření výsledku:</b> Enter nebo dvojité kliknutí</li>
+</ul>
+
 <h3>🔖 Záložky</h3>
 <ul>
 <li><b>Nová záložka:</b> Ctrl+T</li>
@@ -1468,6 +8525,9 @@ Změněno: {modified}"""
 <li><b>Ctrl+T:</b> Nová záložka</li>
 <li><b>Ctrl+Shift+N:</b> Nová složka</li>
 <li><b>Ctrl+I:</b> Informační panel</li>
+<li><b>Ctrl+F:</b> Filtrovat položky složky</li>
+<li><b>F3:</b> Hledat ve složce</li>
+<li><b>Ctrl+Shift+F:</b> Hledat v indexu</li>
 <li><b>Delete:</b> Smazat vybranou položku</li>
 <li><b>Enter:</b> Otevřít vybranou položku</li>
 </ul>
@@ -1549,13 +8609,26 @@ navržený pro zvýšení produktivity při práci se soubory.</i></p>
 
 def main():
     """Hlavní funkce aplikace"""
+    if '--prune-thumbnails' in sys.argv:
+        # Úklid mezipaměti náhledů z příkazové řádky (bez GUI)
+        removed = ThumbnailStore().prune()
+        print(f"Smazáno zastaralých náhledů: {removed}")
+        return
+    
+    startup_profile = StartupProfile() if '--profile-startup' in sys.argv else None
+    if startup_profile:
+        startup_profile.mark("importy")
+    
     app = QApplication(sys.argv)
     
     # Nastavení stylu aplikace pro Windows
     app.setStyle('WindowsVista')
+    TRACER.configure_from_environment()
+    if startup_profile:
+        startup_profile.mark("QApplication")
     
-    # Vytvoření a zobrazení hlavního okna
-    window = FileBrowserMainWindow()
+    # Vytvoření a zobrazení hlavního okna (první záložka se postaví po prvním vykreslení)
+    window = FileBrowserMainWindow(startup_profile)
     window.show()
     
     # Spuštění aplikace
@@ -1563,4 +8636,6 @@ def main():
 
 
 if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()  # Pracovní procesy hledání v zabaleném .exe
     main()